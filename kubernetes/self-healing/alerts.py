@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Alertmanager webhook receiver for the Self-Healing Controller
+
+Prometheus already evaluates alerts such as PodCrashLooping and NodeFailure
+against the same facts the controller polls for. Alertmanager can push
+them to /webhooks/alertmanager instead of the controller waiting for its
+next full scan. AlertReceiver maps every firing alert of a grouped payload
+to the objects its labels name, as queue keys:
+
+    pod/<namespace>/<name>           namespace + pod labels
+    deployment/<namespace>/<name>    namespace + deployment (also statefulset, daemonset)
+    node/<name>                      node label, or instance of a kubelet/node-exporter target
+    scan                             a firing alert that names none of these
+
+Alerts on the controller's own metrics, such as HighPodFailureRate, carry
+the labels of the controller's scrape target rather than of a failing
+object, so they ask for a scan as well.
+
+A worker thread takes each key off a deduplicating work queue and asks the
+controller to check just that object. The HTTP request only parses and
+enqueues, so Alertmanager never waits on the Kubernetes API.
+"""
+
+import hmac
+import json
+import logging
+import threading
+
+from health_server import JSON_CONTENT_TYPE, json_snapshot
+from workqueue import RateLimitingQueue
+
+logger = logging.getLogger(__name__)
+
+# (namespace label, pod label) pairs, as set by kube-state-metrics and by Kubernetes service discovery
+POD_LABELS = (("namespace", "pod"), ("kubernetes_namespace", "kubernetes_pod_name"))
+WORKLOAD_LABELS = ("deployment", "statefulset", "daemonset")
+NODE_LABELS = ("node", "kubernetes_node")
+# Scrape jobs whose instance label is a node
+NODE_JOBS = ("kubelet", "node-exporter")
+SCAN_KEY = "scan"
+# The controller's scrape job, and its pods' app label that Kubernetes service discovery copies over
+CONTROLLER_JOB = "self-healing-controller"
+
+
+def alert_targets(alert):
+    """Get the queue keys of the objects an alert's labels name"""
+    labels = alert.get("labels") or {}
+    if CONTROLLER_JOB in (labels.get("job"), labels.get("app")):
+        # The pod and instance labels are the controller's own
+        return []
+    targets = []
+
+    for namespace_label, pod_label in POD_LABELS:
+        if labels.get(namespace_label) and labels.get(pod_label):
+            targets.append(f"pod/{labels[namespace_label]}/{labels[pod_label]}")
+            break
+
+    namespace = labels.get("namespace") or labels.get("kubernetes_namespace")
+    if namespace:
+        targets.extend(f"{kind}/{namespace}/{labels[kind]}" for kind in WORKLOAD_LABELS if labels.get(kind))
+
+    node = next((labels[label] for label in NODE_LABELS if labels.get(label)), None)
+    if node is None and labels.get("job") in NODE_JOBS and labels.get("instance"):
+        # host:port, or [ipv6]:port
+        node = labels["instance"].rsplit(":", 1)[0].strip("[]")
+    if node:
+        targets.append(f"node/{node}")
+
+    return targets
+
+
+def payload_targets(payload):
+    """Get the queue keys of every firing alert in an Alertmanager webhook payload"""
+    keys = []
+    for alert in payload.get("alerts") or ():
+        if alert.get("status", "firing") != "firing":
+            continue
+        keys.extend(alert_targets(alert) or [SCAN_KEY])
+    return keys
+
+
+class AlertReceiver:
+    def __init__(self, check, token="", metrics=None):
+        """Initialize a receiver calling check(key) for each object a firing alert names"""
+        self.check = check
+        self.token = token
+        self.metrics = metrics
+        self.queue = RateLimitingQueue(rate=0)
+        self.received = 0
+        self._thread = None
+
+    def handle(self, headers, body):
+        """Handle a webhook request, returning (status, content type, body)"""
+        expected = f"Bearer {self.token}".encode()
+        if self.token and not hmac.compare_digest(headers.get("Authorization", "").encode(), expected):
+            return 401, JSON_CONTENT_TYPE, b'{"error": "unauthorized"}'
+
+        try:
+            payload = json.loads(body)
+            keys = payload_targets(payload)
+        except (ValueError, TypeError, AttributeError) as e:
+            return json_snapshot({"error": f"invalid payload: {e}"}, 400)
+
+        self.received += 1
+        for key in keys:
+            self.queue.add(key)
+            if self.metrics is not None:
+                self.metrics.alerts.labels(target=key.split("/", 1)[0]).inc()
+        return json_snapshot({"queued": len(set(keys))})
+
+    def start(self):
+        """Start the worker checking queued keys"""
+        self._thread = threading.Thread(target=self._run, name="alert-checks", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _run(self):
+        while True:
+            key = self.queue.get()
+            if key is None:
+                return
+            try:
+                self.check(key)
+            except Exception as e:
+                logger.error(f"Alert-triggered check of {key} failed: {e}")
+                if self.metrics is not None:
+                    self.metrics.error("alerts")
+            finally:
+                self.queue.done(key)
+
+    def stop(self):
+        """Stop the worker"""
+        self.queue.shut_down()
+
+    def __len__(self):
+        return len(self.queue)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+asyncio engine for the Self-Healing Controller
+
+The default engine gives every loop and remediation worker its own thread,
+so each of them has at most one call in flight. With CONTROLLER_ENGINE=asyncio
+AsyncEngine runs the same controller on one event loop instead: periodic
+checks, remediations, Slack posts and Helm rollbacks are tasks, and each
+downstream (Kubernetes API, Slack, Helm) is bounded by its own semaphore, so
+hundreds of queued remediations cost a coroutine each rather than a thread.
+Helm runs as asyncio subprocesses. The Kubernetes client and requests are
+synchronous, so their calls run on an executor sized to their semaphores.
+Informer watches and the health server keep their own threads.
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from workqueue import AsyncRateLimitingQueue
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEngine:
+    def __init__(self, controller):
+        """Initialize an engine running a controller's work as asyncio tasks"""
+        self.controller = controller
+        self.limits = {
+            "kubernetes": max(1, controller.config["async_kubernetes_concurrency"]),
+            "slack": max(1, controller.config["async_slack_concurrency"]),
+            "helm": max(1, controller.config["helm_rollback_workers"]),
+        }
+        self.loop = None
+        self.executor = None
+        self.semaphores = {}
+        self.tasks = set()
+        # loop name -> event ending its current wait
+        self.wakeups = {}
+        self._stopping = None
+        self._thread_id = None
+
+    async def run(self):
+        """Run the controller until stop() is called or the process is signalled"""
+        self.loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._stopping = asyncio.Event()
+        self.semaphores = {name: asyncio.Semaphore(limit) for name, limit in self.limits.items()}
+        # Helm runs as subprocesses; only the synchronous clients need threads
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.limits["kubernetes"] + self.limits["slack"], thread_name_prefix="engine"
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # not on the main thread
+
+        self.controller.engine = self
+        try:
+            await self.loop.run_in_executor(self.executor, self.controller.start_monitoring)
+            await self._stopping.wait()
+        finally:
+            await self._shut_down()
+
+    def stop(self):
+        """Stop the engine, from the loop or any other thread"""
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._stopping.set)
+
+    async def _shut_down(self):
+        logger.info("Stopping the asyncio engine...")
+        await self.loop.run_in_executor(self.executor, self.controller.stop)
+
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+        notifier = self.controller.slack_notifier
+        if notifier is not None:
+            # The notifier is stopped, so this flush does not wait out rate limits
+            try:
+                await self.call("slack", notifier.flush)
+            except Exception as e:
+                logger.error(f"Error flushing Slack notifications: {e}")
+
+        self.executor.shutdown(wait=False)
+
+    async def call(self, downstream, func, *args):
+        """Run a blocking call on the executor once the downstream has a free slot"""
+        async with self.semaphores[downstream]:
+            return await self.loop.run_in_executor(self.executor, func, *args)
+
+    def spawn(self, coro):
+        """Run a coroutine as a task, scheduling it from the loop or any other thread"""
+        if threading.get_ident() == self._thread_id:
+            self._track(coro)
+            return
+
+        try:
+            self.loop.call_soon_threadsafe(self._track, coro)
+        except RuntimeError:
+            coro.close()  # the loop already closed during shutdown
+
+    def _track(self, coro):
+        task = self.loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Engine task failed: {task.exception()}")
+
+    def submit(self, downstream, func, *args):
+        """Run a blocking call as a task without waiting for it"""
+        self.spawn(self.call(downstream, func, *args))
+
+    def every(self, name, func, schedule, busy=None, component=None, downstream="kubernetes"):
+        """Call func on an AdaptiveInterval schedule as a task until the controller stops"""
+        self.spawn(self._every(name, func, schedule, busy, component, downstream))
+
+    async def _every(self, name, func, schedule, busy, component, downstream):
+        wakeup = self.wakeups.setdefault(name, asyncio.Event())
+        while self.controller.running:
+            failed = False
+            try:
+                await self.call(downstream, func)
+            except Exception as e:
+                failed = True
+                logger.error(f"Error in {name}: {e}")
+                if component:
+                    self.controller.metrics.error(component)
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), schedule.next_delay(busy() if busy else False, failed))
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+
+    def trigger(self, name):
+        """Start the next run of a loop now, from the loop or any other thread"""
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._trigger, name)
+        except RuntimeError:
+            pass  # the loop already closed during shutdown
+
+    def _trigger(self, name):
+        wakeup = self.wakeups.get(name)
+        if wakeup is not None:
+            wakeup.set()
+
+    def start_remediation(self, options):
+        """Create the remediation queue and the task dispatching its keys"""
+        queue = AsyncRateLimitingQueue(self.loop, **options)
+        self.spawn(self._dispatch_remediations(queue))
+        return queue
+
+    async def _dispatch_remediations(self, queue):
+        while True:
+            key = await queue.get()
+            if key is None:
+                return
+            # Every key gets a task; the Kubernetes semaphore bounds how many run at once
+            self.spawn(self.call("kubernetes", self.controller._remediate_key, key))
+
+    async def run_helm_rollback(self, release, revision, detected_at):
+        """Roll back a Helm release in a subprocess once a Helm slot is free"""
+        controller = self.controller
+        async with self.semaphores["helm"]:
+            start = time.perf_counter()
+            try:
+                returncode, stderr = await self._run_helm(controller._helm_rollback_command(release, revision))
+            except asyncio.TimeoutError:
+                controller._finish_helm_rollback(release, detected_at, timed_out=True)
+            except Exception as e:
+                controller._finish_helm_rollback(release, detected_at, error=e)
+            else:
+                controller.phases.record("helm.rollback", time.perf_counter() - start)
+                controller._finish_helm_rollback(release, detected_at, returncode, stderr)
+
+    async def _run_helm(self, command):
+        """Run a helm command, returning its exit code and stderr"""
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), self.controller.config["helm_rollback_timeout"])
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        return process.returncode, stderr.decode(errors="replace")
+
+    def __len__(self):
+        return len(self.tasks)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Storm-protection circuit breaker for pod remediation
+
+When a dependency every workload shares (DNS, a database, the network)
+goes down, pods across the cluster go not-Ready together and deleting
+them cannot help: their replacements fail the same way, and the deletes
+only load the apiserver and scheduler while the outage lasts.
+
+CircuitBreaker tracks the fraction of pods that failed within a sliding
+window, cluster-wide and per namespace. A pod counts while it fails and
+for window_seconds after it recovers or goes away. A scope whose fraction
+reaches failure_ratio (with at least min_pods pods) opens: its pods are
+only observed, or with mode "throttle" remediated at throttle_per_minute.
+After open_seconds the scope turns half-open and lets a few probe
+remediations through. It closes once its fraction drops below the
+threshold, or opens again if it is still above after window_seconds.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Numeric states for the Prometheus gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CLUSTER = "cluster"
+
+
+def scope_label(namespace):
+    """Get the metric label of a breaker scope, None being the whole cluster"""
+    return CLUSTER if namespace is None else f"namespace/{namespace}"
+
+
+class ScopeState:
+    __slots__ = ("state", "changed_at", "budget", "refilled_at")
+
+    def __init__(self, now):
+        """Initialize a tripped scope"""
+        self.state = OPEN
+        self.changed_at = now
+        self.budget = 0.0
+        self.refilled_at = now
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        population,
+        failure_ratio=0.3,
+        min_pods=20,
+        window_seconds=120,
+        open_seconds=300,
+        probes=5,
+        mode="observe",
+        throttle_per_minute=6,
+        on_transition=None,
+        clock=time.monotonic,
+    ):
+        """Initialize a breaker; population(namespace) counts the pods of a namespace, or all with None"""
+        self.population = population
+        self.failure_ratio = failure_ratio
+        self.min_pods = min_pods
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.mode = mode
+        self.throttle_per_minute = throttle_per_minute
+        self.on_transition = on_transition
+        self.clock = clock
+        # pod key -> namespace, for pods failing now
+        self.failing = {}
+        # pod key -> (namespace, recovered at), oldest recovery first
+        self.recovered = OrderedDict()
+        # namespace -> pods failing now or within the window
+        self.counts = {}
+        self.total = 0
+        # Only tripped scopes have a state; every other scope is closed
+        self.scopes = {}
+        self._lock = threading.Lock()
+
+    def mark_failing(self, key, namespace):
+        """Count a failing pod"""
+        with self._lock:
+            if key in self.failing:
+                return
+            if self.recovered.pop(key, None) is None:
+                self.counts[namespace] = self.counts.get(namespace, 0) + 1
+                self.total += 1
+            self.failing[key] = namespace
+
+    def mark_recovered(self, key):
+        """Note that a pod stopped failing or went away; it still counts until the window passes"""
+        with self._lock:
+            namespace = self.failing.pop(key, None)
+            if namespace is not None:
+                self.recovered[key] = (namespace, self.clock())
+
+    def _expire(self, now):
+        """Stop counting pods that recovered more than window_seconds ago"""
+        cutoff = now - self.window_seconds
+        while self.recovered:
+            key, (namespace, recovered_at) = next(iter(self.recovered.items()))
+            if recovered_at > cutoff:
+                return
+            del self.recovered[key]
+            self.total -= 1
+            self.counts[namespace] -= 1
+            if not self.counts[namespace]:
+                del self.counts[namespace]
+
+    def failure_ratio_of(self, namespace=None):
+        """Get the failing fraction of a namespace, or of the cluster with None, and its pod count"""
+        pods = self.population(namespace)
+        failed = self.total if namespace is None else self.counts.get(namespace, 0)
+        return (min(1.0, failed / pods) if pods else 0.0), pods
+
+    def allow(self, namespace):
+        """Check if a pod of a namespace may be remediated, taking a probe or throttle slot if so"""
+        transitions = []
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            tripped = [
+                state
+                for state in (self._update(None, now, transitions), self._update(namespace, now, transitions))
+                if state is not None
+            ]
+            allowed = all(state.budget >= 1 for state in tripped)
+            if allowed:
+                for state in tripped:
+                    state.budget -= 1
+
+        self._notify(transitions)
+        return allowed
+
+    def update(self):
+        """Move the cluster and every tripped namespace through their states without remediating"""
+        transitions = []
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            for namespace in [None] + [namespace for namespace in self.scopes if namespace is not None]:
+                self._update(namespace, now, transitions)
+
+        self._notify(transitions)
+
+    def _update(self, namespace, now, transitions):
+        """Move a scope through its states, returning its state unless it is closed"""
+        ratio, pods = self.failure_ratio_of(namespace)
+        over = pods >= self.min_pods and ratio >= self.failure_ratio
+        state = self.scopes.get(namespace)
+
+        if state is None:
+            if not over:
+                return None
+            state = self.scopes[namespace] = ScopeState(now)
+            transitions.append((namespace, CLOSED, OPEN, ratio))
+        elif state.state == OPEN and now - state.changed_at >= self.open_seconds:
+            self._change(namespace, state, HALF_OPEN, now, ratio, transitions)
+            state.budget = float(self.probes)
+        elif state.state == HALF_OPEN:
+            if not over:
+                del self.scopes[namespace]
+                transitions.append((namespace, HALF_OPEN, CLOSED, ratio))
+                return None
+            if now - state.changed_at >= self.window_seconds:
+                # The probes did not bring the failures down
+                self._change(namespace, state, OPEN, now, ratio, transitions)
+                state.budget = 0.0
+
+        if state.state == OPEN and self.mode == "throttle":
+            # Refill one slot every 60 / throttle_per_minute seconds, holding at most one
+            state.budget = min(1.0, state.budget + (now - state.refilled_at) * self.throttle_per_minute / 60)
+            state.refilled_at = now
+        return state
+
+    def _change(self, namespace, state, new_state, now, ratio, transitions):
+        transitions.append((namespace, state.state, new_state, ratio))
+        state.state = new_state
+        state.changed_at = now
+        state.refilled_at = now
+
+    def _notify(self, transitions):
+        """Report state changes, outside the lock"""
+        for namespace, old, new, ratio in transitions:
+            logger.warning(f"Circuit breaker for {scope_label(namespace)} {old} -> {new} ({ratio:.0%} failing)")
+            if self.on_transition is not None:
+                self.on_transition(namespace, old, new, ratio)
+
+    def states(self):
+        """Get the state of every scope that is not closed"""
+        with self._lock:
+            return {scope_label(namespace): state.state for namespace, state in self.scopes.items()}
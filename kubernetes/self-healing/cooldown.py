@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Remediation cooldown store for the Self-Healing Controller
+
+Tracks when each pod or node was last remediated. Repeated remediations of
+the same key back off exponentially until the key is reset on recovery,
+keys that have been quiet for longer than the TTL are forgotten, and the
+store never holds more than a fixed number of keys (least recently
+remediated keys are evicted first).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CooldownStore:
+    def __init__(self, ttl=3600, max_entries=10000, max_delay=1800):
+        """Initialize the cooldown store"""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_delay = max_delay
+        # key -> (last action time, consecutive attempts), oldest action first
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Get the number of tracked keys"""
+        with self._lock:
+            return len(self.entries)
+
+    def __contains__(self, key):
+        """Check if a key is currently tracked"""
+        with self._lock:
+            return key in self.entries
+
+    def try_acquire(self, key, base_delay, now=None):
+        """Record a remediation of key unless it is still cooling down
+
+        The cooldown after the n-th consecutive remediation is
+        base_delay * 2**(n-1), capped at max_delay.
+        """
+        # Monotonic, so wall-clock jumps neither stretch nor skip cooldowns
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            self._purge_expired(now)
+
+            attempts = 0
+            entry = self.entries.get(key)
+            if entry is not None:
+                last_action, attempts = entry
+                if now - last_action < self.cooldown(base_delay, attempts):
+                    return False
+
+            self.entries[key] = (now, attempts + 1)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+            return True
+
+    def cooldown(self, base_delay, attempts):
+        """Get the cooldown after a number of consecutive remediations"""
+        if attempts <= 0:
+            return 0
+        return min(base_delay * (2 ** (attempts - 1)), self.max_delay)
+
+    def attempts(self, key):
+        """Get the number of consecutive remediations recorded for key"""
+        with self._lock:
+            entry = self.entries.get(key)
+            return entry[1] if entry else 0
+
+    def reset(self, key):
+        """Forget key, e.g. once the object is healthy or gone"""
+        with self._lock:
+            self.entries.pop(key, None)
+
+    def _purge_expired(self, now):
+        """Drop keys whose last remediation is older than the TTL"""
+        while self.entries:
+            key, (last_action, _) = next(iter(self.entries.items()))
+            if now - last_action <= self.ttl:
+                break
+            del self.entries[key]
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Replica coordination for the Self-Healing Controller
+
+Lease-based leader election for singleton duties (node handling, Kured
+annotations) and consistent-hash sharding of namespaces across all live
+replicas, so several controller replicas can run side by side without
+remediating the same objects twice.
+"""
+
+import bisect
+import datetime
+import hashlib
+import logging
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+SHARD_GROUP_LABEL = "self-healing.io/shard-group"
+
+
+def utcnow():
+    """Get the current time as an aware UTC datetime"""
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def lease_expired(lease, now):
+    """Check if a lease has not been renewed within its duration"""
+    spec = lease.spec
+    if not spec.holder_identity or spec.renew_time is None:
+        return True
+    duration = datetime.timedelta(seconds=spec.lease_duration_seconds or 0)
+    return spec.renew_time + duration < now
+
+
+class LeaseLock:
+    def __init__(
+        self, coordination_client, name, namespace, identity, lease_duration=15, renew_deadline=None, labels=None
+    ):
+        """Initialize a lock backed by a coordination.k8s.io Lease
+
+        The holder only counts the lock as held for renew_deadline (two thirds of lease_duration by default)
+        after its last successful renewal. Others may take over once lease_duration has passed, so the gap
+        absorbs renewal latency and clock skew instead of letting two replicas lead at once.
+        """
+        self.coordination_client = coordination_client
+        self.name = name
+        self.namespace = namespace
+        self.identity = identity
+        self.lease_duration = lease_duration
+        self.renew_deadline = min(lease_duration * 2 / 3 if renew_deadline is None else renew_deadline, lease_duration)
+        self.labels = labels
+        self.held_until = None
+
+    def is_held(self, now=None):
+        """Check if this replica holds the lease and it has not run out"""
+        now = now or utcnow()
+        return self.held_until is not None and now < self.held_until
+
+    def try_acquire_or_renew(self, now=None):
+        """Acquire the lease if it is free or expired, or renew it if already held"""
+        now = now or utcnow()
+
+        try:
+            lease = self.coordination_client.read_namespaced_lease(name=self.name, namespace=self.namespace)
+        except ApiException as e:
+            if e.status != 404:
+                logger.error(f"Failed to read lease {self.namespace}/{self.name}: {e}")
+                return self.is_held(now)
+            return self._create(now)
+
+        spec = lease.spec
+        if spec.holder_identity != self.identity:
+            if not lease_expired(lease, now):
+                self.held_until = None
+                return False
+            spec.acquire_time = now
+            spec.lease_transitions = (spec.lease_transitions or 0) + 1
+            logger.info(f"Taking over lease {self.namespace}/{self.name} from {spec.holder_identity}")
+
+        spec.holder_identity = self.identity
+        spec.lease_duration_seconds = self.lease_duration
+        spec.renew_time = now
+
+        try:
+            # The resourceVersion read above makes this a compare-and-swap
+            self.coordination_client.replace_namespaced_lease(name=self.name, namespace=self.namespace, body=lease)
+        except ApiException as e:
+            if e.status != 409:
+                logger.error(f"Failed to update lease {self.namespace}/{self.name}: {e}")
+            return self.is_held(now)
+
+        self.held_until = now + datetime.timedelta(seconds=self.renew_deadline)
+        return True
+
+    def _create(self, now):
+        """Create the lease with this replica as holder"""
+        lease = client.V1Lease(
+            metadata=client.V1ObjectMeta(name=self.name, namespace=self.namespace, labels=self.labels),
+            spec=client.V1LeaseSpec(
+                holder_identity=self.identity,
+                lease_duration_seconds=self.lease_duration,
+                acquire_time=now,
+                renew_time=now,
+                lease_transitions=0,
+            ),
+        )
+
+        try:
+            self.coordination_client.create_namespaced_lease(namespace=self.namespace, body=lease)
+        except ApiException as e:
+            if e.status != 409:
+                logger.error(f"Failed to create lease {self.namespace}/{self.name}: {e}")
+            return False
+
+        self.held_until = now + datetime.timedelta(seconds=self.renew_deadline)
+        return True
+
+    def release(self):
+        """Give up the lease so another replica can take over immediately"""
+        if self.held_until is None:
+            return
+
+        self.held_until = None
+        try:
+            lease = self.coordination_client.read_namespaced_lease(name=self.name, namespace=self.namespace)
+            if lease.spec.holder_identity == self.identity:
+                lease.spec.holder_identity = None
+                lease.spec.renew_time = None
+                self.coordination_client.replace_namespaced_lease(name=self.name, namespace=self.namespace, body=lease)
+        except ApiException as e:
+            logger.error(f"Failed to release lease {self.namespace}/{self.name}: {e}")
+
+
+class ShardRing:
+    def __init__(self, members, virtual_nodes=64):
+        """Build a consistent-hash ring over the given replica identities"""
+        self.members = sorted(set(members))
+        self.points = []
+        self.owners = []
+
+        ring = sorted(
+            (self._hash(f"{member}#{index}"), member) for member in self.members for index in range(virtual_nodes)
+        )
+        for point, member in ring:
+            self.points.append(point)
+            self.owners.append(member)
+
+    @staticmethod
+    def _hash(value):
+        """Hash a string onto the ring (stable across processes)"""
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def owner(self, key):
+        """Get the replica owning a key, or None for an empty ring"""
+        if not self.points:
+            return None
+        index = bisect.bisect(self.points, self._hash(key)) % len(self.points)
+        return self.owners[index]
+
+
+class ShardMembership:
+    def __init__(self, coordination_client, namespace, identity, group, lease_duration=15, virtual_nodes=64):
+        """Initialize namespace sharding across the replicas of a group"""
+        self.coordination_client = coordination_client
+        self.namespace = namespace
+        self.identity = identity
+        self.group = group
+        self.lease_duration = lease_duration
+        self.virtual_nodes = virtual_nodes
+        self.member_lock = LeaseLock(
+            coordination_client,
+            f"{group}-member-{identity}",
+            namespace,
+            identity,
+            lease_duration=lease_duration,
+            labels={SHARD_GROUP_LABEL: group},
+        )
+        self.ring = ShardRing([identity], virtual_nodes)
+
+    def heartbeat(self, now=None):
+        """Renew this replica's membership lease and rebuild the ring from live members"""
+        now = now or utcnow()
+        self.member_lock.try_acquire_or_renew(now)
+
+        try:
+            leases = self.coordination_client.list_namespaced_lease(
+                namespace=self.namespace, label_selector=f"{SHARD_GROUP_LABEL}={self.group}"
+            )
+        except ApiException as e:
+            logger.error(f"Failed to list shard members: {e}")
+            return
+
+        members = {lease.spec.holder_identity for lease in leases.items if not lease_expired(lease, now)}
+        members.add(self.identity)
+
+        if sorted(members) != self.ring.members:
+            logger.info(f"Shard membership changed: {sorted(members)}")
+            self.ring = ShardRing(members, self.virtual_nodes)
+
+    def owns(self, namespace):
+        """Check if this replica is responsible for a namespace"""
+        return self.ring.owner(namespace) in (None, self.identity)
+
+    def leave(self):
+        """Drop out of the group so the remaining replicas rebalance"""
+        self.member_lock.release()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Disruption budget for Kured node reboots
+
+Asking Kured to reboot every NotReady node the moment it is seen turns a
+zone-wide network blip into a zone-wide reboot. RebootScheduler queues
+reboot requests in a heap ordered by how long each node has been down and
+only releases them while the cluster-wide concurrency limit, the per-zone
+fraction and the minimum spacing between reboots allow. Its state lives in
+a ConfigMap so a restarted (or newly elected) controller keeps the budget.
+"""
+
+import heapq
+import json
+import logging
+import threading
+import time
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY = "state"
+
+
+class ConfigMapState:
+    def __init__(self, core_client, name, namespace):
+        """Initialize JSON state persisted in a ConfigMap"""
+        self.core_client = core_client
+        self.name = name
+        self.namespace = namespace
+        self.resource_version = None
+
+    def load(self):
+        """Read the stored state, or None if there is none"""
+        try:
+            config_map = self.core_client.read_namespaced_config_map(name=self.name, namespace=self.namespace)
+        except ApiException as e:
+            if e.status != 404:
+                logger.error(f"Failed to read ConfigMap {self.namespace}/{self.name}: {e}")
+            self.resource_version = None
+            return None
+
+        self.resource_version = config_map.metadata.resource_version
+        raw = (config_map.data or {}).get(STATE_KEY)
+        return json.loads(raw) if raw else None
+
+    def save(self, state):
+        """Write the state, returning False if someone else changed it since it was loaded"""
+        body = client.V1ConfigMap(
+            metadata=client.V1ObjectMeta(
+                name=self.name, namespace=self.namespace, resource_version=self.resource_version
+            ),
+            data={STATE_KEY: json.dumps(state, sort_keys=True)},
+        )
+
+        try:
+            if self.resource_version is None:
+                result = self.core_client.create_namespaced_config_map(namespace=self.namespace, body=body)
+            else:
+                # The resourceVersion makes this a compare-and-swap
+                result = self.core_client.replace_namespaced_config_map(
+                    name=self.name, namespace=self.namespace, body=body
+                )
+        except ApiException as e:
+            if e.status != 409:
+                logger.error(f"Failed to write ConfigMap {self.namespace}/{self.name}: {e}")
+            return False
+
+        self.resource_version = result.metadata.resource_version if result is not None else None
+        return True
+
+
+class RebootScheduler:
+    def __init__(self, max_concurrent=1, max_zone_fraction=0.25, spacing=300, reboot_timeout=1800, store=None):
+        """Initialize a scheduler releasing reboots within the given disruption budget"""
+        self.max_concurrent = max_concurrent
+        self.max_zone_fraction = max_zone_fraction
+        self.spacing = spacing
+        self.reboot_timeout = reboot_timeout
+        self.store = store
+        # node -> {"zone", "down_since"}, ordered by down_since through the heap
+        self.pending = {}
+        self.heap = []
+        # node -> {"zone", "down_since", "started_at"}
+        self.in_flight = {}
+        self.last_reboot_at = None
+        self.zone_sizes = {}
+        self.loaded = store is None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Restore the persisted queue and reboots in flight"""
+        if self.store is None:
+            return
+        state = self.store.load() or {}
+
+        with self._lock:
+            self.pending = state.get("pending", {})
+            self.in_flight = state.get("in_flight", {})
+            self.last_reboot_at = state.get("last_reboot_at")
+            self.heap = [(entry["down_since"], node) for node, entry in self.pending.items()]
+            heapq.heapify(self.heap)
+            self.loaded = True
+
+        if self.pending or self.in_flight:
+            logger.info(f"Restored {len(self.pending)} queued and {len(self.in_flight)} in-flight reboots")
+
+    def set_zones(self, zones):
+        """Set the zone of every node, used to size the per-zone budget"""
+        sizes = {}
+        for zone in zones.values():
+            sizes[zone] = sizes.get(zone, 0) + 1
+        with self._lock:
+            self.zone_sizes = sizes
+
+    def zone_budget(self, zone):
+        """Get how many nodes of a zone may reboot at once"""
+        return max(1, int(self.max_zone_fraction * self.zone_sizes.get(zone, 0)))
+
+    def request(self, node, zone, down_since):
+        """Queue a reboot of a node, returning False if it is already queued or rebooting"""
+        with self._lock:
+            if node in self.pending or node in self.in_flight:
+                return False
+            self.pending[node] = {"zone": zone, "down_since": down_since}
+            heapq.heappush(self.heap, (down_since, node))
+
+        self._persist()
+        return True
+
+    def complete(self, node):
+        """Forget a node that is Ready again, whether its reboot was queued or in flight"""
+        with self._lock:
+            found = self.pending.pop(node, None) is not None
+            found = self.in_flight.pop(node, None) is not None or found
+
+        if found:
+            self._persist()
+        return found
+
+    def abort(self, node):
+        """Put a node whose reboot could not be started back in the queue"""
+        with self._lock:
+            entry = self.in_flight.pop(node, None)
+            if entry is None:
+                return
+            down_since = entry.get("down_since", entry["started_at"])
+            self.pending[node] = {"zone": entry["zone"], "down_since": down_since}
+            heapq.heappush(self.heap, (down_since, node))
+
+        self._persist()
+
+    def due(self, now=None):
+        """Release the longest-down nodes the budget allows to reboot now"""
+        now = time.time() if now is None else now
+        chosen = []
+
+        with self._lock:
+            expired = [
+                node for node, entry in self.in_flight.items() if now - entry["started_at"] > self.reboot_timeout
+            ]
+            for node in expired:
+                logger.warning(f"Reboot of {node} did not bring it back within {self.reboot_timeout}s")
+                del self.in_flight[node]
+
+            deferred = []
+            while self.heap and len(self.in_flight) < self.max_concurrent:
+                if self.last_reboot_at is not None and now - self.last_reboot_at < self.spacing:
+                    break
+
+                down_since, node = heapq.heappop(self.heap)
+                entry = self.pending.get(node)
+                if entry is None or entry["down_since"] != down_since:
+                    continue  # cancelled or re-queued since it was pushed
+
+                zone = entry["zone"]
+                if sum(1 for other in self.in_flight.values() if other["zone"] == zone) >= self.zone_budget(zone):
+                    deferred.append((down_since, node))
+                    continue
+
+                del self.pending[node]
+                self.in_flight[node] = {"zone": zone, "down_since": down_since, "started_at": now}
+                self.last_reboot_at = now
+                chosen.append(node)
+
+            for item in deferred:
+                heapq.heappush(self.heap, item)
+
+        if (chosen or expired) and not self._persist():
+            # Another controller owns the budget now; the reloaded state decides next time
+            return []
+        return chosen
+
+    def _persist(self):
+        """Write the state to the store, reloading it if another writer got there first"""
+        if self.store is None:
+            return True
+
+        with self._lock:
+            state = {"pending": self.pending, "in_flight": self.in_flight, "last_reboot_at": self.last_reboot_at}
+            saved = self.store.save(state)
+
+        if not saved:
+            logger.warning("Disruption state changed underneath us, reloading it")
+            self.load()
+        return saved
+
+    def nodes(self):
+        """Get the nodes whose reboot is queued or in flight"""
+        with self._lock:
+            return list(self.pending) + list(self.in_flight)
+
+    def snapshot(self):
+        """Get the number of queued and in-flight reboots"""
+        with self._lock:
+            return {"pending": len(self.pending), "in_flight": len(self.in_flight)}
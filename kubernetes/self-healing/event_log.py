@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Record and replay of the cluster event streams the controller sees
+
+With EVENT_LOG_PATH set, RecordingApi wraps the controller's API clients and
+EventRecorder appends every pod, node and node-lease LIST page and watch
+event they return to a gzipped JSONL log, one record per line:
+
+    {"t": <epoch seconds>, "kind": "pods", "list": <LIST response body>}
+    {"t": <epoch seconds>, "kind": "pods", "watch": <watch event>}
+
+Payloads are written as received, without being parsed again. Each process
+appends a new gzip member, so a log survives restarts and a crash only loses
+what was not flushed yet.
+
+EventReplayer feeds a log back into a FakeCluster, at the recorded pace or
+as fast as possible, and runs the controller's scans on the log's clock.
+Replaying one production incident against two versions of the controller
+and diffing the actions they took compares their decisions; the summary
+also reports throughput, and --profile records where the time went:
+
+    python event_log.py incident.jsonl.gz --speed max --output after.json
+"""
+
+import functools
+import gzip
+import logging
+import threading
+import time
+
+from kubernetes import client
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+logger = logging.getLogger(__name__)
+
+# API client method -> kind of the objects it lists and watches
+RECORDED_LISTS = {
+    "list_pod_for_all_namespaces": "pods",
+    "list_node": "nodes",
+    "list_namespaced_lease": "leases",
+}
+
+
+class EventRecorder:
+    def __init__(self, path, flush_interval=1.0, clock=time.time):
+        """Initialize a recorder appending to the gzipped JSONL log at path"""
+        self.path = path
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.records = 0
+        self._file = gzip.open(path, "ab")
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, kind, field, payload):
+        """Append one record holding payload, the raw JSON of a LIST body or watch event"""
+        line = b'{"t":%.6f,"kind":"%s","%s":%s}\n' % (self.clock(), kind.encode(), field.encode(), payload.strip())
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self.records += 1
+
+            now = time.monotonic()
+            if now - self._flushed_at >= self.flush_interval:
+                # A sync flush makes everything written so far readable after a crash
+                self._file.flush()
+                self._flushed_at = now
+
+    def close(self):
+        """Flush and close the log"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RecordingStream:
+    """Watch response that records every event line it streams"""
+
+    def __init__(self, response, recorder, kind):
+        self._response = response
+        self._recorder = recorder
+        self._kind = kind
+        self._partial = b""
+
+    def stream(self, *args, **kwargs):
+        for segment in self._response.stream(*args, **kwargs):
+            self._record(segment)
+            yield segment
+
+    def _record(self, segment):
+        if isinstance(segment, str):
+            segment = segment.encode()
+        lines = (self._partial + segment).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                self._recorder.record(self._kind, "watch", line)
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+class RecordingApi:
+    """Proxy for a Kubernetes API client that records what its list and watch calls return"""
+
+    def __init__(self, api, recorder, kinds=None):
+        self._api = api
+        self._recorder = recorder
+        self._kinds = RECORDED_LISTS if kinds is None else kinds
+        self._serializer = client.ApiClient()
+
+    def __getattr__(self, name):
+        func = getattr(self._api, name)
+        kind = self._kinds.get(name)
+        if kind is None or not callable(func):
+            return func
+
+        # wraps() keeps the docstring Watch reads the return type from
+        @functools.wraps(func)
+        def recorded(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if kwargs.get("watch"):
+                return RecordingStream(result, self._recorder, kind)
+            if kwargs.get("_preload_content", True):
+                payload = _dumps(self._serializer.sanitize_for_serialization(result))
+            else:
+                payload = result.data
+            self._recorder.record(kind, "list", payload)
+            return result
+
+        setattr(self, name, recorded)
+        return recorded
+
+
+def read_log(path):
+    """Yield the records of an event log in order, stopping at a torn tail"""
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+        except (EOFError, OSError, ValueError) as e:
+            logger.warning(f"Event log {path} ends in an incomplete record: {e}")
+
+
+def object_key(obj):
+    """Get the namespace/name key of a raw object"""
+    metadata = obj["metadata"]
+    namespace = metadata.get("namespace")
+    return f"{namespace}/{metadata['name']}" if namespace else metadata["name"]
+
+
+class EventReplayer:
+    def __init__(self, cluster):
+        """Initialize a replayer applying recorded events to a FakeCluster"""
+        self.cluster = cluster
+        self.applied = 0
+        # kind -> items of a paginated LIST whose last page was not seen yet
+        self._pages = {}
+
+    def apply(self, record):
+        """Apply one record to the cluster"""
+        kind = record["kind"]
+        if "list" in record:
+            body = record["list"]
+            items = self._pages.setdefault(kind, [])
+            items.extend(body.get("items") or ())
+            if not (body.get("metadata") or {}).get("continue"):
+                self.cluster.reconcile(kind, {object_key(obj): obj for obj in self._pages.pop(kind)})
+        else:
+            event = record["watch"]
+            if event["type"] in ("ADDED", "MODIFIED", "DELETED"):
+                self.cluster.apply_event(kind, event["type"], object_key(event["object"]), event["object"])
+        self.applied += 1
+
+    def replay(self, records, speed=None, on_tick=None, tick_interval=None):
+        """Apply records at speed times their recorded pace, or as fast as possible when speed is None
+
+        on_tick(log_seconds) runs every tick_interval seconds of log time,
+        seeing the cluster as it was at that moment, and once at the end.
+        Returns how many seconds of log time were replayed.
+        """
+        started = time.monotonic()
+        first = last = next_tick = None
+
+        for record in records:
+            last = record["t"]
+            if first is None:
+                first = last
+                next_tick = first + tick_interval if tick_interval else None
+
+            while on_tick and next_tick is not None and last >= next_tick:
+                on_tick(next_tick - first)
+                next_tick += tick_interval
+
+            if speed:
+                delay = (last - first) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            self.apply(record)
+
+        elapsed = 0.0 if first is None else last - first
+        if on_tick:
+            on_tick(elapsed)
+        return elapsed
+
+
+def replay_controller(controller, cluster, path, speed=None):
+    """Replay a log into a controller installed on cluster, returning a summary of what it did
+
+    Pod scans run every check_interval and node scans every other one, on the
+    log's clock. At maximum speed the controller's own timers (cooldowns,
+    crash-loop windows) still run on the wall clock.
+    """
+    cluster.install(controller)
+
+    def rollback(release, revision, detected_at):
+        # Record the decision instead of running helm
+        cluster.record_action("helm_rollback", f"{release['namespace']}/{release['release']}", revision)
+        controller._finish_helm_rollback(release, detected_at, 0, "")
+
+    controller._run_helm_rollback = rollback
+    scans = {"pods": 0, "nodes": 0}
+
+    def scan(log_seconds):
+        controller._check_pods()
+        scans["pods"] += 1
+        if scans["pods"] % 2 == 1:
+            controller._check_nodes()
+            scans["nodes"] += 1
+
+    replayer = EventReplayer(cluster)
+    start = time.perf_counter()
+    log_seconds = replayer.replay(read_log(path), speed, scan, controller.config["check_interval"])
+    wall_seconds = time.perf_counter() - start
+
+    actions = [[verb, target] for _, verb, target, _ in cluster.actions]
+    counts = {}
+    for verb, _ in actions:
+        counts[verb] = counts.get(verb, 0) + 1
+
+    return {
+        "records": replayer.applied,
+        "log_seconds": round(log_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "records_per_second": round(replayer.applied / wall_seconds, 1) if wall_seconds else None,
+        "scans": scans,
+        "action_counts": counts,
+        "actions": actions,
+    }
+
+
+def main():
+    """Replay an event log into a controller backed by a fake cluster and print what it did"""
+    import argparse
+    import cProfile
+    import json
+
+    from fake_cluster import FakeCluster
+    from self_healing_controller import SelfHealingController
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("log", help="gzipped JSONL event log recorded with EVENT_LOG_PATH")
+    parser.add_argument("--speed", default="max", help="replay pace relative to the recording, or max (default)")
+    parser.add_argument("--output", help="write the summary to this file instead of stdout")
+    parser.add_argument("--profile", help="write cProfile stats of the replay to this file")
+    args = parser.parse_args()
+
+    cluster = FakeCluster(replace_deleted_pods=False)
+    controller = SelfHealingController(clients=cluster)
+    speed = None if args.speed == "max" else float(args.speed)
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    summary = replay_controller(controller, cluster, args.log, speed)
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,870 @@
+#!/usr/bin/env python3
+"""
+In-process fake Kubernetes API for the Self-Healing Controller
+
+FakeCluster keeps synthetic pods, nodes, workloads, leases and Helm release
+Secrets as raw JSON
+dicts and serves them through drop-in stand-ins for CoreV1Api, AppsV1Api
+and CoordinationV1Api: paginated LISTs with field and label selectors, raw
+(_preload_content=False) responses, WATCH streams with resourceVersion
+resume and 410 Gone, and the write calls the controller makes. Failure
+patterns (crash loops, NotReady pods and nodes, mass failures) can be
+injected, or replayed from a recorded event log, and every API call,
+delete, patch and Slack message is recorded so simulations and benchmarks
+can run without a real cluster.
+"""
+
+import base64
+import bisect
+import copy
+import datetime
+import gzip
+import json
+import threading
+import time
+from collections import Counter, deque
+from types import SimpleNamespace
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+HTTP_GONE = 410
+
+
+def utcnow():
+    """Get the current time in the apiserver's timestamp format"""
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_selector(selector):
+    """Parse a field or label selector into (key, operator, value) terms"""
+    terms = []
+    for term in (selector or "").split(","):
+        term = term.strip()
+        if not term:
+            continue
+        if "!=" in term:
+            key, value = term.split("!=", 1)
+            terms.append((key, "!=", value))
+        elif "==" in term:
+            key, value = term.split("==", 1)
+            terms.append((key, "=", value))
+        elif "=" in term:
+            key, value = term.split("=", 1)
+            terms.append((key, "=", value))
+        else:
+            terms.append((term, "exists", None))
+    return terms
+
+
+def field_value(obj, path):
+    """Resolve a dotted field path such as status.phase in a raw object"""
+    value = obj
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def matches(obj, field_terms, label_terms):
+    """Check an object against parsed field and label selectors"""
+    for path, operator, expected in field_terms:
+        actual = field_value(obj, path) or ""
+        if (operator == "=") != (actual == expected):
+            return False
+
+    labels = obj["metadata"].get("labels") or {}
+    for key, operator, expected in label_terms:
+        if operator == "exists":
+            if key not in labels:
+                return False
+        elif (operator == "=") != (labels.get(key) == expected):
+            return False
+
+    return True
+
+
+def without_version(obj):
+    """Get a shallow copy of a raw object without its resourceVersion, for comparing content"""
+    metadata = {key: value for key, value in obj["metadata"].items() if key != "resourceVersion"}
+    return {**obj, "metadata": metadata}
+
+
+class RawResponse:
+    """Stand-in for the urllib3 response returned with _preload_content=False"""
+
+    def __init__(self, data=b"", lines=None):
+        self.data = data
+        self.lines = lines
+
+    def stream(self, amt=None, decode_content=False):
+        for line in self.lines or ():
+            yield line
+
+    def close(self):
+        if hasattr(self.lines, "close"):
+            self.lines.close()
+
+    def release_conn(self):
+        pass
+
+
+class FakeCluster:
+    def __init__(self, watch_history=10000, replace_deleted_pods=True):
+        """Initialize an empty fake cluster"""
+        self.objects = {
+            "pods": {},
+            "nodes": {},
+            "namespaces": {},
+            "replicasets": {},
+            "deployments": {},
+            "leases": {},
+            "configmaps": {},
+            "secrets": {},
+        }
+        self.sorted_keys = {}
+        self.resource_version = 0
+        self.history = deque(maxlen=watch_history)
+        self.replace_deleted_pods = replace_deleted_pods
+        self.calls = Counter()
+        self.actions = []
+        self.api_client = client.ApiClient()
+        self._cond = threading.Condition(threading.RLock())
+        self._pod_counter = 0
+
+        self.core_v1 = FakeCoreV1Api(self)
+        self.apps_v1 = FakeAppsV1Api(self)
+        self.coordination_v1 = FakeCoordinationV1Api(self)
+
+    # -- bookkeeping -------------------------------------------------------
+
+    def record_call(self, name):
+        """Count an API call"""
+        with self._cond:
+            self.calls[name] += 1
+
+    def record_action(self, verb, target, detail=None):
+        """Record a write or notification made by the controller"""
+        with self._cond:
+            self.actions.append((time.monotonic(), verb, target, detail))
+
+    def actions_for(self, verb):
+        """Get the targets of all recorded actions of one kind"""
+        with self._cond:
+            return [target for _, action, target, _ in self.actions if action == verb]
+
+    def actions_since(self, since):
+        """Get (time, verb, target) of the actions recorded at or after a time.monotonic() value"""
+        with self._cond:
+            return [(at, verb, target) for at, verb, target, _ in self.actions if at >= since]
+
+    def reset_counters(self):
+        """Forget recorded calls and actions"""
+        with self._cond:
+            self.calls.clear()
+            self.actions.clear()
+
+    def _next_version(self):
+        self.resource_version += 1
+        return str(self.resource_version)
+
+    def _store(self, kind, key, obj, event_type):
+        """Store an object and publish a watch event for it"""
+        with self._cond:
+            obj["metadata"]["resourceVersion"] = self._next_version()
+            store = self.objects[kind]
+            if key not in store:
+                self.sorted_keys.pop(kind, None)
+            store[key] = obj
+            self.history.append((self.resource_version, kind, event_type, obj))
+            self._cond.notify_all()
+            return obj
+
+    def _remove(self, kind, key):
+        """Remove an object and publish a DELETED event"""
+        with self._cond:
+            obj = self.objects[kind].pop(key, None)
+            if obj is None:
+                return None
+            self.sorted_keys.pop(kind, None)
+            obj = copy.deepcopy(obj)
+            obj["metadata"]["resourceVersion"] = self._next_version()
+            self.history.append((self.resource_version, kind, "DELETED", obj))
+            self._cond.notify_all()
+            return obj
+
+    def _keys(self, kind):
+        """Get the sorted keys of a kind, rebuilt only after adds and deletes"""
+        keys = self.sorted_keys.get(kind)
+        if keys is None:
+            keys = sorted(self.objects[kind])
+            self.sorted_keys[kind] = keys
+        return keys
+
+    # -- object builders ---------------------------------------------------
+
+    def add_node(self, name, zone="zone-a", ready=True):
+        """Add a node"""
+        node = {
+            "apiVersion": "v1",
+            "kind": "Node",
+            "metadata": {
+                "name": name,
+                "labels": {"kubernetes.io/hostname": name, "topology.kubernetes.io/zone": zone},
+                "annotations": {},
+            },
+            "status": {"conditions": [{"type": "Ready", "status": "True" if ready else "False"}]},
+        }
+        self._store("nodes", name, node, "ADDED")
+        self.renew_node_lease(name)
+        return node
+
+    def add_namespace(self, name, annotations=None):
+        """Add a namespace"""
+        namespace = {
+            "apiVersion": "v1",
+            "kind": "Namespace",
+            "metadata": {"name": name, "annotations": dict(annotations or {})},
+        }
+        return self._store("namespaces", name, namespace, "ADDED")
+
+    def add_pod(
+        self, namespace, name, node_name=None, owner=None, labels=None, ready=True, restarts=0, priority_class=None
+    ):
+        """Add a running pod"""
+        pod = {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": name,
+                "namespace": namespace,
+                "uid": f"uid-{namespace}-{name}",
+                "labels": dict(labels or {}),
+                "ownerReferences": [owner] if owner else [],
+                "creationTimestamp": utcnow(),
+            },
+            "spec": {"nodeName": node_name, "containers": [{"name": "app", "image": "app:latest"}]},
+            "status": {
+                "phase": "Running",
+                "conditions": [{"type": "Ready", "status": "True" if ready else "False"}],
+                "containerStatuses": [
+                    {
+                        "name": "app",
+                        "ready": ready,
+                        "restartCount": restarts,
+                        "image": "app:latest",
+                        "imageID": "sha256:app",
+                    }
+                ],
+            },
+        }
+        if priority_class:
+            pod["spec"]["priorityClassName"] = priority_class
+        return self._store("pods", f"{namespace}/{name}", pod, "ADDED")
+
+    def add_deployment(self, namespace, name, replicas, nodes=None, labels=None):
+        """Add a Deployment with one ReplicaSet and its pods"""
+        labels = dict(labels or {}, app=name)
+        replica_set_name = f"{name}-{abs(hash(name)) % 100000:05d}"
+
+        deployment = {
+            "apiVersion": "apps/v1",
+            "kind": "Deployment",
+            "metadata": {"name": name, "namespace": namespace, "uid": f"uid-{namespace}-{name}"},
+            "spec": {
+                "replicas": replicas,
+                "selector": {"matchLabels": {"app": name}},
+                "template": {"metadata": {"labels": labels}, "spec": {"containers": [{"name": "app"}]}},
+            },
+        }
+        replica_set = {
+            "apiVersion": "apps/v1",
+            "kind": "ReplicaSet",
+            "metadata": {
+                "name": replica_set_name,
+                "namespace": namespace,
+                "labels": labels,
+                "annotations": {"deployment.kubernetes.io/revision": "1"},
+                "ownerReferences": [self._owner("Deployment", name, namespace)],
+            },
+            "spec": {"selector": {"matchLabels": {"app": name}}, "template": deployment["spec"]["template"]},
+        }
+        self._store("deployments", f"{namespace}/{name}", deployment, "ADDED")
+        self._store("replicasets", f"{namespace}/{replica_set_name}", replica_set, "ADDED")
+
+        owner = self._owner("ReplicaSet", replica_set_name, namespace)
+        for index in range(replicas):
+            node_name = nodes[index % len(nodes)] if nodes else None
+            self.add_pod(namespace, f"{replica_set_name}-{index:05d}", node_name=node_name, owner=owner, labels=labels)
+        return deployment
+
+    def add_helm_revision(self, namespace, name, version, status="deployed", description=None):
+        """Add one revision of a Helm release as Helm 3 stores it, superseding the previous one"""
+        previous = self.objects["secrets"].get(f"{namespace}/sh.helm.release.v1.{name}.v{version - 1}")
+        if previous is not None and previous["metadata"]["labels"]["status"] == "deployed":
+            previous = copy.deepcopy(previous)
+            previous["metadata"]["labels"]["status"] = "superseded"
+            self._store("secrets", f"{namespace}/{previous['metadata']['name']}", previous, "MODIFIED")
+
+        release = {
+            "name": name,
+            "namespace": namespace,
+            "version": version,
+            "info": {
+                "status": status,
+                "description": description or ("Install complete" if version == 1 else "Upgrade complete"),
+            },
+            "chart": {"metadata": {"name": name, "version": f"1.0.{version}"}},
+            "manifest": "---\n" * 100,
+        }
+        payload = base64.b64encode(gzip.compress(json.dumps(release).encode()))
+        secret_name = f"sh.helm.release.v1.{name}.v{version}"
+        secret = {
+            "apiVersion": "v1",
+            "kind": "Secret",
+            "type": "helm.sh/release.v1",
+            "metadata": {
+                "name": secret_name,
+                "namespace": namespace,
+                "labels": {"owner": "helm", "name": name, "status": status, "version": str(version)},
+            },
+            "data": {"release": base64.b64encode(payload).decode()},
+        }
+        return self._store("secrets", f"{namespace}/{secret_name}", secret, "ADDED")
+
+    def _owner(self, kind, name, namespace):
+        return {
+            "apiVersion": "apps/v1",
+            "kind": kind,
+            "name": name,
+            "uid": f"uid-{namespace}-{name}",
+            "controller": True,
+        }
+
+    def populate(self, pods=1000, nodes=10, namespaces=10, pods_per_deployment=10, zones=3):
+        """Fill the cluster with nodes and Deployments totalling roughly the requested pods"""
+        node_names = [f"node-{index:04d}" for index in range(nodes)]
+        for index, node_name in enumerate(node_names):
+            self.add_node(node_name, zone=f"zone-{chr(ord('a') + index % zones)}")
+
+        deployments = max(1, pods // pods_per_deployment)
+        for index in range(deployments):
+            namespace = f"team-{index % namespaces:03d}"
+            self.add_deployment(namespace, f"app-{index:05d}", pods_per_deployment, nodes=node_names)
+
+    # -- failure injection -------------------------------------------------
+
+    def _update_pod(self, key, mutate):
+        with self._cond:
+            pod = self.objects["pods"].get(key)
+            if pod is None:
+                raise KeyError(key)
+            pod = copy.deepcopy(pod)
+            mutate(pod)
+            return self._store("pods", key, pod, "MODIFIED")
+
+    def fail_pod(self, key, phase="Running"):
+        """Make a pod not Ready (or Failed/Unknown via phase)"""
+
+        def mutate(pod):
+            pod["status"]["phase"] = phase
+            pod["status"]["conditions"] = [{"type": "Ready", "status": "False"}]
+            for container in pod["status"]["containerStatuses"]:
+                container["ready"] = False
+
+        return self._update_pod(key, mutate)
+
+    def crash_loop(self, key, restarts=5, reason="Error"):
+        """Make a pod look like it is crash looping, which also takes it out of Ready"""
+
+        def mutate(pod):
+            pod["status"]["conditions"] = [{"type": "Ready", "status": "False"}]
+            for container in pod["status"]["containerStatuses"]:
+                container["ready"] = False
+                container["restartCount"] += restarts
+                container["lastState"] = {"terminated": {"reason": reason, "exitCode": 1, "finishedAt": utcnow()}}
+
+        return self._update_pod(key, mutate)
+
+    def heal_pod(self, key):
+        """Make a pod Ready again"""
+
+        def mutate(pod):
+            pod["status"]["phase"] = "Running"
+            pod["status"]["conditions"] = [{"type": "Ready", "status": "True"}]
+            for container in pod["status"]["containerStatuses"]:
+                container["ready"] = True
+
+        return self._update_pod(key, mutate)
+
+    def mass_failure(self, fraction, namespace=None):
+        """Make a fraction of all pods (optionally in one namespace) not Ready"""
+        with self._cond:
+            keys = [key for key in self._keys("pods") if namespace is None or key.startswith(f"{namespace}/")]
+        step = max(1, int(round(1 / fraction))) if fraction > 0 else 0
+        failed = keys[::step] if step else []
+        for key in failed:
+            self.fail_pod(key)
+        return failed
+
+    def set_node_ready(self, name, ready, fail_pods=True):
+        """Flip a node's Ready condition, optionally taking its pods down with it"""
+        with self._cond:
+            node = copy.deepcopy(self.objects["nodes"][name])
+            node["status"]["conditions"] = [{"type": "Ready", "status": "True" if ready else "False"}]
+            self._store("nodes", name, node, "MODIFIED")
+
+            if fail_pods:
+                for key, pod in list(self.objects["pods"].items()):
+                    if pod["spec"].get("nodeName") == name:
+                        if ready:
+                            self.heal_pod(key)
+                        else:
+                            self.fail_pod(key)
+
+    def pods_on_node(self, name):
+        """Get the keys of all pods scheduled on a node"""
+        with self._cond:
+            return [key for key, pod in self.objects["pods"].items() if pod["spec"].get("nodeName") == name]
+
+    def select_pods(self, namespace, labels=None):
+        """Get the keys of the pods of a namespace carrying all the given labels"""
+        labels = labels or {}
+        with self._cond:
+            return [
+                key
+                for key in self._keys("pods")
+                if key.startswith(f"{namespace}/")
+                and all(
+                    (self.objects["pods"][key]["metadata"].get("labels") or {}).get(k) == v for k, v in labels.items()
+                )
+            ]
+
+    def workload_of(self, key):
+        """Get namespace/name of the Deployment owning a pod through its ReplicaSet, or None"""
+        with self._cond:
+            pod = self.objects["pods"].get(key)
+            if pod is None:
+                return None
+            namespace = pod["metadata"]["namespace"]
+            for owner in pod["metadata"].get("ownerReferences") or []:
+                replica_set = self.objects["replicasets"].get(f"{namespace}/{owner['name']}")
+                if owner["kind"] == "ReplicaSet" and replica_set is not None:
+                    for parent in replica_set["metadata"].get("ownerReferences") or []:
+                        if parent["kind"] == "Deployment":
+                            return f"{namespace}/{parent['name']}"
+            return None
+
+    def failing_pods(self):
+        """Get the keys of all pods that are not Ready"""
+        with self._cond:
+            return [
+                key
+                for key, pod in self.objects["pods"].items()
+                if any(c["type"] == "Ready" and c["status"] != "True" for c in pod["status"]["conditions"])
+            ]
+
+    def renew_node_lease(self, name, renew_time=None):
+        """Renew a node's heartbeat Lease in kube-node-lease"""
+        renew_time = renew_time or datetime.datetime.now(datetime.timezone.utc)
+        lease = {
+            "apiVersion": "coordination.k8s.io/v1",
+            "kind": "Lease",
+            "metadata": {"name": name, "namespace": "kube-node-lease"},
+            "spec": {
+                "holderIdentity": name,
+                "leaseDurationSeconds": 40,
+                "renewTime": renew_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            },
+        }
+        self._store("leases", f"kube-node-lease/{name}", lease, "MODIFIED")
+
+    # -- replay of recorded events (see event_log.py) ---------------------
+
+    def apply_event(self, kind, event_type, key, obj):
+        """Apply a recorded watch event"""
+        if event_type == "DELETED":
+            self._remove(kind, key)
+        else:
+            self._store(kind, key, copy.deepcopy(obj), event_type)
+
+    def reconcile(self, kind, objects):
+        """Make a kind hold exactly the objects of a recorded LIST, publishing only the differences"""
+        with self._cond:
+            store = self.objects[kind]
+            for key in [key for key in store if key not in objects]:
+                self._remove(kind, key)
+            for key, obj in objects.items():
+                old = store.get(key)
+                if old is None:
+                    self._store(kind, key, copy.deepcopy(obj), "ADDED")
+                elif without_version(old) != without_version(obj):
+                    self._store(kind, key, copy.deepcopy(obj), "MODIFIED")
+
+    # -- controller-side behaviour ----------------------------------------
+
+    def delete_pod(self, key):
+        """Delete a pod, letting its ReplicaSet replace it with a healthy pod"""
+        with self._cond:
+            pod = self._remove("pods", key)
+            if pod is None:
+                return None
+
+            owners = pod["metadata"].get("ownerReferences") or []
+            if self.replace_deleted_pods and owners:
+                self._pod_counter += 1
+                namespace = pod["metadata"]["namespace"]
+                base = pod["metadata"]["name"].rsplit("-", 1)[0]
+                self.add_pod(
+                    namespace,
+                    f"{base}-r{self._pod_counter:05d}",
+                    node_name=self._healthy_node(pod["spec"].get("nodeName")),
+                    owner=owners[0],
+                    labels=pod["metadata"].get("labels"),
+                )
+            return pod
+
+    def _healthy_node(self, preferred):
+        """Pick a Ready node for a replacement pod"""
+        nodes = self.objects["nodes"]
+        if preferred in nodes and self._node_ready(nodes[preferred]):
+            return preferred
+        for name in self._keys("nodes"):
+            if self._node_ready(nodes[name]):
+                return name
+        return preferred
+
+    @staticmethod
+    def _node_ready(node):
+        return any(c["type"] == "Ready" and c["status"] == "True" for c in node["status"]["conditions"])
+
+    def restart_workload(self, namespace, name):
+        """Replace every pod selected by a Deployment with a healthy one"""
+        with self._cond:
+            deployment = self.objects["deployments"].get(f"{namespace}/{name}")
+            if deployment is None:
+                return
+            selector = deployment["spec"]["selector"]["matchLabels"]
+            keys = [
+                key
+                for key, pod in self.objects["pods"].items()
+                if pod["metadata"]["namespace"] == namespace
+                and all((pod["metadata"].get("labels") or {}).get(k) == v for k, v in selector.items())
+            ]
+            for key in keys:
+                self.delete_pod(key)
+
+    # -- serving -----------------------------------------------------------
+
+    def list_raw(self, kind, namespace=None, field_selector=None, label_selector=None, limit=None, _continue=None):
+        """List objects as a JSON-compatible dict with limit/continue pagination"""
+        field_terms = parse_selector(field_selector)
+        label_terms = parse_selector(label_selector)
+
+        with self._cond:
+            keys = self._keys(kind)
+            start = 0
+            if _continue:
+                start = bisect.bisect_right(keys, base64.b64decode(_continue).decode())
+
+            items = []
+            continue_token = None
+            store = self.objects[kind]
+            for index in range(start, len(keys)):
+                key = keys[index]
+                obj = store[key]
+                if namespace and obj["metadata"].get("namespace") != namespace:
+                    continue
+                if not matches(obj, field_terms, label_terms):
+                    continue
+                items.append(obj)
+                if limit and len(items) >= limit:
+                    if index + 1 < len(keys):
+                        continue_token = base64.b64encode(key.encode()).decode()
+                    break
+
+            metadata = {"resourceVersion": str(self.resource_version)}
+            if continue_token:
+                metadata["continue"] = continue_token
+            return {"metadata": metadata, "items": items}
+
+    def watch_lines(self, kind, resource_version, timeout_seconds, namespace=None, field_selector=None):
+        """Yield watch events newer than resource_version as JSON lines until the timeout"""
+        field_terms = parse_selector(field_selector)
+        last = int(resource_version or 0)
+        deadline = time.monotonic() + (timeout_seconds or 60)
+
+        with self._cond:
+            if self.history and last < self.history[0][0] - 1:
+                gone = {
+                    "type": "ERROR",
+                    "object": {
+                        "kind": "Status",
+                        "code": HTTP_GONE,
+                        "reason": "Expired",
+                        "message": f"too old resource version: {last}",
+                    },
+                }
+                yield json.dumps(gone) + "\n"
+                return
+
+        while True:
+            with self._cond:
+                events = [
+                    (version, event_type, obj)
+                    for version, event_kind, event_type, obj in self.history
+                    if version > last and event_kind == kind
+                ]
+                if not events:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    self._cond.wait(min(remaining, 0.1))
+                    continue
+
+            for version, event_type, obj in events:
+                last = version
+                if namespace and obj["metadata"].get("namespace") != namespace:
+                    continue
+                if not matches(obj, field_terms, []):
+                    continue
+                yield json.dumps({"type": event_type, "object": obj}) + "\n"
+
+    def respond(self, kind, model_type, body, preload):
+        """Return a list either as raw bytes or deserialized into client models"""
+        data = json.dumps(body)
+        if not preload:
+            return RawResponse(data.encode())
+        return self.api_client.deserialize(SimpleNamespace(data=data), model_type)
+
+    def get(self, kind, key, model_type):
+        """Read one object as a client model, raising 404 if missing"""
+        with self._cond:
+            obj = self.objects[kind].get(key)
+            if obj is None:
+                raise ApiException(status=404, reason="Not Found")
+            data = json.dumps(obj)
+        return self.api_client.deserialize(SimpleNamespace(data=data), model_type)
+
+    def install(self, controller):
+        """Point a controller's API clients and Slack notifications at this cluster"""
+        controller.k8s_client = self.core_v1
+        controller.apps_client = self.apps_v1
+        controller.coordination_client = self.coordination_v1
+        controller.workload_resolver.apps_client = self.apps_v1
+        controller.reboot_scheduler.store.core_client = self.core_v1
+        controller.remediation_priorities.core_client = self.core_v1
+        controller._send_slack_notification = lambda title, message, *args, **kwargs: self.record_action(
+            "slack", title, message
+        )
+        return controller
+
+
+class FakeCoreV1Api:
+    """Stand-in for kubernetes.client.CoreV1Api backed by a FakeCluster"""
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+
+    def list_pod_for_all_namespaces(self, watch=False, _preload_content=True, **kwargs):
+        """List or watch pods
+
+        :return: V1PodList
+        """
+        return self._list("pods", "V1PodList", None, watch, _preload_content, kwargs)
+
+    def list_namespaced_pod(self, namespace, watch=False, _preload_content=True, **kwargs):
+        """List or watch pods in a namespace
+
+        :return: V1PodList
+        """
+        return self._list("pods", "V1PodList", namespace, watch, _preload_content, kwargs)
+
+    def list_node(self, watch=False, _preload_content=True, **kwargs):
+        """List or watch nodes
+
+        :return: V1NodeList
+        """
+        return self._list("nodes", "V1NodeList", None, watch, _preload_content, kwargs)
+
+    def _list(self, kind, model_type, namespace, watch, preload, kwargs):
+        cluster = self.cluster
+        if watch:
+            cluster.record_call(f"watch_{kind}")
+            lines = cluster.watch_lines(
+                kind,
+                kwargs.get("resource_version"),
+                kwargs.get("timeout_seconds"),
+                namespace=namespace,
+                field_selector=kwargs.get("field_selector"),
+            )
+            return RawResponse(lines=lines)
+
+        cluster.record_call(f"list_{kind}")
+        body = cluster.list_raw(
+            kind,
+            namespace=namespace,
+            field_selector=kwargs.get("field_selector"),
+            label_selector=kwargs.get("label_selector"),
+            limit=kwargs.get("limit"),
+            _continue=kwargs.get("_continue"),
+        )
+        return cluster.respond(kind, model_type, body, preload)
+
+    def list_namespace(self, watch=False, _preload_content=True, **kwargs):
+        """List or watch namespaces
+
+        :return: V1NamespaceList
+        """
+        return self._list("namespaces", "V1NamespaceList", None, watch, _preload_content, kwargs)
+
+    def list_secret_for_all_namespaces(self, watch=False, _preload_content=True, **kwargs):
+        """List or watch secrets
+
+        :return: V1SecretList
+        """
+        return self._list("secrets", "V1SecretList", None, watch, _preload_content, kwargs)
+
+    def read_namespaced_pod(self, name, namespace, **kwargs):
+        self.cluster.record_call("read_pod")
+        return self.cluster.get("pods", f"{namespace}/{name}", "V1Pod")
+
+    def read_node(self, name, **kwargs):
+        self.cluster.record_call("read_node")
+        return self.cluster.get("nodes", name, "V1Node")
+
+    def read_namespaced_config_map(self, name, namespace, **kwargs):
+        self.cluster.record_call("read_configmap")
+        return self.cluster.get("configmaps", f"{namespace}/{name}", "V1ConfigMap")
+
+    def create_namespaced_config_map(self, namespace, body, **kwargs):
+        self.cluster.record_call("create_configmap")
+        key = f"{namespace}/{body.metadata.name}"
+        with self.cluster._cond:
+            if key in self.cluster.objects["configmaps"]:
+                raise ApiException(status=409, reason="AlreadyExists")
+            obj = self.cluster.api_client.sanitize_for_serialization(body)
+            self.cluster._store("configmaps", key, obj, "ADDED")
+            return self.cluster.get("configmaps", key, "V1ConfigMap")
+
+    def replace_namespaced_config_map(self, name, namespace, body, **kwargs):
+        self.cluster.record_call("replace_configmap")
+        key = f"{namespace}/{name}"
+        with self.cluster._cond:
+            current = self.cluster.objects["configmaps"].get(key)
+            if current is None:
+                raise ApiException(status=404, reason="Not Found")
+            if body.metadata.resource_version != current["metadata"]["resourceVersion"]:
+                raise ApiException(status=409, reason="Conflict")
+            obj = self.cluster.api_client.sanitize_for_serialization(body)
+            self.cluster._store("configmaps", key, obj, "MODIFIED")
+            return self.cluster.get("configmaps", key, "V1ConfigMap")
+
+    def delete_namespaced_pod(self, name, namespace, **kwargs):
+        self.cluster.record_call("delete_pod")
+        key = f"{namespace}/{name}"
+        if self.cluster.delete_pod(key) is None:
+            raise ApiException(status=404, reason="Not Found")
+        self.cluster.record_action("delete_pod", key)
+
+    def patch_node(self, name, body, **kwargs):
+        self.cluster.record_call("patch_node")
+        with self.cluster._cond:
+            node = self.cluster.objects["nodes"].get(name)
+            if node is None:
+                raise ApiException(status=404, reason="Not Found")
+            node = copy.deepcopy(node)
+            annotations = (body.get("metadata") or {}).get("annotations") or {}
+            node["metadata"].setdefault("annotations", {}).update(annotations)
+            self.cluster._store("nodes", name, node, "MODIFIED")
+        self.cluster.record_action("patch_node", name, body)
+
+
+class FakeAppsV1Api:
+    """Stand-in for kubernetes.client.AppsV1Api backed by a FakeCluster"""
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.api_client = cluster.api_client
+
+    def read_namespaced_replica_set(self, name, namespace, **kwargs):
+        self.cluster.record_call("read_replicaset")
+        return self.cluster.get("replicasets", f"{namespace}/{name}", "V1ReplicaSet")
+
+    def read_namespaced_deployment(self, name, namespace, **kwargs):
+        self.cluster.record_call("read_deployment")
+        return self.cluster.get("deployments", f"{namespace}/{name}", "V1Deployment")
+
+    def list_namespaced_replica_set(self, namespace, label_selector=None, **kwargs):
+        self.cluster.record_call("list_replicasets")
+        body = self.cluster.list_raw("replicasets", namespace=namespace, label_selector=label_selector)
+        return self.cluster.respond("replicasets", "V1ReplicaSetList", body, True)
+
+    def patch_namespaced_deployment(self, name, namespace, body, **kwargs):
+        self.cluster.record_call("patch_deployment")
+        self.cluster.record_action("patch_deployment", f"{namespace}/{name}", body)
+        self.cluster.restart_workload(namespace, name)
+
+    def patch_namespaced_stateful_set(self, name, namespace, body, **kwargs):
+        self.cluster.record_call("patch_statefulset")
+        self.cluster.record_action("patch_statefulset", f"{namespace}/{name}", body)
+
+    def patch_namespaced_daemon_set(self, name, namespace, body, **kwargs):
+        self.cluster.record_call("patch_daemonset")
+        self.cluster.record_action("patch_daemonset", f"{namespace}/{name}", body)
+
+
+class FakeCoordinationV1Api:
+    """Stand-in for kubernetes.client.CoordinationV1Api backed by a FakeCluster"""
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+
+    def list_namespaced_lease(self, namespace, watch=False, _preload_content=True, **kwargs):
+        """List or watch leases in a namespace
+
+        :return: V1LeaseList
+        """
+        cluster = self.cluster
+        if watch:
+            cluster.record_call("watch_leases")
+            lines = cluster.watch_lines(
+                "leases", kwargs.get("resource_version"), kwargs.get("timeout_seconds"), namespace=namespace
+            )
+            return RawResponse(lines=lines)
+
+        cluster.record_call("list_leases")
+        body = cluster.list_raw(
+            "leases",
+            namespace=namespace,
+            label_selector=kwargs.get("label_selector"),
+            limit=kwargs.get("limit"),
+            _continue=kwargs.get("_continue"),
+        )
+        return cluster.respond("leases", "V1LeaseList", body, _preload_content)
+
+    def read_namespaced_lease(self, name, namespace, **kwargs):
+        self.cluster.record_call("read_lease")
+        return self.cluster.get("leases", f"{namespace}/{name}", "V1Lease")
+
+    def create_namespaced_lease(self, namespace, body, **kwargs):
+        self.cluster.record_call("create_lease")
+        key = f"{namespace}/{body.metadata.name}"
+        with self.cluster._cond:
+            if key in self.cluster.objects["leases"]:
+                raise ApiException(status=409, reason="AlreadyExists")
+            obj = self.cluster.api_client.sanitize_for_serialization(body)
+            self.cluster._store("leases", key, obj, "ADDED")
+
+    def replace_namespaced_lease(self, name, namespace, body, **kwargs):
+        self.cluster.record_call("replace_lease")
+        key = f"{namespace}/{name}"
+        with self.cluster._cond:
+            current = self.cluster.objects["leases"].get(key)
+            if current is None:
+                raise ApiException(status=404, reason="Not Found")
+            if body.metadata.resource_version != current["metadata"]["resourceVersion"]:
+                raise ApiException(status=409, reason="Conflict")
+            obj = self.cluster.api_client.sanitize_for_serialization(body)
+            self.cluster._store("leases", key, obj, "MODIFIED")
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Chaos game days that benchmark how fast the Self-Healing Controller recovers
+
+GameDay runs Chaos Mesh experiments, such as those in
+kubernetes/chaos-engineering/chaos-experiments.yaml, and times every run
+from the moment its fault is injected:
+
+    detected     the controller tracks a target pod as failing
+    remediated   it deleted a target pod or restarted the target's Deployment
+    ready        every pod the experiment selects is Ready again
+
+Experiments run one after another, or all at once with --parallel, repeated
+--repeat times. The report sums the runs up as p50/p95/max per experiment
+type (kind/action). It is JSON with sorted keys, so the reports of two
+controller versions diff cleanly:
+
+    python gameday.py ../chaos-engineering/chaos-experiments.yaml --repeat 20 --output after.json
+
+FakeChaos injects equivalent faults into a FakeCluster while the controller
+runs its real loops in-process, configured from the environment as usual.
+The fake can only express faults through pod status, so every experiment
+makes its targets fail the readiness probe; container-kill also counts a
+container restart, and pod-kill deletes them. Each fault clears when the
+experiment's duration (times --duration-scale) is over, as Chaos Mesh
+recovers its targets, unless the controller replaced the pod first.
+
+ChaosMeshChaos applies the experiments, without their schedule, to the
+cluster of the current kubeconfig. The controller runs there on its own, so
+detection cannot be observed and is left out.
+"""
+
+import copy
+import logging
+import random
+import re
+import time
+
+import yaml
+from phases import RollingWindow
+
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+CHAOS_GROUP = "chaos-mesh.org"
+CHAOS_VERSION = "v1alpha1"
+# Chaos Mesh kind -> plural of its custom resource
+CHAOS_PLURALS = {"PodChaos": "podchaos", "NetworkChaos": "networkchaos", "StressChaos": "stresschaos"}
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+PHASES = ("detected", "remediated", "ready")
+GAME_DAY_LABEL = "self-healing.io/game-day"
+
+
+def load_experiments(path):
+    """Load the Chaos Mesh experiments of a multi-document YAML file"""
+    with open(path) as f:
+        return [doc for doc in yaml.safe_load_all(f) if doc and doc.get("kind") in CHAOS_PLURALS]
+
+
+def experiment_type(experiment):
+    """Get the type an experiment is reported under, such as PodChaos/pod-failure or StressChaos/cpu"""
+    spec = experiment["spec"]
+    action = spec.get("action") or "+".join(sorted(spec.get("stressors") or {})) or "default"
+    return f"{experiment['kind']}/{action}"
+
+
+def parse_duration(value):
+    """Parse a Go duration such as 30s, 1m or 1m30s into seconds, or None if it is not set"""
+    if not value:
+        return None
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|s|m|h)", value)
+    if "".join(number + unit for number, unit in parts) != value:
+        raise ValueError(f"invalid duration: {value}")
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+def selected_count(spec, candidates, rng):
+    """Get how many of candidates pods an experiment's mode picks"""
+    mode = spec.get("mode", "one")
+    value = int(spec.get("value") or 0)
+    if mode == "one":
+        return min(1, candidates)
+    if mode == "all":
+        return candidates
+    if mode == "fixed":
+        return min(value, candidates)
+    if mode == "fixed-percent":
+        return candidates * value // 100
+    if mode == "random-max-percent":
+        return rng.randint(0, candidates * value // 100)
+    raise ValueError(f"unsupported mode: {mode}")
+
+
+def selector_of(experiment):
+    """Get the namespaces and labels an experiment selects pods by"""
+    selector = experiment["spec"].get("selector") or {}
+    namespaces = selector.get("namespaces") or [experiment["metadata"].get("namespace", "default")]
+    return namespaces, selector.get("labelSelectors") or {}
+
+
+class Run:
+    __slots__ = ("experiment", "type", "targets", "injected_at", "ends_at", "expected", "faulted", "state") + PHASES
+
+    def __init__(self, experiment, targets, injected_at, duration, expected):
+        """Initialize a run whose fault was injected into targets at injected_at"""
+        self.experiment = experiment
+        self.type = experiment_type(experiment)
+        self.targets = list(targets)
+        self.injected_at = injected_at
+        self.ends_at = None if duration is None else injected_at + duration
+        # Pods the experiment selected, which must all be Ready again
+        self.expected = expected
+        # Targets still under the fault
+        self.faulted = set(targets)
+        # Backend bookkeeping
+        self.state = None
+        self.detected = None
+        self.remediated = None
+        self.ready = None
+
+    def seconds(self, phase):
+        """Get how long after injection a phase was reached, or None"""
+        at = getattr(self, phase)
+        return None if at is None else at - self.injected_at
+
+    def as_dict(self):
+        """Get the run as a JSON-compatible dict"""
+        timings = {f"{phase}_seconds": self.seconds(phase) for phase in PHASES}
+        return {
+            "experiment": self.experiment["metadata"]["name"],
+            "type": self.type,
+            "targets": sorted(self.targets),
+            **{name: None if value is None else round(value, 3) for name, value in timings.items()},
+        }
+
+
+class FakeChaos:
+    def __init__(self, cluster, controller, duration_scale=1.0, rng=None, clock=time.monotonic):
+        """Initialize fault injection into a FakeCluster the controller is installed on"""
+        self.cluster = cluster
+        self.controller = controller
+        self.duration_scale = duration_scale
+        self.rng = rng or random.Random()
+        # Must match the clock FakeCluster stamps actions with
+        self.clock = clock
+        self.active = []
+
+    def inject(self, experiment):
+        """Inject an experiment's fault into the pods it selects, returning the run or None"""
+        namespaces, labels = selector_of(experiment)
+        selected = [key for namespace in namespaces for key in self.cluster.select_pods(namespace, labels)]
+        # Leave pods alone that another run targets or that are failing already
+        busy = set(self.cluster.failing_pods()).union(*(run.targets for run in self.active))
+        candidates = [key for key in selected if key not in busy]
+        targets = self.rng.sample(candidates, selected_count(experiment["spec"], len(candidates), self.rng))
+        if not targets:
+            logger.warning(f"Experiment {experiment['metadata']['name']} selects no pods, skipping it")
+            return None
+
+        action = experiment["spec"].get("action")
+        duration = parse_duration(experiment["spec"].get("duration"))
+        run = Run(
+            experiment,
+            targets,
+            self.clock(),
+            None if duration is None else duration * self.duration_scale,
+            len(selected),
+        )
+        run.state = {self.cluster.workload_of(key) for key in targets} - {None}
+        for key in targets:
+            if action == "pod-kill":
+                self.cluster.delete_pod(key)
+            elif action == "container-kill":
+                # Restarting the container takes it out of Ready until the fault ends
+                self.cluster.crash_loop(key, restarts=1)
+                self.cluster.fail_pod(key)
+            else:
+                self.cluster.fail_pod(key)
+        self.active.append(run)
+        return run
+
+    def observe(self, run, now):
+        """Update a run's phases from the controller and the cluster"""
+        if run.detected is None:
+            failures = [self.controller.pod_failures.get(key) for key in run.targets]
+            # Both clocks are time.monotonic()
+            detected = [failure.get("detected_at", now) for failure in failures if failure]
+            run.detected = min(detected) if detected else None
+
+        if run.remediated is None:
+            for at, verb, target in self.cluster.actions_since(run.injected_at):
+                if (verb == "delete_pod" and target in run.targets) or (
+                    verb == "patch_deployment" and target in run.state
+                ):
+                    run.remediated = at
+                    # The failure is forgotten once the pod is gone, possibly before it was polled
+                    if run.detected is None:
+                        run.detected = at
+                    break
+
+        present = set(
+            key for namespace in selector_of(run.experiment)[0] for key in self.cluster.select_pods(namespace)
+        )
+        # Replaced pods take their fault with them
+        run.faulted &= present
+        if run.ends_at is not None and now >= run.ends_at:
+            self.clear(run)
+
+        if run.ready is None and not run.faulted:
+            namespaces, labels = selector_of(run.experiment)
+            selected = [key for namespace in namespaces for key in self.cluster.select_pods(namespace, labels)]
+            failing = set(self.cluster.failing_pods())
+            if len(selected) >= run.expected and not failing.intersection(selected):
+                run.ready = now
+
+    def clear(self, run):
+        """End a run's fault on the targets it still affects"""
+        for key in run.faulted:
+            try:
+                self.cluster.heal_pod(key)
+            except KeyError:
+                # Deleted since
+                pass
+        run.faulted.clear()
+
+    def finish(self, run):
+        """Forget a run that recovered or timed out"""
+        self.clear(run)
+        self.active.remove(run)
+
+
+class ChaosMeshChaos:
+    def __init__(self, custom_api, core_api, duration_scale=1.0, clock=time.monotonic):
+        """Initialize fault injection through Chaos Mesh custom resources"""
+        self.custom_api = custom_api
+        self.core_api = core_api
+        self.duration_scale = duration_scale
+        self.clock = clock
+        self.count = 0
+
+    def _pods(self, experiment):
+        """Get {pod key: (uid, ready)} of the pods an experiment selects"""
+        namespaces, labels = selector_of(experiment)
+        selector = ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+        pods = {}
+        for namespace in namespaces:
+            for pod in self.core_api.list_namespaced_pod(namespace, label_selector=selector).items:
+                ready = any(c.type == "Ready" and c.status == "True" for c in pod.status.conditions or [])
+                pods[f"{namespace}/{pod.metadata.name}"] = (pod.metadata.uid, ready)
+        return pods
+
+    def inject(self, experiment):
+        """Create a one-off copy of an experiment, returning the run"""
+        self.count += 1
+        body = copy.deepcopy(experiment)
+        body["spec"].pop("scheduler", None)
+        duration = parse_duration(body["spec"].get("duration"))
+        if duration is not None:
+            duration *= self.duration_scale
+            body["spec"]["duration"] = f"{duration:g}s"
+        namespace = experiment["metadata"].get("namespace", "default")
+        name = f"{experiment['metadata']['name']}-game-day-{int(time.time())}-{self.count}"
+        body["metadata"] = {"name": name, "namespace": namespace, "labels": {GAME_DAY_LABEL: "true"}}
+
+        pods = self._pods(experiment)
+        plural = CHAOS_PLURALS[experiment["kind"]]
+        self.custom_api.create_namespaced_custom_object(CHAOS_GROUP, CHAOS_VERSION, namespace, plural, body)
+        run = Run(experiment, [], self.clock(), duration, len(pods))
+        run.state = {"namespace": namespace, "plural": plural, "name": name, "uids": {}}
+        return run
+
+    def observe(self, run, now):
+        """Update a run's phases from the experiment's status and the selected pods"""
+        state = run.state
+        if not run.targets:
+            chaos = self.custom_api.get_namespaced_custom_object(
+                CHAOS_GROUP, CHAOS_VERSION, state["namespace"], state["plural"], state["name"]
+            )
+            records = ((chaos.get("status") or {}).get("experiment") or {}).get("containerRecords") or []
+            # Record ids are namespace/pod, or namespace/pod/container
+            run.targets = sorted({"/".join(record["id"].split("/")[:2]) for record in records})
+            if not run.targets:
+                return
+            run.faulted = set(run.targets)
+
+        pods = self._pods(run.experiment)
+        for key in run.targets:
+            uid = pods.get(key, (None,))[0]
+            state["uids"].setdefault(key, uid)
+            if run.remediated is None and uid != state["uids"][key]:
+                run.remediated = now
+
+        if run.ready is None and len(pods) >= run.expected and all(ready for _, ready in pods.values()):
+            run.ready = now
+
+    def clear(self, run):
+        """Delete a run's experiment, ending its fault"""
+        state = run.state
+        try:
+            self.custom_api.delete_namespaced_custom_object(
+                CHAOS_GROUP, CHAOS_VERSION, state["namespace"], state["plural"], state["name"]
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+
+    def finish(self, run):
+        """Clean up a run that recovered or timed out"""
+        self.clear(run)
+
+
+class GameDay:
+    def __init__(self, chaos, timeout=300, poll_interval=0.05, clock=time.monotonic):
+        """Initialize a game day injecting faults through chaos, giving each run timeout seconds to recover"""
+        self.chaos = chaos
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.clock = clock
+
+    def run(self, experiments, repeat=1, parallel=False):
+        """Run every experiment repeat times, one after another or all at once, returning the runs"""
+        runs = []
+        for _ in range(repeat):
+            batches = [experiments] if parallel else [[experiment] for experiment in experiments]
+            for batch in batches:
+                runs.extend(self._run_batch(batch))
+        return runs
+
+    def _run_batch(self, experiments):
+        """Inject experiments together and follow them until each is Ready again or timed out"""
+        runs = [run for run in (self.chaos.inject(experiment) for experiment in experiments) if run is not None]
+        pending = list(runs)
+        while pending:
+            time.sleep(self.poll_interval)
+            now = self.clock()
+            for run in list(pending):
+                self.chaos.observe(run, now)
+                if run.ready is not None or now - run.injected_at >= self.timeout:
+                    if run.ready is None:
+                        logger.warning(f"{run.type} run on {run.targets} did not recover within {self.timeout}s")
+                    self.chaos.finish(run)
+                    pending.remove(run)
+        return runs
+
+
+def report(runs):
+    """Sum runs up as p50/p95/max seconds to each phase per experiment type"""
+    by_type = {}
+    for run in runs:
+        by_type.setdefault(run.type, []).append(run)
+
+    summary = {}
+    for run_type, group in sorted(by_type.items()):
+        entry = {"runs": len(group)}
+        for phase in PHASES:
+            values = [run.seconds(phase) for run in group if getattr(run, phase) is not None]
+            entry[phase] = len(values)
+            if values:
+                window = RollingWindow(len(values))
+                for value in values:
+                    window.add(value)
+                stats = window.summary()
+                entry[f"{phase}_seconds"] = {name: round(stats[name], 3) for name in ("p50", "p95", "max")}
+        summary[run_type] = entry
+
+    return {"summary": summary, "runs": [run.as_dict() for run in runs]}
+
+
+def fake_game_day(experiments, pods=200, replicas=5, duration_scale=0.1, seed=None, config=None):
+    """Start a controller on a FakeCluster holding the experiments' targets, returning (cluster, controller, chaos)
+
+    config overrides the controller's configuration, which otherwise comes from the environment as usual.
+    """
+    import os
+
+    from fake_cluster import FakeCluster
+    from self_healing_controller import SelfHealingController
+
+    cluster = FakeCluster()
+    cluster.populate(pods=pods, nodes=5)
+    nodes = sorted(cluster.objects["nodes"])
+    for experiment in experiments:
+        namespaces, labels = selector_of(experiment)
+        for namespace in namespaces:
+            name = labels.get("app") or experiment["metadata"]["name"]
+            if f"{namespace}/{name}" not in cluster.objects["deployments"]:
+                cluster.add_deployment(namespace, name, replicas, nodes=nodes, labels=labels)
+
+    # Scan often, and leave out what would talk to anything outside the process, unless set otherwise
+    defaults = {
+        "check_interval": 1,
+        "health_port": 0,
+        "prometheus_enabled": False,
+        "alert_webhook_enabled": False,
+        "helm_rollback_enabled": False,
+    }
+    overrides = {key: value for key, value in defaults.items() if key.upper() not in os.environ}
+    overrides.update(config or {})
+    controller = cluster.install(SelfHealingController(clients=cluster, overrides=overrides))
+    controller.start_monitoring()
+    while not controller._readiness()[0]:
+        time.sleep(0.05)
+
+    return cluster, controller, FakeChaos(cluster, controller, duration_scale, random.Random(seed))
+
+
+def main():
+    """Run chaos experiments against the controller and report how fast it recovered"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("experiments", help="YAML file of Chaos Mesh experiments")
+    parser.add_argument("--backend", choices=["fake", "chaos-mesh"], default="fake")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each experiment (default 5)")
+    parser.add_argument("--parallel", action="store_true", help="inject all experiments at once")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds a run may take to recover")
+    parser.add_argument(
+        "--duration-scale", type=float, help="multiply experiment durations (default 0.1 fake, 1 chaos-mesh)"
+    )
+    parser.add_argument("--pods", type=int, default=200, help="background pods of the fake cluster")
+    parser.add_argument("--seed", type=int, help="seed the fake's choice of targets")
+    parser.add_argument("--output", help="write the report to this file instead of stdout")
+    args = parser.parse_args()
+
+    experiments = load_experiments(args.experiments)
+    controller = None
+    if args.backend == "fake":
+        scale = 0.1 if args.duration_scale is None else args.duration_scale
+        _, controller, chaos = fake_game_day(experiments, pods=args.pods, duration_scale=scale, seed=args.seed)
+        poll_interval = 0.01
+    else:
+        from kubernetes import client, config
+
+        try:
+            config.load_incluster_config()
+        except config.ConfigException:
+            config.load_kube_config()
+        scale = 1.0 if args.duration_scale is None else args.duration_scale
+        chaos = ChaosMeshChaos(client.CustomObjectsApi(), client.CoreV1Api(), duration_scale=scale)
+        poll_interval = 1.0
+
+    try:
+        runs = GameDay(chaos, timeout=args.timeout, poll_interval=poll_interval).run(
+            experiments, repeat=args.repeat, parallel=args.parallel
+        )
+    finally:
+        if controller is not None:
+            controller.stop()
+
+    result = report(runs)
+    result["backend"] = args.backend
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+HTTP endpoints for the Self-Healing Controller
+
+A ThreadingHTTPServer speaking HTTP/1.1 with keep-alive serves /health,
+/ready, /metrics and /debug/phases. Request threads never touch live
+controller state: a refresher thread rebuilds every response body once per
+interval and swaps in the new set of snapshots with a single assignment,
+so a probe only costs a dict lookup and a socket write even while a scan
+holds the GIL-heavy parts of the controller busy. POST endpoints (the
+Alertmanager webhook) call a handler that must return just as quickly.
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = "application/json"
+NOT_FOUND = (404, JSON_CONTENT_TYPE, b'{"error": "not found"}')
+TOO_LARGE = (413, JSON_CONTENT_TYPE, b'{"error": "request body too large"}')
+MAX_BODY_BYTES = 1 << 20
+
+
+def json_snapshot(payload, status=200):
+    """Render a JSON response snapshot"""
+    return status, JSON_CONTENT_TYPE, json.dumps(payload).encode()
+
+
+class SnapshotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond(*self.server.snapshots.get(self.path.split("?", 1)[0], NOT_FOUND))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            # The unread body would be parsed as the next request
+            self.close_connection = True
+            self._respond(*TOO_LARGE)
+            return
+
+        body = self.rfile.read(length)
+        handler = self.server.post_handlers.get(self.path.split("?", 1)[0])
+        if handler is None:
+            self._respond(*NOT_FOUND)
+            return
+
+        try:
+            response = handler(self.headers, body)
+        except Exception as e:
+            logger.error(f"Error handling POST {self.path}: {e}")
+            response = json_snapshot({"error": "internal error"}, 500)
+        self._respond(*response)
+
+    def _respond(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep probe traffic out of the controller log"""
+
+
+class HealthServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, build, host="0.0.0.0", port=8080, interval=1.0, post_handlers=None):
+        """Initialize a server for the snapshots returned by build(), a dict of path -> (status, type, body)
+
+        post_handlers maps a path to handler(headers, body), returning (status, type, body).
+        """
+        super().__init__((host, port), SnapshotHandler)
+        self.build = build
+        self.post_handlers = post_handlers or {}
+        self.interval = interval
+        self.snapshots = {}
+        self._stop = threading.Event()
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild every snapshot and publish them at once"""
+        try:
+            self.snapshots = self.build()
+        except Exception as e:
+            logger.error(f"Failed to refresh endpoint snapshots: {e}")
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def start(self):
+        """Serve requests and refresh snapshots in background threads"""
+        threading.Thread(target=self._refresh_loop, name="health-refresh", daemon=True).start()
+        thread = threading.Thread(target=self.serve_forever, name="health-server", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Stop serving"""
+        self._stop.set()
+        self.shutdown()
+        self.server_close()
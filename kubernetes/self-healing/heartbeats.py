@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Lease-based node heartbeat tracking
+
+Every kubelet renews a small Lease named after its node in the
+kube-node-lease namespace about every 10 seconds. Watching those leases
+is far cheaper than listing full Node objects, and a lease that stops
+being renewed is the earliest sign of a dead or partitioned node.
+NodeHeartbeats remembers, per node, when a renewal was last observed on
+the local monotonic clock (so kubelet/controller clock skew does not
+matter once a node has been seen renewing) and reports nodes whose
+lease went stale so the controller can confirm them with one node read.
+"""
+
+import threading
+import time
+
+NODE_LEASE_NAMESPACE = "kube-node-lease"
+
+
+class Heartbeat:
+    __slots__ = ("renew_time", "seen_at", "checked_at", "renewed", "down")
+
+    def __init__(self, renew_time, seen_at):
+        """Initialize the last observed renewal of a node's lease"""
+        self.renew_time = renew_time
+        self.seen_at = seen_at
+        self.checked_at = None
+        # Only a renewal seen by this process proves the local clock, not the kubelet's, aged the lease
+        self.renewed = False
+        self.down = False
+
+
+class NodeHeartbeats:
+    def __init__(self, stale_after=40):
+        """Initialize a tracker flagging leases not renewed for stale_after seconds"""
+        self.stale_after = stale_after
+        self.nodes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, renew_time, now=None, wall_now=None):
+        """Record a node's lease renewTime (epoch seconds), returning True if a node marked down renewed it"""
+        now = time.monotonic() if now is None else now
+        if renew_time is None:
+            return False
+
+        with self._lock:
+            state = self.nodes.get(name)
+            if state is None:
+                # First sight: age the renewal by how old renewTime already is
+                wall_now = time.time() if wall_now is None else wall_now
+                self.nodes[name] = Heartbeat(renew_time, now - max(0.0, wall_now - renew_time))
+                return False
+
+            if renew_time <= state.renew_time:
+                return False
+
+            state.renew_time = renew_time
+            state.seen_at = now
+            state.checked_at = None
+            state.renewed = True
+            recovered, state.down = state.down, False
+            return recovered
+
+    def forget(self, name):
+        """Drop a node whose lease went away"""
+        with self._lock:
+            self.nodes.pop(name, None)
+
+    def stale(self, now=None):
+        """Get nodes whose lease went stale and that were not checked since"""
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.stale_after
+
+        with self._lock:
+            return [
+                name
+                for name, state in self.nodes.items()
+                if state.seen_at < cutoff and not state.down and (state.checked_at is None or state.checked_at < cutoff)
+            ]
+
+    def alive(self, now=None):
+        """Get nodes whose lease is being renewed"""
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.stale_after
+
+        with self._lock:
+            return [name for name, state in self.nodes.items() if state.seen_at >= cutoff]
+
+    def mark_checked(self, name, now=None):
+        """Note that a stale node was read, so it is not read again until another stale period passes"""
+        with self._lock:
+            state = self.nodes.get(name)
+            if state is not None:
+                state.checked_at = time.monotonic() if now is None else now
+
+    def mark_down(self, name):
+        """Note that a stale node was confirmed down"""
+        with self._lock:
+            state = self.nodes.get(name)
+            if state is not None:
+                state.down = True
+
+    def is_down(self, name):
+        """Check if a node was confirmed down and has not renewed its lease since"""
+        with self._lock:
+            state = self.nodes.get(name)
+            return state is not None and state.down
+
+    def renew_time(self, name):
+        """Get the last observed renewTime of a node's lease"""
+        with self._lock:
+            state = self.nodes.get(name)
+            return state.renew_time if state else None
+
+    def seen_renewing(self, name):
+        """Check if the lease was renewed while being watched, so its staleness is not down to clock skew"""
+        with self._lock:
+            state = self.nodes.get(name)
+            return state is not None and state.renewed
+
+    def __len__(self):
+        return len(self.nodes)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Helm release cache for the Self-Healing Controller
+
+Helm 3 stores every revision of a release as a Secret of type
+helm.sh/release.v1 named sh.helm.release.v1.<release>.v<revision>. Its
+"release" key holds the release as gzipped JSON, base64 encoded once by
+Helm and once more by the Secret. HelmReleaseCache is fed by an Informer
+watching those Secrets and keeps a small HelmRevision per Secret, which
+is enough to decide in-process whether a release can be rolled back and
+to which revision, without running the helm binary to find out.
+"""
+
+import base64
+import gzip
+import threading
+
+from pod_records import ListMeta
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    _loads = json.loads
+
+RELEASE_SECRET_SELECTOR = "owner=helm"
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def decode_release(encoded):
+    """Decode the release key of a Helm release Secret into a dict"""
+    payload = base64.b64decode(base64.b64decode(encoded))
+    if payload[:2] == GZIP_MAGIC:
+        payload = gzip.decompress(payload)
+    return _loads(payload)
+
+
+class HelmRevision:
+    __slots__ = ("namespace", "name", "version", "status", "description", "chart", "resource_version", "key")
+
+    def __init__(self, namespace, name, version, status, description="", chart="", resource_version=None, key=None):
+        """Initialize one revision of a release"""
+        self.namespace = namespace
+        self.name = name
+        self.version = version
+        self.status = status
+        self.description = description
+        self.chart = chart
+        self.resource_version = resource_version
+        self.key = key or f"{namespace}/sh.helm.release.v1.{name}.v{version}"
+
+    @property
+    def release_key(self):
+        return f"{self.namespace}/{self.name}"
+
+    @property
+    def is_rollback(self):
+        """Check if this revision was created by a rollback"""
+        return self.description.startswith("Rollback to")
+
+    @classmethod
+    def from_dict(cls, secret):
+        """Build a revision from a raw release Secret, decoding its payload"""
+        metadata = secret.get("metadata") or {}
+        labels = metadata.get("labels") or {}
+        description = ""
+        chart = ""
+
+        encoded = (secret.get("data") or {}).get("release")
+        if encoded:
+            release = decode_release(encoded)
+            info = release.get("info") or {}
+            chart_metadata = (release.get("chart") or {}).get("metadata") or {}
+            description = info.get("description") or ""
+            chart = f"{chart_metadata.get('name', '')}-{chart_metadata.get('version', '')}"
+
+        return cls(
+            metadata.get("namespace"),
+            labels.get("name"),
+            int(labels.get("version") or 0),
+            labels.get("status", ""),
+            description,
+            chart,
+            metadata.get("resourceVersion"),
+            f"{metadata.get('namespace')}/{metadata.get('name')}",
+        )
+
+
+class HelmRevisionList:
+    __slots__ = ("items", "metadata")
+
+    def __init__(self, items, resource_version, continue_token):
+        """Initialize a page of revisions shaped like a V1SecretList"""
+        self.items = items
+        self.metadata = ListMeta(resource_version, continue_token)
+
+
+class HelmRevisionCodec:
+    """Decoder plugged into the Informer to keep HelmRevisions instead of V1Secrets"""
+
+    @staticmethod
+    def parse_list(data):
+        """Parse the raw bytes of a Secret LIST response"""
+        body = _loads(data)
+        metadata = body.get("metadata") or {}
+        items = [HelmRevision.from_dict(secret) for secret in body.get("items") or ()]
+        return HelmRevisionList(items, metadata.get("resourceVersion"), metadata.get("continue"))
+
+    @staticmethod
+    def from_dict(obj):
+        """Build a revision from a raw watch event object"""
+        return HelmRevision.from_dict(obj)
+
+    @staticmethod
+    def key(revision):
+        """Get the cache key of a revision"""
+        return revision.key
+
+    @staticmethod
+    def resource_version(revision):
+        """Get the resourceVersion of a revision"""
+        return revision.resource_version
+
+
+class HelmReleaseCache:
+    def __init__(self):
+        """Initialize an empty cache of release revisions"""
+        # namespace/release -> {revision number: HelmRevision}
+        self.releases = {}
+        # namespace/release -> revision number a rollback was started from
+        self.rolled_back_from = {}
+        self._lock = threading.Lock()
+
+    def on_event(self, event_type, revision):
+        """Apply an informer event for a release Secret"""
+        release_key = revision.release_key
+        with self._lock:
+            if event_type == "DELETED":
+                revisions = self.releases.get(release_key)
+                if revisions is not None:
+                    revisions.pop(revision.version, None)
+                    if not revisions:
+                        del self.releases[release_key]
+                        self.rolled_back_from.pop(release_key, None)
+                return
+            self.releases.setdefault(release_key, {})[revision.version] = revision
+
+    def current(self, namespace, name):
+        """Get the latest revision of a release, or None if unknown"""
+        with self._lock:
+            revisions = self.releases.get(f"{namespace}/{name}")
+            return revisions[max(revisions)] if revisions else None
+
+    def rollback_target(self, namespace, name):
+        """Get the revision a release should be rolled back to, or None and the reason it should not be"""
+        with self._lock:
+            return self._rollback_target(f"{namespace}/{name}")[1:]
+
+    def start_rollback(self, namespace, name):
+        """Claim the single rollback of a release's current revision, returning its target like rollback_target"""
+        release_key = f"{namespace}/{name}"
+        with self._lock:
+            current, target, reason = self._rollback_target(release_key)
+            if target is not None:
+                # Refuse further rollbacks of this revision before the watch delivers the new one
+                self.rolled_back_from[release_key] = current
+            return target, reason
+
+    def abandon_rollback(self, namespace, name):
+        """Allow a release whose rollback failed to be rolled back again"""
+        with self._lock:
+            self.rolled_back_from.pop(f"{namespace}/{name}", None)
+
+    def _rollback_target(self, release_key):
+        revisions = self.releases.get(release_key)
+        if not revisions:
+            return None, None, "unknown release"
+
+        current = revisions[max(revisions)]
+        if current.status.startswith("pending"):
+            return current.version, None, f"revision {current.version} is {current.status}"
+        if current.is_rollback:
+            return current.version, None, f"revision {current.version} is already a rollback"
+        if self.rolled_back_from.get(release_key, 0) >= current.version:
+            return current.version, None, f"a rollback from revision {current.version} was already started"
+
+        previous = [
+            version
+            for version, revision in revisions.items()
+            if version < current.version and revision.status in ("superseded", "deployed")
+        ]
+        if not previous:
+            return current.version, None, "no previous revision"
+        return current.version, max(previous), None
+
+    def __len__(self):
+        return len(self.releases)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Informer for the Self-Healing Controller
+
+Keeps a local cache of Kubernetes objects using one initial LIST followed by
+a WATCH stream that resumes from the last seen resourceVersion. When the
+apiserver answers 410 Gone the informer relists and diffs against its cache,
+so handlers only see objects that actually changed.
+"""
+
+import logging
+import threading
+import time
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+HTTP_GONE = 410
+
+
+def list_pages(list_func, page_size=0, **kwargs):
+    """Yield list responses one page at a time using limit/continue"""
+    continue_token = None
+    while True:
+        if page_size:
+            kwargs["limit"] = page_size
+        if continue_token:
+            kwargs["_continue"] = continue_token
+
+        response = list_func(**kwargs)
+        continue_token = response.metadata._continue
+        yield response
+
+        # Release the page before fetching the next one
+        del response
+        if not continue_token:
+            return
+
+
+def object_key(obj):
+    """Build the namespace/name cache key for an object"""
+    namespace = obj.metadata.namespace
+    if namespace:
+        return f"{namespace}/{obj.metadata.name}"
+    return obj.metadata.name
+
+
+def object_resource_version(obj):
+    """Get the resourceVersion of an object"""
+    return obj.metadata.resource_version
+
+
+class Informer:
+    def __init__(
+        self,
+        list_func,
+        handler,
+        name="informer",
+        watch_timeout=300,
+        resync_period=0,
+        page_size=0,
+        decoder=None,
+        on_pass=None,
+        **list_kwargs,
+    ):
+        """Initialize the informer for a list function such as list_pod_for_all_namespaces
+
+        A decoder (see PodRecordCodec) makes the informer request raw JSON and
+        cache the decoder's compact records instead of client models.
+        on_pass() is called after a relist or resync has delivered all its
+        objects, so per-pass work need not run for each of them.
+        """
+        self.list_func = list_func
+        self.handler = handler
+        self.name = name
+        self.watch_timeout = watch_timeout
+        self.resync_period = resync_period
+        self.page_size = page_size
+        self.decoder = decoder
+        self.key = decoder.key if decoder else object_key
+        self.version = decoder.resource_version if decoder else object_resource_version
+        self.on_pass = on_pass
+        self.list_kwargs = list_kwargs
+        self.cache = {}
+        self.resource_version = None
+        self.running = False
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._resync_requested = threading.Event()
+        self._passes = 0
+        self._watch = None
+
+    def in_pass(self):
+        """Check if a relist or resync is delivering objects right now"""
+        return self._passes > 0
+
+    def has_synced(self):
+        """Check if the initial list has been loaded into the cache"""
+        return self._synced.is_set()
+
+    def wait_for_sync(self, timeout=None):
+        """Block until the initial list has been loaded"""
+        return self._synced.wait(timeout)
+
+    def get(self, key):
+        """Get a cached object by key"""
+        with self._lock:
+            return self.cache.get(key)
+
+    def list(self):
+        """Get a snapshot of all cached objects"""
+        with self._lock:
+            return list(self.cache.values())
+
+    def start(self):
+        """Start the list/watch loop and resync loop in background threads"""
+        self.running = True
+        thread = threading.Thread(target=self.run, name=f"{self.name}-watch", daemon=True)
+        thread.start()
+
+        resync_thread = threading.Thread(target=self._resync_loop, name=f"{self.name}-resync", daemon=True)
+        resync_thread.start()
+
+        logger.info(f"{self.name} started")
+        return thread
+
+    def stop(self):
+        """Stop the informer"""
+        self.running = False
+        self._resync_requested.set()
+        if self._watch:
+            self._watch.stop()
+
+    def run(self):
+        """Run the list/watch loop until stopped"""
+        while self.running:
+            try:
+                if self.resource_version is None:
+                    self.relist()
+                self.watch_once()
+            except ApiException as e:
+                if e.status == HTTP_GONE:
+                    logger.info(f"{self.name}: resourceVersion {self.resource_version} expired, relisting")
+                    self.resource_version = None
+                else:
+                    logger.error(f"{self.name}: watch failed: {e}")
+                    time.sleep(5)
+            except Exception as e:
+                logger.error(f"{self.name}: error in list/watch loop: {e}")
+                time.sleep(5)
+
+    def relist(self):
+        """List all objects, replace the cache and dispatch the differences"""
+        fresh = {}
+        resource_version = None
+        for page in list_pages(self._list, self.page_size, **self.list_kwargs):
+            for obj in page.items:
+                fresh[self.key(obj)] = obj
+            resource_version = page.metadata.resource_version
+            del page
+
+        with self._lock:
+            previous = self.cache
+            self.cache = fresh
+            self.resource_version = resource_version
+
+        self._synced.set()
+
+        self._start_pass()
+        try:
+            for key, obj in fresh.items():
+                old = previous.get(key)
+                if old is None:
+                    self._dispatch("ADDED", obj)
+                elif self.version(old) != self.version(obj):
+                    self._dispatch("MODIFIED", obj)
+
+            for key, old in previous.items():
+                if key not in fresh:
+                    self._dispatch("DELETED", old)
+        finally:
+            self._finish_pass()
+
+        logger.info(f"{self.name}: listed {len(fresh)} objects at resourceVersion {self.resource_version}")
+
+    def _list(self, **kwargs):
+        """List one page, decoding raw JSON when a decoder is set"""
+        if self.decoder is None:
+            return self.list_func(**kwargs)
+
+        response = self.list_func(_preload_content=False, **kwargs)
+        try:
+            return self.decoder.parse_list(response.data)
+        finally:
+            response.release_conn()
+
+    def _watch_raw(self, **kwargs):
+        """Call the list function for Watch without declaring a model return type
+
+        Watch only deserializes events into models when the function
+        documents its return type, so events from here carry raw dicts.
+        """
+        return self.list_func(**kwargs)
+
+    def watch_once(self):
+        """Follow the watch stream until it times out or is stopped"""
+        self._watch = watch.Watch()
+        stream = self._watch.stream(
+            self._watch_raw if self.decoder else self.list_func,
+            resource_version=self.resource_version,
+            timeout_seconds=self.watch_timeout,
+            allow_watch_bookmarks=True,
+            **self.list_kwargs,
+        )
+
+        for event in stream:
+            if not self.running:
+                self._watch.stop()
+                break
+            self._apply_event(event)
+
+    def _apply_event(self, event):
+        """Apply a single watch event to the cache"""
+        event_type = event["type"]
+
+        if event_type == "BOOKMARK":
+            self.resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+            return
+
+        obj = self.decoder.from_dict(event["raw_object"]) if self.decoder else event["object"]
+        key = self.key(obj)
+
+        with self._lock:
+            self.resource_version = self.version(obj)
+            old = self.cache.get(key)
+            if event_type == "DELETED":
+                self.cache.pop(key, None)
+            else:
+                if old is not None and self.version(old) == self.version(obj):
+                    return
+                self.cache[key] = obj
+
+        self._dispatch(event_type, obj)
+
+    def resync(self):
+        """Re-deliver every cached object to the handler now instead of at the end of the resync period"""
+        self._resync_requested.set()
+
+    def _resync_loop(self):
+        """Re-deliver every cached object to the handler every resync period, or when asked to"""
+        while self.running:
+            self._resync_requested.wait(self.resync_period if self.resync_period > 0 else None)
+            self._resync_requested.clear()
+            if not self.running or not self.has_synced():
+                continue
+            self._start_pass()
+            try:
+                for obj in self.list():
+                    self._dispatch("SYNC", obj)
+            finally:
+                self._finish_pass()
+
+    def _start_pass(self):
+        """Begin a relist or resync"""
+        with self._lock:
+            self._passes += 1
+
+    def _finish_pass(self):
+        """End a relist or resync, calling on_pass"""
+        with self._lock:
+            self._passes -= 1
+        if self.on_pass is None:
+            return
+        try:
+            self.on_pass()
+        except Exception as e:
+            logger.error(f"{self.name}: pass handler failed: {e}")
+
+    def _dispatch(self, event_type, obj):
+        """Call the handler, keeping the watch alive if it raises"""
+        try:
+            self.handler(event_type, obj)
+        except Exception as e:
+            logger.error(f"{self.name}: handler failed for {event_type} {self.key(obj)}: {e}")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Prometheus metrics for the Self-Healing Controller
+
+Each controller owns a CollectorRegistry holding counters for detected
+failures, remediation outcomes and errors, and histograms for scan
+duration, detection-to-action time and Kubernetes API latency. The
+controller's get_metrics() snapshot is exported as gauges at scrape time.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+# Remediations range from a pod delete (milliseconds) to a Helm rollback (minutes)
+ACTION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+SCAN_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class SnapshotCollector:
+    def __init__(self, snapshot, prefix="self_healing_"):
+        """Initialize a collector exporting a dict of numbers as gauges"""
+        self.snapshot = snapshot
+        self.prefix = prefix
+
+    def collect(self):
+        for name, value in self.snapshot().items():
+            if isinstance(value, (bool, int, float)):
+                yield GaugeMetricFamily(f"{self.prefix}{name}", f"Controller state: {name}", value=float(value))
+
+
+class ControllerMetrics:
+    def __init__(self, snapshot=None, phases=None):
+        """Initialize the controller's metrics in a dedicated registry"""
+        self.registry = CollectorRegistry()
+        self.phases = phases
+
+        self.pod_failures = Counter(
+            "pod_failures", "Pods detected as failing", ["namespace", "reason"], registry=self.registry
+        )
+        self.node_failures = Counter("node_failures", "Nodes detected as NotReady", registry=self.registry)
+        self.errors = Counter(
+            "self_healing_errors", "Errors raised inside the controller", ["component"], registry=self.registry
+        )
+        self.notifications = Counter(
+            "self_healing_notifications", "Slack notifications by outcome", ["outcome"], registry=self.registry
+        )
+        self.alerts = Counter(
+            "self_healing_alerts",
+            "Objects named by firing Alertmanager alerts, by kind",
+            ["target"],
+            registry=self.registry,
+        )
+        self.remediations = Counter(
+            "self_healing_remediations",
+            "Remediation actions by outcome",
+            ["action", "outcome", "namespace"],
+            registry=self.registry,
+        )
+        self.circuit_state = Gauge(
+            "self_healing_circuit_breaker_state",
+            "Storm circuit breaker state by scope: 0 closed, 1 half-open, 2 open",
+            ["scope"],
+            registry=self.registry,
+        )
+        self.circuit_transitions = Counter(
+            "self_healing_circuit_breaker_transitions",
+            "Storm circuit breaker state changes by scope and new state",
+            ["scope", "state"],
+            registry=self.registry,
+        )
+        self.scan_duration = Histogram(
+            "self_healing_scan_duration_seconds",
+            "Duration of full pod and node scans",
+            ["resource"],
+            buckets=SCAN_BUCKETS,
+            registry=self.registry,
+        )
+        self.detection_to_action = Histogram(
+            "self_healing_detection_to_action_seconds",
+            "Time from detecting a failure to acting on it",
+            ["action"],
+            buckets=ACTION_BUCKETS,
+            registry=self.registry,
+        )
+        self.api_latency = Histogram(
+            "self_healing_api_request_duration_seconds",
+            "Latency of Kubernetes API calls",
+            ["verb", "resource"],
+            registry=self.registry,
+        )
+
+        if snapshot is not None:
+            self.registry.register(SnapshotCollector(snapshot))
+
+    def remediation(self, action, outcome, namespace="", detected_at=None):
+        """Count a remediation and observe how long after detection it ran"""
+        self.remediations.labels(action=action, outcome=outcome, namespace=namespace).inc()
+        if detected_at is not None:
+            self.detection_to_action.labels(action=action).observe(time.monotonic() - detected_at)
+
+    def error(self, component):
+        """Count an error in a controller component"""
+        self.errors.labels(component=component).inc()
+
+    @contextmanager
+    def api_call(self, verb, resource):
+        """Time a Kubernetes API call"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.api_latency.labels(verb=verb, resource=resource).observe(elapsed)
+            if self.phases is not None:
+                self.phases.record(f"api.{verb}.{resource}", elapsed)
+
+    def timed(self, func, verb, resource):
+        """Wrap an API function so every call is timed"""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.api_call(verb, resource):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def exposition(self):
+        """Render the registry in the Prometheus text format"""
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Asynchronous Slack notifier for the Self-Healing Controller
+
+Posting to Slack inline makes detection wait on a webhook call, and during
+an outage Slack rate-limits exactly when there is most to report.
+SlackNotifier only enqueues on the caller's thread. A background thread
+drains the bounded queue every flush interval, coalesces the events of
+each group (workload or namespace) into one digest message, and posts the
+digests over a pooled requests.Session, waiting out any Retry-After Slack
+asks for. Events that do not fit in the queue are dropped and counted.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+import requests
+from phases import NULL_PHASE
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+def retry_after(response, default=1.0):
+    """Get how many seconds a rate-limited response asks us to wait"""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class SlackNotifier:
+    def __init__(
+        self,
+        webhook_url,
+        channel,
+        flush_interval=5,
+        max_queue=1000,
+        max_messages=10,
+        max_lines=20,
+        max_attempts=3,
+        timeout=10,
+        metrics=None,
+        phases=None,
+        session=None,
+    ):
+        """Initialize a notifier posting at most max_messages digests per flush interval"""
+        self.webhook_url = webhook_url
+        self.channel = channel
+        self.flush_interval = flush_interval
+        self.max_messages = max_messages
+        self.max_lines = max_lines
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.metrics = metrics
+        self.phases = phases
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.session = session or self._new_session()
+        self.dropped = 0
+        self.retry_at = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _new_session():
+        """Create a session keeping one connection to the webhook alive"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def notify(self, title, message, group=None):
+        """Queue a notification without blocking, returning False if it was dropped"""
+        try:
+            self.queue.put_nowait((group or title, title, message))
+        except queue.Full:
+            self.dropped += 1
+            self._count("dropped")
+            return False
+        return True
+
+    def start(self):
+        """Start the background flush loop"""
+        self._thread = threading.Thread(target=self._run, name="slack-notifier", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=5):
+        """Flush what is queued without waiting on rate limits, then stop"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush_safely()
+        self._flush_safely()
+
+    def _flush_safely(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing Slack notifications: {e}")
+            self._count("failed")
+
+    def flush(self):
+        """Send everything queued so far as digests, returning the number of messages posted"""
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if not events:
+            return 0
+
+        messages = self.digest(events)
+        if len(events) > len(messages):
+            self._count("coalesced", len(events) - len(messages))
+        return sum(1 for title, text in messages if self._post(title, text))
+
+    def digest(self, events):
+        """Coalesce (group, title, message) events into at most max_messages (title, text) messages"""
+        groups = {}
+        for group, title, message in events:
+            groups.setdefault(group, []).append((title, message))
+
+        messages = []
+        for group, items in groups.items():
+            if len(items) == 1:
+                messages.append(items[0])
+                continue
+            lines = [f"• *{title}*: {message}" for title, message in items[: self.max_lines]]
+            if len(items) > self.max_lines:
+                lines.append(f"…and {len(items) - self.max_lines} more")
+            messages.append((f"{len(items)} notifications for {group}", "\n".join(lines)))
+
+        if len(messages) > self.max_messages:
+            # Past the per-flush budget, only list which groups had news
+            overflow = messages[self.max_messages - 1 :]
+            lines = [f"• {title}" for title, _ in overflow[: self.max_lines]]
+            if len(overflow) > self.max_lines:
+                lines.append(f"…and {len(overflow) - self.max_lines} more")
+            messages = messages[: self.max_messages - 1]
+            messages.append((f"{len(overflow)} more notifications", "\n".join(lines)))
+
+        return messages
+
+    def _post(self, title, text):
+        """Post one message, waiting out Retry-After on 429 responses"""
+        payload = {
+            "channel": self.channel,
+            "text": f"*{title}*\n{text}",
+            "username": "Self-Healing Controller",
+            "icon_emoji": ":robot_face:",
+        }
+
+        for _ in range(self.max_attempts):
+            delay = self.retry_at - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+
+            try:
+                with self.phases.phase("slack.post") if self.phases else NULL_PHASE:
+                    response = self.session.post(self.webhook_url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.error(f"Error sending Slack notification: {e}")
+                break
+
+            if response.status_code == HTTP_TOO_MANY_REQUESTS:
+                wait = retry_after(response)
+                logger.warning(f"Slack rate limited notifications, retrying in {wait}s")
+                self.retry_at = time.monotonic() + wait
+                self._count("rate_limited")
+                continue
+            if response.status_code == 200:
+                self._count("sent")
+                return True
+
+            logger.error(f"Failed to send Slack notification: {response.status_code}")
+            break
+
+        self._count("failed")
+        if self.metrics is not None:
+            self.metrics.error("slack")
+        return False
+
+    def _count(self, outcome, amount=1):
+        if self.metrics is not None:
+            self.metrics.notifications.labels(outcome=outcome).inc(amount)
+
+    def __len__(self):
+        return self.queue.qsize()
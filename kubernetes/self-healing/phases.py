@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Per-phase timing for the Self-Healing Controller hot paths
+
+PhaseTimers keeps the last N durations of each named phase (scan steps,
+Kubernetes API calls, Slack posts, Helm runs) in fixed-size ring buffers
+and reports rolling p50/p95/p99. When disabled, phase() hands back one
+shared no-op context manager so instrumented code pays almost nothing.
+"""
+
+import threading
+import time
+from array import array
+from contextlib import nullcontext
+
+NULL_PHASE = nullcontext()
+
+
+class RollingWindow:
+    __slots__ = ("samples", "index", "count", "total")
+
+    def __init__(self, size):
+        """Initialize a ring buffer of the last size durations"""
+        self.samples = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+        self.total = 0
+
+    def add(self, value):
+        """Record a duration, overwriting the oldest once full"""
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+        self.total += 1
+
+    def summary(self):
+        """Get percentiles over the samples currently in the window"""
+        values = sorted(self.samples[: self.count])
+        if not values:
+            return {"count": self.total}
+
+        def percentile(q):
+            return values[min(len(values) - 1, int(q * len(values)))]
+
+        return {
+            "count": self.total,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": values[-1],
+        }
+
+
+class Phase:
+    __slots__ = ("timers", "name", "start")
+
+    def __init__(self, timers, name):
+        """Initialize a timer for one run of a phase"""
+        self.timers = timers
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timers.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class PhaseTimers:
+    def __init__(self, enabled=False, window=1024):
+        """Initialize the phase timers"""
+        self.enabled = enabled
+        self.window = window
+        self.windows = {}
+        self._lock = threading.Lock()
+
+    def phase(self, name):
+        """Get a context manager timing one run of a phase"""
+        if not self.enabled:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def record(self, name, seconds):
+        """Record a duration measured elsewhere"""
+        if not self.enabled:
+            return
+        with self._lock:
+            window = self.windows.get(name)
+            if window is None:
+                window = self.windows[name] = RollingWindow(self.window)
+            window.add(seconds)
+
+    def snapshot(self):
+        """Get rolling percentiles for every phase, in seconds"""
+        with self._lock:
+            return {name: window.summary() for name, window in sorted(self.windows.items())}
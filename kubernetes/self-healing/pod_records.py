@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Compact pod records for the Self-Healing Controller
+
+The controller only reads a handful of fields from each pod. PodRecord
+holds exactly those fields in __slots__, and can be built either from a
+kubernetes client V1Pod or straight from the raw JSON of a LIST/WATCH
+response, skipping the client's model deserialization entirely.
+"""
+
+import datetime
+from contextlib import nullcontext
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    _loads = json.loads
+
+
+def to_timestamp(value):
+    """Convert a Kubernetes timestamp (string or datetime) to epoch seconds"""
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    if isinstance(value, str):
+        # Time fields have second precision, MicroTime fields (such as Lease renewTime) microseconds
+        for layout in ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S.%fZ"):
+            try:
+                parsed = datetime.datetime.strptime(value, layout)
+            except ValueError:
+                continue
+            return parsed.replace(tzinfo=datetime.timezone.utc).timestamp()
+    return None
+
+
+class OwnerRef:
+    __slots__ = ("kind", "name", "controller")
+
+    def __init__(self, kind, name, controller):
+        """Initialize an owner reference"""
+        self.kind = kind
+        self.name = name
+        self.controller = controller
+
+
+class PodRecord:
+    __slots__ = (
+        "namespace",
+        "name",
+        "resource_version",
+        "labels",
+        "owner_references",
+        "deletion_timestamp",
+        "phase",
+        "ready",
+        "restart_counts",
+        "last_terminations",
+        "node_name",
+        "priority_class_name",
+    )
+
+    def __init__(
+        self,
+        namespace,
+        name,
+        resource_version=None,
+        labels=None,
+        owner_references=(),
+        deletion_timestamp=None,
+        phase=None,
+        ready=None,
+        restart_counts=(),
+        last_terminations=(),
+        node_name=None,
+        priority_class_name=None,
+    ):
+        """Initialize a pod record"""
+        self.namespace = namespace
+        self.name = name
+        self.resource_version = resource_version
+        self.labels = labels or {}
+        self.owner_references = owner_references
+        self.deletion_timestamp = deletion_timestamp
+        self.phase = phase
+        # Status of the Ready condition: "True", "False", "Unknown" or None
+        self.ready = ready
+        self.restart_counts = restart_counts
+        # Per container: (reason, finished_at epoch seconds) of the last termination, or None
+        self.last_terminations = last_terminations
+        self.node_name = node_name
+        self.priority_class_name = priority_class_name
+
+    @property
+    def key(self):
+        """Get the namespace/name key of the pod"""
+        return f"{self.namespace}/{self.name}"
+
+    def __repr__(self):
+        return f"PodRecord({self.key}, phase={self.phase}, ready={self.ready})"
+
+    @classmethod
+    def from_dict(cls, pod):
+        """Build a record from the raw JSON dict of a pod"""
+        metadata = pod.get("metadata") or {}
+        status = pod.get("status") or {}
+        container_statuses = status.get("containerStatuses") or ()
+
+        ready = None
+        for condition in status.get("conditions") or ():
+            if condition.get("type") == "Ready":
+                ready = condition.get("status")
+                break
+
+        spec = pod.get("spec") or {}
+        return cls(
+            metadata.get("namespace"),
+            metadata.get("name"),
+            resource_version=metadata.get("resourceVersion"),
+            labels=metadata.get("labels"),
+            owner_references=tuple(
+                OwnerRef(owner.get("kind"), owner.get("name"), owner.get("controller", False))
+                for owner in metadata.get("ownerReferences") or ()
+            ),
+            deletion_timestamp=metadata.get("deletionTimestamp"),
+            phase=status.get("phase"),
+            ready=ready,
+            restart_counts=tuple(container.get("restartCount", 0) for container in container_statuses),
+            last_terminations=tuple(
+                cls._termination_from_dict((container.get("lastState") or {}).get("terminated"))
+                for container in container_statuses
+            ),
+            node_name=spec.get("nodeName"),
+            priority_class_name=spec.get("priorityClassName"),
+        )
+
+    @classmethod
+    def from_model(cls, pod):
+        """Build a record from a kubernetes client V1Pod"""
+        metadata = pod.metadata
+        status = pod.status
+
+        ready = None
+        for condition in status.conditions or ():
+            if condition.type == "Ready":
+                ready = condition.status
+                break
+
+        return cls(
+            metadata.namespace,
+            metadata.name,
+            resource_version=metadata.resource_version,
+            labels=metadata.labels,
+            owner_references=tuple(
+                OwnerRef(owner.kind, owner.name, owner.controller) for owner in metadata.owner_references or ()
+            ),
+            deletion_timestamp=metadata.deletion_timestamp,
+            phase=status.phase,
+            ready=ready,
+            restart_counts=tuple(container.restart_count or 0 for container in status.container_statuses or ()),
+            last_terminations=tuple(
+                cls._termination_from_model(container.last_state) for container in status.container_statuses or ()
+            ),
+            node_name=pod.spec.node_name if pod.spec else None,
+            priority_class_name=pod.spec.priority_class_name if pod.spec else None,
+        )
+
+    @staticmethod
+    def _termination_from_dict(terminated):
+        if not terminated:
+            return None
+        return (terminated.get("reason"), to_timestamp(terminated.get("finishedAt")))
+
+    @staticmethod
+    def _termination_from_model(last_state):
+        terminated = last_state.terminated if last_state else None
+        if not terminated:
+            return None
+        return (terminated.reason, to_timestamp(terminated.finished_at))
+
+
+def as_pod_record(pod):
+    """Get a PodRecord for either a record or a V1Pod"""
+    if isinstance(pod, PodRecord):
+        return pod
+    return PodRecord.from_model(pod)
+
+
+class PodRecordList:
+    __slots__ = ("items", "metadata")
+
+    def __init__(self, items, resource_version, continue_token):
+        """Initialize a page of pod records shaped like a V1PodList"""
+        self.items = items
+        self.metadata = ListMeta(resource_version, continue_token)
+
+
+class ListMeta:
+    __slots__ = ("resource_version", "_continue")
+
+    def __init__(self, resource_version, continue_token):
+        """Initialize list metadata"""
+        self.resource_version = resource_version
+        self._continue = continue_token
+
+
+class PodRecordCodec:
+    """Decoder plugged into the Informer to keep PodRecords instead of V1Pods"""
+
+    @staticmethod
+    def parse_list(data):
+        """Parse the raw bytes of a pod LIST response"""
+        body = _loads(data)
+        metadata = body.get("metadata") or {}
+        items = [PodRecord.from_dict(pod) for pod in body.get("items") or ()]
+        return PodRecordList(items, metadata.get("resourceVersion"), metadata.get("continue"))
+
+    @staticmethod
+    def from_dict(obj):
+        """Build a record from a raw watch event object"""
+        return PodRecord.from_dict(obj)
+
+    @staticmethod
+    def key(record):
+        """Get the cache key of a record"""
+        return record.key
+
+    @staticmethod
+    def resource_version(record):
+        """Get the resourceVersion of a record"""
+        return record.resource_version
+
+
+def raw_pod_lister(list_func, phases=None):
+    """Wrap a pod list function so it returns PodRecord pages instead of V1PodLists"""
+
+    def list_records(**kwargs):
+        response = list_func(_preload_content=False, **kwargs)
+        try:
+            with phases.phase("pods.decode") if phases else nullcontext():
+                return PodRecordCodec.parse_list(response.data)
+        finally:
+            response.release_conn()
+
+    return list_records
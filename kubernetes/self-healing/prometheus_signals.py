@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Prometheus health signals for the Self-Healing Controller
+
+Kubernetes only knows whether a pod is Ready. A workload can pass its
+readiness probe while answering most requests with errors, responding far
+too slowly or restarting every few minutes. PrometheusSignals fetches these
+signals for every workload at once. Each signal is one instant query that
+returns a vector with a series per pod, so a refresh costs one request per
+signal however many pods the cluster runs.
+
+Series are mapped to the controlling owner of their pod (the
+kind/namespace/name key topology.owner_key gives) and averaged per owner.
+Each value is cached with the time it was fetched and ignored once it is
+older than ttl, so a Prometheus outage fades the signals out rather than
+leaving remediation to act on stale ones.
+"""
+
+import logging
+import math
+import time
+
+import requests
+from alerts import POD_LABELS
+
+logger = logging.getLogger(__name__)
+
+# Per-pod queries; series carry namespace + pod, or the kubernetes_* labels of the scrape config
+DEFAULT_QUERIES = {
+    "error_rate": (
+        'sum by (kubernetes_namespace, kubernetes_pod_name) (rate(http_requests_total{code=~"5.."}[5m]))'
+        " / sum by (kubernetes_namespace, kubernetes_pod_name) (rate(http_requests_total[5m]))"
+    ),
+    "latency_p95": (
+        "histogram_quantile(0.95, sum by (kubernetes_namespace, kubernetes_pod_name, le) "
+        "(rate(http_request_duration_seconds_bucket[5m])))"
+    ),
+    "restarts": "sum by (namespace, pod) (increase(kube_pod_container_status_restarts_total[15m]))",
+}
+
+
+def series_pod(labels):
+    """Get the namespace/name key of the pod a series belongs to, or None"""
+    for namespace_label, pod_label in POD_LABELS:
+        if labels.get(namespace_label) and labels.get(pod_label):
+            return f"{labels[namespace_label]}/{labels[pod_label]}"
+    return None
+
+
+class PrometheusSignals:
+    def __init__(self, url, thresholds, owner_of, queries=None, ttl=120, timeout=5, clock=time.monotonic):
+        """Initialize signals for the queries with a threshold; owner_of(pod key) gets a pod's owner key"""
+        queries = queries or DEFAULT_QUERIES
+        self.url = url.rstrip("/")
+        # A signal without a positive threshold could never count, so it is not queried
+        self.thresholds = {name: threshold for name, threshold in thresholds.items() if threshold and threshold > 0}
+        self.queries = {name: query for name, query in queries.items() if name in self.thresholds}
+        self.owner_of = owner_of
+        self.ttl = ttl
+        self.timeout = timeout
+        self.clock = clock
+        self.session = requests.Session()
+        # owner key -> {signal: (value, fetched at)}
+        self.cache = {}
+
+    def query(self, promql):
+        """Run an instant query, returning (labels, value) for each series of the vector"""
+        response = self.session.get(f"{self.url}/api/v1/query", params={"query": promql}, timeout=self.timeout)
+        # Prometheus explains failed queries in a JSON body; anything else comes from a proxy in between
+        if not response.headers.get("Content-Type", "").startswith("application/json"):
+            response.raise_for_status()
+            raise ValueError(f"expected JSON, got {response.headers.get('Content-Type')}")
+        body = response.json()
+        if body.get("status") != "success":
+            raise ValueError(f"query failed with HTTP {response.status_code}: {body.get('error', body.get('status'))}")
+
+        data = body["data"]
+        if data["resultType"] != "vector":
+            raise ValueError(f"expected a vector, got a {data['resultType']}")
+        return [(series["metric"], float(series["value"][1])) for series in data["result"]]
+
+    def refresh(self):
+        """Fetch every signal, raising the first error once the other signals are updated"""
+        now = self.clock()
+        cache = {owner: dict(signals) for owner, signals in self.cache.items()}
+        error = None
+
+        for name, promql in self.queries.items():
+            try:
+                series = self.query(promql)
+            except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+                logger.error(f"Prometheus query for {name} failed: {e}")
+                error = error or e
+                continue
+
+            # owner key -> [sum, pods]
+            totals = {}
+            for labels, value in series:
+                pod_key = series_pod(labels)
+                # 0/0 error rates of idle pods come back as NaN
+                if pod_key is None or math.isnan(value):
+                    continue
+                owner = self.owner_of(pod_key)
+                if owner is None:
+                    continue
+                total = totals.setdefault(owner, [0.0, 0])
+                total[0] += value
+                total[1] += 1
+
+            for owner, (value, pods) in totals.items():
+                cache.setdefault(owner, {})[name] = (value / pods, now)
+
+        # Drop values older than the TTL, and owners left without any
+        for owner in list(cache):
+            cache[owner] = {name: entry for name, entry in cache[owner].items() if now - entry[1] <= self.ttl}
+            if not cache[owner]:
+                del cache[owner]
+
+        # Swapped in whole, so readers never see a half-built map
+        self.cache = cache
+        if error is not None:
+            raise error
+
+    def signals(self, owner):
+        """Get the signal values of an owner fetched within the TTL"""
+        now = self.clock()
+        return {
+            name: value
+            for name, (value, fetched_at) in self.cache.get(owner, {}).items()
+            if now - fetched_at <= self.ttl
+        }
+
+    def breaches(self, owner):
+        """Get (signal, value, threshold) for each of an owner's signals above its threshold"""
+        if owner not in self.cache:
+            return []
+        return [
+            (name, value, self.thresholds[name])
+            for name, value in sorted(self.signals(owner).items())
+            if value > self.thresholds[name]
+        ]
+
+    def __len__(self):
+        return len(self.cache)
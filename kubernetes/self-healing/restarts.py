@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Restart-rate tracking for crash-loop detection
+
+A container's lifetime restartCount says nothing about whether it is
+crash looping now. RestartTracker remembers, per container, the last
+restartCount it saw and the times of the most recent restarts in a fixed
+array-backed ring buffer, so detection can be based on how many restarts
+happened inside a sliding window. Pods that never restarted are not
+tracked at all, and entries are evicted once their pod goes away.
+"""
+
+import threading
+import time
+from array import array
+
+# Marks an unused ring buffer slot
+NEVER = float("-inf")
+
+
+class PodRestarts:
+    __slots__ = ("counts", "stamps", "cursors", "generation")
+
+    def __init__(self, containers, size, generation):
+        """Initialize empty restart history for a pod's containers"""
+        self.counts = array("q", bytes(8 * containers))
+        self.stamps = array("d", [NEVER]) * (containers * size)
+        self.cursors = array("H", bytes(2 * containers))
+        self.generation = generation
+
+
+class RestartTracker:
+    def __init__(self, window_seconds=600, threshold=3):
+        """Initialize a tracker flagging more than threshold restarts per window"""
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+        # Only the latest threshold + 1 restarts are needed to tell if the threshold was exceeded
+        self.size = threshold + 1
+        self.pods = {}
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def observe(self, key, restart_counts, last_terminations=(), now=None):
+        """Record a pod's restart counts and get the most restarts of any container in the window"""
+        if key not in self.pods and not any(restart_counts):
+            return 0
+
+        now = time.time() if now is None else now
+        size = self.size
+
+        with self._lock:
+            entry = self.pods.get(key)
+            if entry is None or len(entry.counts) != len(restart_counts):
+                entry = self.pods[key] = PodRestarts(len(restart_counts), size, self.generation)
+                self._seed(entry, restart_counts, last_terminations, now)
+            entry.generation = self.generation
+
+            worst = 0
+            for index, count in enumerate(restart_counts):
+                previous = entry.counts[index]
+                entry.counts[index] = count
+                if count < previous:
+                    # The container was recreated; start its history over
+                    self._clear(entry, index)
+                for _ in range(min(count - previous, size) if count > previous else 0):
+                    self._push(entry, index, now)
+                worst = max(worst, self._recent(entry, index, now))
+
+            return worst
+
+    def is_crash_looping(self, key, restart_counts, last_terminations=(), now=None):
+        """Check if any container restarted more than threshold times inside the window"""
+        return self.observe(key, restart_counts, last_terminations, now) > self.threshold
+
+    def _seed(self, entry, restart_counts, last_terminations, now):
+        """Start from the current counts, keeping the last restart if it falls inside the window"""
+        for index, count in enumerate(restart_counts):
+            entry.counts[index] = count
+            termination = last_terminations[index] if index < len(last_terminations) else None
+            finished_at = termination[1] if termination else None
+            if count and finished_at is not None and now - finished_at <= self.window_seconds:
+                self._push(entry, index, finished_at)
+
+    def _push(self, entry, index, timestamp):
+        cursor = entry.cursors[index]
+        entry.stamps[index * self.size + cursor] = timestamp
+        entry.cursors[index] = (cursor + 1) % self.size
+
+    def _clear(self, entry, index):
+        start = index * self.size
+        for offset in range(self.size):
+            entry.stamps[start + offset] = NEVER
+
+    def _recent(self, entry, index, now):
+        """Count a container's restarts inside the window"""
+        start = index * self.size
+        cutoff = now - self.window_seconds
+        return sum(1 for offset in range(self.size) if entry.stamps[start + offset] > cutoff)
+
+    def forget(self, key):
+        """Evict a pod that went away"""
+        with self._lock:
+            self.pods.pop(key, None)
+
+    def start_sweep(self):
+        """Begin a full pass over all pods; entries not observed before finish_sweep are evicted"""
+        with self._lock:
+            self.generation += 1
+
+    def finish_sweep(self):
+        """Evict pods that were not observed since start_sweep"""
+        with self._lock:
+            stale = [key for key, entry in self.pods.items() if entry.generation != self.generation]
+            for key in stale:
+                del self.pods[key]
+            return len(stale)
+
+    def __len__(self):
+        return len(self.pods)
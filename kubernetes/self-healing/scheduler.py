@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Periodic loop scheduling for the Self-Healing Controller
+
+AdaptiveInterval decides how long a loop waits before its next run. While
+the loop reports failures are active it runs at min_interval, and each
+quiet run stretches the wait by BACKOFF up to max_interval. Errors wait
+retry_interval. Every wait is jittered so replicas started together do not
+scan in lockstep.
+
+Scheduler runs the loops on threads that sleep on one condition variable
+instead of time.sleep, so trigger() starts a loop's next run at once and
+stop() ends every wait immediately.
+"""
+
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Growth of the wait after each quiet run
+BACKOFF = 1.5
+
+
+class AdaptiveInterval:
+    def __init__(self, interval, min_interval=None, max_interval=None, retry_interval=None, jitter=0.0, rng=None):
+        """Initialize the schedule of a loop that normally runs every interval seconds"""
+        self.interval = interval
+        self.min_interval = interval if min_interval is None else min_interval
+        self.max_interval = interval if max_interval is None else max_interval
+        self.retry_interval = interval if retry_interval is None else retry_interval
+        self.jitter = jitter
+        self.rng = rng or random.random
+        self.current = None
+
+    def next_delay(self, busy=False, failed=False):
+        """Get the wait before the next run, given whether failures are active or the run failed"""
+        if failed:
+            delay = self.retry_interval
+        elif busy:
+            delay = self.current = self.min_interval
+        elif self.current is None or self.current < self.interval:
+            delay = self.current = self.interval
+        else:
+            delay = self.current = min(self.max_interval, self.current * BACKOFF)
+
+        # Spread by up to +/- jitter of the delay
+        return delay * (1 + self.jitter * (2 * self.rng() - 1))
+
+
+class Scheduler:
+    def __init__(self):
+        """Initialize a scheduler with no loops"""
+        self.stopped = False
+        self.triggered = set()
+        self.threads = {}
+        self._cond = threading.Condition()
+
+    def every(self, name, func, schedule, busy=None, on_error=None):
+        """Call func on a thread on schedule until stop(); busy() tells whether failures are active"""
+        thread = threading.Thread(
+            target=self._loop, args=(name, func, schedule, busy, on_error), name=name.replace(" ", "-"), daemon=True
+        )
+        self.threads[name] = thread
+        thread.start()
+        return thread
+
+    def _loop(self, name, func, schedule, busy, on_error):
+        while not self.stopped:
+            failed = False
+            try:
+                func()
+            except Exception as e:
+                failed = True
+                if on_error is not None:
+                    on_error(e)
+                else:
+                    logger.error(f"Error in {name}: {e}")
+
+            if not self.sleep(name, schedule.next_delay(busy() if busy else False, failed)):
+                return
+
+    def sleep(self, name, delay):
+        """Wait up to delay seconds or until name is triggered, returning False once stopped"""
+        deadline = time.monotonic() + delay
+        with self._cond:
+            while not self.stopped and name not in self.triggered:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            self.triggered.discard(name)
+            return not self.stopped
+
+    def trigger(self, name):
+        """Start the next run of a loop now instead of at the end of its wait"""
+        with self._cond:
+            self.triggered.add(name)
+            self._cond.notify_all()
+
+    def stop(self):
+        """Stop every loop; a run in progress finishes, but no loop waits again"""
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until stop() is called, returning whether it was"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.stopped, timeout)
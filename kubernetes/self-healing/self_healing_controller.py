@@ -6,13 +6,40 @@ This controller monitors Kubernetes cluster for failures and automatically
 responds by restarting pods, scaling applications, and performing rollbacks.
 """
 
+import asyncio
+import json
 import logging
 import os
+import signal
+import socket
 import subprocess
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from alerts import SCAN_KEY, AlertReceiver
+from async_engine import AsyncEngine
+from circuit_breaker import CLOSED, STATE_VALUES, CircuitBreaker, scope_label
+from cooldown import CooldownStore
+from coordination import LeaseLock, ShardMembership
+from disruption import ConfigMapState, RebootScheduler
+from event_log import EventRecorder, RecordingApi
+from health_server import HealthServer, json_snapshot
+from heartbeats import NODE_LEASE_NAMESPACE, NodeHeartbeats
+from helm_releases import RELEASE_SECRET_SELECTOR, HelmReleaseCache, HelmRevisionCodec
+from informer import Informer, list_pages
+from metrics import ControllerMetrics
+from notifications import SlackNotifier
+from phases import PhaseTimers
+from pod_records import PodRecordCodec, as_pod_record, raw_pod_lister, to_timestamp
+from priorities import RemediationPriorities
+from prometheus_signals import DEFAULT_QUERIES, PrometheusSignals
+from restarts import RestartTracker
+from scheduler import AdaptiveInterval, Scheduler
+from topology import ClusterIndex, owner_key
+from workloads import WorkloadResolver, restart_workload, rollback_deployment
+from workqueue import RateLimitingQueue
 
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
@@ -23,38 +50,248 @@ logger = logging.getLogger(__name__)
 
 
 class SelfHealingController:
-    def __init__(self):
-        """Initialize the Self-Healing Controller"""
+    def __init__(self, clients=None, overrides=None):
+        """Initialize the Self-Healing Controller
+
+        clients provides the core_v1, apps_v1 and coordination_v1 API clients to use instead of connecting
+        to the cluster, as a FakeCluster does. overrides replaces settings read from the environment.
+        """
         self.config = self._load_config()
-        self.k8s_client = self._init_kubernetes_client()
+        self.config.update(overrides or {})
+        if clients is None:
+            self.k8s_client = self._init_kubernetes_client()
+            self.apps_client = client.AppsV1Api()
+            self.coordination_client = client.CoordinationV1Api()
+        else:
+            self.k8s_client = clients.core_v1
+            self.apps_client = clients.apps_v1
+            self.coordination_client = clients.coordination_v1
+        self.workload_resolver = WorkloadResolver(self.apps_client)
+        self.event_recorder = None
+        if self.config["event_log_path"]:
+            self._start_event_recording()
+        self.leader_lock = None
+        self.shard_membership = None
         self.pod_failures = {}
         self.node_failures = {}
         self.helm_releases = {}
+        self.helm_cache = None
+        self.helm_informer = None
+        self.helm_pool = None
+        self._helm_in_flight = set()
+        self._helm_lock = threading.Lock()
         self.running = True
-        self.last_check = {}
+        self.scheduler = Scheduler()
+        self.cooldowns = CooldownStore(
+            ttl=self.config["cooldown_ttl_seconds"],
+            max_entries=self.config["cooldown_max_entries"],
+            max_delay=self.config["cooldown_max_seconds"],
+        )
+        self.restart_tracker = RestartTracker(
+            window_seconds=self.config["crash_loop_window_seconds"], threshold=self.config["pod_failure_threshold"]
+        )
+        self.remediation_priorities = RemediationPriorities(
+            self.k8s_client,
+            default_tier=self.config["remediation_default_priority"],
+            class_tiers=self.config["remediation_priority_classes"],
+        )
+        self.cluster_index = ClusterIndex(node_state_ttl=self.config["node_state_ttl_seconds"])
+        self.circuit_breaker = None
+        if self.config["circuit_breaker_enabled"]:
+            self.circuit_breaker = CircuitBreaker(
+                self.cluster_index.pod_count,
+                failure_ratio=self.config["circuit_breaker_failure_ratio"],
+                min_pods=self.config["circuit_breaker_min_pods"],
+                window_seconds=self.config["circuit_breaker_window_seconds"],
+                open_seconds=self.config["circuit_breaker_open_seconds"],
+                probes=self.config["circuit_breaker_probes"],
+                mode=self.config["circuit_breaker_mode"],
+                throttle_per_minute=self.config["circuit_breaker_throttle_per_minute"],
+                on_transition=self._on_circuit_transition,
+            )
+        self.prometheus_signals = None
+        if self.config["prometheus_enabled"]:
+            self.prometheus_signals = PrometheusSignals(
+                self.config["prometheus_url"],
+                self.config["prometheus_signal_thresholds"],
+                self.cluster_index.pod_owner,
+                queries=self.config["prometheus_queries"],
+                ttl=self.config["prometheus_signal_ttl_seconds"],
+                timeout=self.config["prometheus_timeout_seconds"],
+            )
+        self.node_heartbeats = NodeHeartbeats(stale_after=self.config["node_lease_stale_seconds"])
+        self.reboot_scheduler = RebootScheduler(
+            max_concurrent=self.config["reboot_max_concurrent"],
+            max_zone_fraction=self.config["reboot_max_zone_fraction"],
+            spacing=self.config["reboot_spacing_seconds"],
+            reboot_timeout=self.config["reboot_timeout_seconds"],
+            store=ConfigMapState(
+                self.k8s_client, self.config["disruption_state_configmap"], self.config["pod_namespace"]
+            ),
+        )
+        self.pod_informer = None
+        self.node_lease_informer = None
+        self.slack_notifier = None
+        self.health_server = None
+        self.alert_receiver = None
+        self.last_pod_scan_at = None
+        self.remediation_queue = None
+        self.remediation_threads = []
+        # Set by AsyncEngine to run loops, remediations, Slack posts and Helm as asyncio tasks
+        self.engine = None
+        self.pending_remediations = {}
+        self._pending_lock = threading.Lock()
+        # Workloads restarted or rolled back as a group -> keys of their pods still failing
+        self.restarted_workloads = {}
+        self._restarted_lock = threading.Lock()
+        # Owners whose degraded pods are being replaced one per cooldown
+        self.degraded_owners = set()
+        # Serializes evaluating pods and inline remediation between the scan, informer and alert threads
+        self._check_lock = threading.RLock()
+        # Remediations found during an informer relist or resync, dispatched when it ends
+        self._deferred_pod_checks = []
+        # Pods and workloads acted on so far, so the pod scan can tell if its last cycle remediated anything
+        self._remediations_started = 0
+        self._remediations_at_last_scan = 0
+        self._last_scan_remediated = False
+        self.phases = PhaseTimers(
+            enabled=self.config["phase_timing_enabled"], window=self.config["phase_timing_window"]
+        )
+        self._phases_logged_at = time.monotonic()
+        self.metrics = ControllerMetrics(snapshot=self.get_metrics, phases=self.phases)
 
     def _load_config(self):
         """Load configuration from environment variables"""
         return {
             "pod_failure_threshold": int(os.getenv("POD_FAILURE_THRESHOLD", 3)),
             "pod_restart_timeout": int(os.getenv("POD_RESTART_TIMEOUT", 300)),
+            "crash_loop_window_seconds": int(os.getenv("CRASH_LOOP_WINDOW_SECONDS", 600)),
+            "crash_loop_notify_only_reasons": [
+                reason.strip()
+                for reason in os.getenv("CRASH_LOOP_NOTIFY_ONLY_REASONS", "OOMKilled").split(",")
+                if reason.strip()
+            ],
             "node_failure_threshold": int(os.getenv("NODE_FAILURE_THRESHOLD", 2)),
             "node_unreachable_timeout": int(os.getenv("NODE_UNREACHABLE_TIMEOUT", 600)),
+            "node_state_ttl_seconds": int(os.getenv("NODE_STATE_TTL_SECONDS", 120)),
+            "node_lease_monitoring_enabled": os.getenv("NODE_LEASE_MONITORING_ENABLED", "false").lower() == "true",
+            "node_lease_stale_seconds": int(os.getenv("NODE_LEASE_STALE_SECONDS", 40)),
+            "node_lease_check_interval": int(os.getenv("NODE_LEASE_CHECK_INTERVAL", 5)),
+            "node_lease_resync_seconds": int(os.getenv("NODE_LEASE_RESYNC_SECONDS", 600)),
             "helm_rollback_enabled": os.getenv("HELM_ROLLBACK_ENABLED", "true").lower() == "true",
             "helm_rollback_timeout": int(os.getenv("HELM_ROLLBACK_TIMEOUT", 300)),
+            "helm_release_cache_enabled": os.getenv("HELM_RELEASE_CACHE_ENABLED", "false").lower() == "true",
+            "helm_rollback_workers": int(os.getenv("HELM_ROLLBACK_WORKERS", 2)),
             "kured_integration_enabled": os.getenv("KURED_INTEGRATION_ENABLED", "true").lower() == "true",
+            "reboot_max_concurrent": int(os.getenv("REBOOT_MAX_CONCURRENT", 1)),
+            "reboot_max_zone_fraction": float(os.getenv("REBOOT_MAX_ZONE_FRACTION", 0.25)),
+            "reboot_spacing_seconds": int(os.getenv("REBOOT_SPACING_SECONDS", 300)),
+            "reboot_timeout_seconds": int(os.getenv("REBOOT_TIMEOUT_SECONDS", 1800)),
+            "node_zone_label": os.getenv("NODE_ZONE_LABEL", "topology.kubernetes.io/zone"),
+            "disruption_state_configmap": os.getenv("DISRUPTION_STATE_CONFIGMAP", "self-healing-disruption"),
             "slack_notifications_enabled": os.getenv("SLACK_NOTIFICATIONS_ENABLED", "false").lower() == "true",
             "slack_webhook_url": os.getenv("SLACK_WEBHOOK_URL", ""),
             "slack_channel": os.getenv("SLACK_CHANNEL", "#alerts"),
+            "slack_async_enabled": os.getenv("SLACK_ASYNC_ENABLED", "true").lower() == "true",
+            "slack_flush_interval": float(os.getenv("SLACK_FLUSH_INTERVAL", 5)),
+            "slack_queue_size": int(os.getenv("SLACK_QUEUE_SIZE", 1000)),
+            "slack_max_messages_per_flush": int(os.getenv("SLACK_MAX_MESSAGES_PER_FLUSH", 10)),
             "prometheus_enabled": os.getenv("PROMETHEUS_ENABLED", "true").lower() == "true",
             "prometheus_url": os.getenv(
                 "PROMETHEUS_URL", "http://prometheus-service.monitoring.svc.cluster.local:9090"
             ),
+            "prometheus_query_interval": int(os.getenv("PROMETHEUS_QUERY_INTERVAL", 30)),
+            "prometheus_signal_ttl_seconds": int(os.getenv("PROMETHEUS_SIGNAL_TTL_SECONDS", 120)),
+            "prometheus_timeout_seconds": float(os.getenv("PROMETHEUS_TIMEOUT_SECONDS", 5)),
+            # A Ready pod is remediated when its workload's average goes above one of these; 0 turns a signal off
+            "prometheus_signal_thresholds": {
+                "error_rate": float(os.getenv("PROMETHEUS_ERROR_RATE_THRESHOLD", 0.5)),
+                "latency_p95": float(os.getenv("PROMETHEUS_LATENCY_THRESHOLD_SECONDS", 2)),
+                "restarts": float(os.getenv("PROMETHEUS_RESTARTS_THRESHOLD", 10)),
+            },
+            "prometheus_queries": {
+                "error_rate": os.getenv("PROMETHEUS_ERROR_RATE_QUERY", DEFAULT_QUERIES["error_rate"]),
+                "latency_p95": os.getenv("PROMETHEUS_LATENCY_QUERY", DEFAULT_QUERIES["latency_p95"]),
+                "restarts": os.getenv("PROMETHEUS_RESTARTS_QUERY", DEFAULT_QUERIES["restarts"]),
+            },
             "chaos_engineering_enabled": os.getenv("CHAOS_ENGINEERING_ENABLED", "true").lower() == "true",
             "chaos_mesh_url": os.getenv(
                 "CHAOS_MESH_URL", "http://chaos-mesh-controller-manager.chaos-engineering.svc.cluster.local:10080"
             ),
             "check_interval": int(os.getenv("CHECK_INTERVAL", 30)),  # Check every 30 seconds
+            # Scans run at check_interval x the min factor while failures are active, backing off to the max factor
+            "scan_interval_min_factor": float(os.getenv("SCAN_INTERVAL_MIN_FACTOR", 0.25)),
+            "scan_interval_max_factor": float(os.getenv("SCAN_INTERVAL_MAX_FACTOR", 2)),
+            "scan_jitter": float(os.getenv("SCAN_JITTER", 0.1)),
+            "shutdown_grace_seconds": float(os.getenv("SHUTDOWN_GRACE_SECONDS", 10)),
+            "pod_watch_enabled": os.getenv("POD_WATCH_ENABLED", "false").lower() == "true",
+            "watch_timeout_seconds": int(os.getenv("WATCH_TIMEOUT_SECONDS", 300)),
+            "informer_resync_period": int(os.getenv("INFORMER_RESYNC_PERIOD", 300)),
+            "pod_list_page_size": int(os.getenv("POD_LIST_PAGE_SIZE", 500)),
+            "excluded_namespaces": [
+                namespace.strip()
+                for namespace in os.getenv(
+                    "EXCLUDED_NAMESPACES", "kube-system,monitoring,chaos-engineering,self-healing"
+                ).split(",")
+                if namespace.strip()
+            ],
+            "pod_label_selector": os.getenv("POD_LABEL_SELECTOR", ""),
+            "remediation_workers": int(os.getenv("REMEDIATION_WORKERS", 4)),
+            "remediation_rate_limit": float(os.getenv("REMEDIATION_RATE_LIMIT", 10)),
+            "remediation_burst": int(os.getenv("REMEDIATION_BURST", 50)),
+            "remediation_backoff_base": float(os.getenv("REMEDIATION_BACKOFF_BASE", 1)),
+            "remediation_backoff_max": float(os.getenv("REMEDIATION_BACKOFF_MAX", 300)),
+            "remediation_priority_aging_seconds": float(os.getenv("REMEDIATION_PRIORITY_AGING_SECONDS", 30)),
+            "remediation_default_priority": int(os.getenv("REMEDIATION_DEFAULT_PRIORITY", 2)),
+            "remediation_priority_classes": {
+                name.strip(): int(tier)
+                for name, _, tier in (
+                    item.partition("=")
+                    for item in os.getenv(
+                        "REMEDIATION_PRIORITY_CLASSES", "system-node-critical=0,system-cluster-critical=0"
+                    ).split(",")
+                )
+                if name.strip() and tier.strip()
+            },
+            "namespace_priority_refresh_seconds": int(os.getenv("NAMESPACE_PRIORITY_REFRESH_SECONDS", 300)),
+            "pod_cooldown_seconds": int(os.getenv("POD_COOLDOWN_SECONDS", 60)),
+            "node_cooldown_seconds": int(os.getenv("NODE_COOLDOWN_SECONDS", 300)),
+            "cooldown_max_seconds": int(os.getenv("COOLDOWN_MAX_SECONDS", 1800)),
+            "cooldown_ttl_seconds": int(os.getenv("COOLDOWN_TTL_SECONDS", 3600)),
+            "cooldown_max_entries": int(os.getenv("COOLDOWN_MAX_ENTRIES", 10000)),
+            "circuit_breaker_enabled": os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true",
+            "circuit_breaker_failure_ratio": float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATIO", 0.3)),
+            "circuit_breaker_min_pods": int(os.getenv("CIRCUIT_BREAKER_MIN_PODS", 20)),
+            "circuit_breaker_window_seconds": int(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", 120)),
+            "circuit_breaker_open_seconds": int(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", 300)),
+            "circuit_breaker_probes": int(os.getenv("CIRCUIT_BREAKER_PROBES", 5)),
+            "circuit_breaker_mode": os.getenv("CIRCUIT_BREAKER_MODE", "observe").lower(),
+            "circuit_breaker_throttle_per_minute": float(os.getenv("CIRCUIT_BREAKER_THROTTLE_PER_MINUTE", 6)),
+            "workload_batching_enabled": os.getenv("WORKLOAD_BATCHING_ENABLED", "true").lower() == "true",
+            "workload_batch_window": float(os.getenv("WORKLOAD_BATCH_WINDOW", 5)),
+            "workload_batch_min_pods": int(os.getenv("WORKLOAD_BATCH_MIN_PODS", 2)),
+            "workload_remediation_action": os.getenv("WORKLOAD_REMEDIATION_ACTION", "restart"),
+            "leader_election_enabled": os.getenv("LEADER_ELECTION_ENABLED", "false").lower() == "true",
+            "sharding_enabled": os.getenv("SHARDING_ENABLED", "false").lower() == "true",
+            "pod_name": os.getenv("POD_NAME", socket.gethostname()),
+            "pod_namespace": os.getenv("POD_NAMESPACE", "self-healing"),
+            "lease_duration_seconds": int(os.getenv("LEASE_DURATION_SECONDS", 15)),
+            # The leader stops acting this long after its last renewal, before others may take over
+            "lease_renew_deadline_seconds": int(os.getenv("LEASE_RENEW_DEADLINE_SECONDS", 10)),
+            "lease_renew_interval": int(os.getenv("LEASE_RENEW_INTERVAL", 5)),
+            "shard_virtual_nodes": int(os.getenv("SHARD_VIRTUAL_NODES", 64)),
+            "controller_engine": os.getenv("CONTROLLER_ENGINE", "threads").lower(),
+            "async_kubernetes_concurrency": int(os.getenv("ASYNC_KUBERNETES_CONCURRENCY", 64)),
+            "async_slack_concurrency": int(os.getenv("ASYNC_SLACK_CONCURRENCY", 4)),
+            "pod_fast_path_enabled": os.getenv("POD_FAST_PATH_ENABLED", "false").lower() == "true",
+            "event_log_path": os.getenv("EVENT_LOG_PATH", ""),
+            "health_port": int(os.getenv("HEALTH_PORT", 8080)),
+            "health_snapshot_interval": float(os.getenv("HEALTH_SNAPSHOT_INTERVAL", 1)),
+            "alert_webhook_enabled": os.getenv("ALERT_WEBHOOK_ENABLED", "false").lower() == "true",
+            "alert_webhook_token": os.getenv("ALERT_WEBHOOK_TOKEN", ""),
+            "phase_timing_enabled": os.getenv("PHASE_TIMING_ENABLED", "false").lower() == "true",
+            "phase_timing_window": int(os.getenv("PHASE_TIMING_WINDOW", 1024)),
+            "phase_timing_log_interval": int(os.getenv("PHASE_TIMING_LOG_INTERVAL", 300)),
         }
 
     def _init_kubernetes_client(self):
@@ -66,101 +303,984 @@ class SelfHealingController:
 
         return client.CoreV1Api()
 
+    def _start_event_recording(self):
+        """Record every pod, node and node lease LIST and watch event to the event log"""
+        self.event_recorder = EventRecorder(self.config["event_log_path"])
+        self.k8s_client = RecordingApi(self.k8s_client, self.event_recorder)
+        self.coordination_client = RecordingApi(self.coordination_client, self.event_recorder)
+        logger.info(f"Recording cluster events to {self.config['event_log_path']}")
+
     def start_monitoring(self):
         """Start monitoring the cluster for failures"""
         logger.info("Starting Self-Healing Controller monitoring...")
         logger.info(f"Configuration: {self.config}")
 
         # Start monitoring threads
+        self._start_slack_notifier()
+        self._start_coordination()
+        self._start_remediation_workers()
+        self._start_priority_refresh()
+        self._start_prometheus_signals()
+        self._start_helm_release_cache()
         self._start_pod_monitoring()
         self._start_node_monitoring()
+        self._start_alert_receiver()
         self._start_health_server()
 
+    def _start_slack_notifier(self):
+        """Start the background notifier so notifications never block detection"""
+        if not self.config["slack_notifications_enabled"] or not self.config["slack_webhook_url"]:
+            return
+        if not self.config["slack_async_enabled"]:
+            return
+
+        self.slack_notifier = SlackNotifier(
+            self.config["slack_webhook_url"],
+            self.config["slack_channel"],
+            flush_interval=self.config["slack_flush_interval"],
+            max_queue=self.config["slack_queue_size"],
+            max_messages=self.config["slack_max_messages_per_flush"],
+            metrics=self.metrics,
+            phases=self.phases,
+        )
+        if self.engine is not None:
+            self._run_periodically(
+                "Slack notifications",
+                self.slack_notifier.flush,
+                self.config["slack_flush_interval"],
+                component="slack",
+                downstream="slack",
+            )
+        else:
+            self.slack_notifier.start()
+        logger.info("Slack notifier started")
+
+    def _run_periodically(
+        self, name, func, interval, retry_interval=None, component=None, downstream="kubernetes", busy=None
+    ):
+        """Call func about every interval seconds until the controller stops, on a thread or as an engine task
+
+        With busy, the interval adapts: it shrinks while busy() reports active failures and grows while quiet.
+        """
+        schedule = AdaptiveInterval(interval, retry_interval=retry_interval, jitter=self.config["scan_jitter"])
+        if busy is not None:
+            schedule.min_interval = interval * self.config["scan_interval_min_factor"]
+            schedule.max_interval = interval * self.config["scan_interval_max_factor"]
+
+        if self.engine is not None:
+            self.engine.every(name, func, schedule, busy, component, downstream)
+            return
+
+        def on_error(e):
+            logger.error(f"Error in {name}: {e}")
+            if component:
+                self.metrics.error(component)
+
+        self.scheduler.every(name, func, schedule, busy, on_error)
+
+    def wake(self, name):
+        """Run a periodic loop now, for example a scan when an external alert fires"""
+        # Watched pods are not scanned; re-evaluating the cached ones has the same effect without a LIST
+        if name == "pod monitoring" and self.pod_informer is not None:
+            self.pod_informer.resync()
+            return
+
+        if self.engine is not None:
+            self.engine.trigger(name)
+        else:
+            self.scheduler.trigger(name)
+
+    def _start_coordination(self):
+        """Start leader election and namespace sharding across replicas"""
+        if not self.config["leader_election_enabled"] and not self.config["sharding_enabled"]:
+            return
+
+        identity = self.config["pod_name"]
+        namespace = self.config["pod_namespace"]
+
+        if self.config["leader_election_enabled"]:
+            self.leader_lock = LeaseLock(
+                self.coordination_client,
+                "self-healing-controller-leader",
+                namespace,
+                identity,
+                lease_duration=self.config["lease_duration_seconds"],
+                renew_deadline=self.config["lease_renew_deadline_seconds"],
+            )
+
+        if self.config["sharding_enabled"]:
+            self.shard_membership = ShardMembership(
+                self.coordination_client,
+                namespace,
+                identity,
+                "self-healing-controller",
+                lease_duration=self.config["lease_duration_seconds"],
+                virtual_nodes=self.config["shard_virtual_nodes"],
+            )
+
+        self._renew_coordination()
+        self._run_periodically("replica coordination", self._renew_coordination, self.config["lease_renew_interval"])
+        logger.info(f"Replica coordination started as {identity}")
+
+    def _renew_coordination(self):
+        """Renew the leader lease and shard membership"""
+        if self.leader_lock:
+            was_leader = self.leader_lock.is_held()
+            is_leader = self.leader_lock.try_acquire_or_renew()
+            if is_leader != was_leader:
+                logger.info(f"Leadership {'acquired' if is_leader else 'lost'} by {self.config['pod_name']}")
+
+        if self.shard_membership:
+            self.shard_membership.heartbeat()
+
+    def _is_leader(self):
+        """Check if this replica should perform singleton duties"""
+        return self.leader_lock is None or self.leader_lock.is_held()
+
+    def _owns_namespace(self, namespace):
+        """Check if this replica's shard covers a namespace"""
+        return self.shard_membership is None or self.shard_membership.owns(namespace)
+
+    def _start_remediation_workers(self):
+        """Start the worker pool that drains the remediation queue"""
+        if self.config["remediation_workers"] <= 0:
+            return
+
+        queue_options = {
+            "base_delay": self.config["remediation_backoff_base"],
+            "max_delay": self.config["remediation_backoff_max"],
+            "rate": self.config["remediation_rate_limit"],
+            "burst": self.config["remediation_burst"],
+            "aging_seconds": self.config["remediation_priority_aging_seconds"],
+        }
+        if self.engine is not None:
+            # One task per key instead of a fixed pool of worker threads
+            self.remediation_queue = self.engine.start_remediation(queue_options)
+            logger.info("Started remediation dispatcher on the asyncio engine")
+            return
+
+        self.remediation_queue = RateLimitingQueue(**queue_options)
+        for index in range(self.config["remediation_workers"]):
+            thread = threading.Thread(target=self._remediation_worker, name=f"remediation-{index}", daemon=True)
+            thread.start()
+            self.remediation_threads.append(thread)
+
+        logger.info(f"Started {self.config['remediation_workers']} remediation workers")
+
+    def _start_priority_refresh(self):
+        """Keep the remediation priorities annotated on namespaces up to date"""
+        self._run_periodically(
+            "namespace priority refresh",
+            self.remediation_priorities.refresh,
+            self.config["namespace_priority_refresh_seconds"],
+            component="priorities",
+        )
+
+    def _start_prometheus_signals(self):
+        """Keep the Prometheus health signals of every workload up to date"""
+        if self.prometheus_signals is None or not self.prometheus_signals.queries:
+            return
+
+        self._run_periodically(
+            "Prometheus signals",
+            self.prometheus_signals.refresh,
+            self.config["prometheus_query_interval"],
+            component="prometheus",
+        )
+        logger.info(f"Querying Prometheus signals {sorted(self.prometheus_signals.queries)}")
+
+    def _start_helm_release_cache(self):
+        """Start watching Helm release Secrets and the pool that runs rollbacks"""
+        if not self.config["helm_rollback_enabled"]:
+            return
+
+        if self.config["helm_rollback_workers"] > 0 and self.engine is None:
+            self.helm_pool = ThreadPoolExecutor(
+                max_workers=self.config["helm_rollback_workers"], thread_name_prefix="helm-rollback"
+            )
+
+        if not self.config["helm_release_cache_enabled"]:
+            return
+
+        self.helm_cache = HelmReleaseCache()
+        self.helm_informer = Informer(
+            self.k8s_client.list_secret_for_all_namespaces,
+            self.helm_cache.on_event,
+            name="helm-release-informer",
+            watch_timeout=self.config["watch_timeout_seconds"],
+            page_size=self.config["pod_list_page_size"],
+            decoder=HelmRevisionCodec,
+            label_selector=RELEASE_SECRET_SELECTOR,
+        )
+        self.helm_informer.start()
+        logger.info("Helm release cache started")
+
+    def _remediation_worker(self):
+        """Process remediation keys until the queue shuts down"""
+        while True:
+            key = self.remediation_queue.get()
+            if key is None:
+                return
+            self._remediate_key(key)
+
+    def _remediate_key(self, key):
+        """Process a key taken off the remediation queue, re-queueing it with backoff if it fails"""
+        try:
+            self._process_remediation(key)
+            self.remediation_queue.forget(key)
+        except Exception as e:
+            logger.error(f"Remediation of {key} failed, retrying with backoff: {e}")
+            self.metrics.error("remediation")
+            self.remediation_queue.add_rate_limited(key)
+        finally:
+            self.remediation_queue.done(key)
+
+    def _dispatch_remediation(self, pod, handler):
+        """Queue a remediation for the workers, grouping pods by the workload that owns them"""
+        pod = as_pod_record(pod)
+        pod_key = pod.key
+        workload = self._resolve_workload(pod) if self._is_batchable(pod, handler) else None
+        key = workload.key if workload else pod_key
+
+        with self._pending_lock:
+            new_group = key not in self.pending_remediations
+            _, members = self.pending_remediations.setdefault(key, (workload, {}))
+            members[pod_key] = (handler, pod)
+
+        # Without a worker pool, pods are remediated inline and workload groups after each scan
+        if self.remediation_queue is None:
+            if workload is None:
+                self._process_remediation(key)
+            return
+
+        priority = self.remediation_priorities.tier(pod)
+        if workload is None:
+            self.remediation_queue.add(key, priority)
+        elif new_group:
+            # Give the rest of the workload's failing pods a window to join the group
+            self.remediation_queue.add_after(key, self.config["workload_batch_window"], priority)
+
+    def _is_batchable(self, pod, handler):
+        """Check if a pod's remediation may be folded into a restart of its whole workload"""
+        if handler == self._handle_degraded_pod:
+            # Degraded pods are Ready, so they are replaced one per workload per cooldown instead
+            return False
+        # A rollout restart would recreate pods that are only to be reported
+        return handler != self._handle_crash_looping_pod or not self._is_notify_only_crash_loop(pod)
+
+    def _flush_pending_remediations(self):
+        """Process every pending remediation inline when no worker pool is running"""
+        if self.remediation_queue is not None:
+            return
+
+        with self._pending_lock:
+            groups = [(key, list(members.values())) for key, (_, members) in self.pending_remediations.items()]
+
+        # Most urgent first, as the work queue would order them
+        groups.sort(key=lambda group: min(self.remediation_priorities.tier(pod) for _, pod in group[1]))
+        for key, _ in groups:
+            try:
+                self._process_remediation(key)
+            except Exception as e:
+                logger.error(f"Remediation of {key} failed: {e}")
+                self.metrics.error("remediation")
+
+    def _process_remediation(self, key):
+        """Remediate a pod, or a group of failing pods owned by one workload"""
+        with self._pending_lock:
+            workload, members = self.pending_remediations.pop(key, (None, {}))
+
+        # The shard may have moved to another replica, or the pod's node gone down, while the key was queued
+        members = {
+            pod_key: member
+            for pod_key, member in members.items()
+            if self._owns_namespace(member[1].namespace)
+            and self.cluster_index.node_ready(member[1].node_name) is not False
+        }
+        batched = workload is not None and len(members) >= self.config["workload_batch_min_pods"]
+        if members and not self._circuit_allows(members, workload if batched else None):
+            return
+
+        try:
+            if batched:
+                self._remediate_workload(workload, members)
+                return
+
+            for handler, pod in members.values():
+                handler(pod)
+        except Exception:
+            # Put the group back so the retry still sees its pods
+            with self._pending_lock:
+                _, pending = self.pending_remediations.setdefault(key, (workload, {}))
+                for pod_key, member in members.items():
+                    pending.setdefault(pod_key, member)
+            raise
+
+    def _circuit_allows(self, members, workload=None):
+        """Check if the circuit breaker lets a remediation of pods, or of the workload they batch into, through"""
+        if self.circuit_breaker is None:
+            return True
+
+        namespace = next(iter(members.values()))[1].namespace
+        if self.circuit_breaker.allow(namespace):
+            return True
+
+        # The pods stay failing, so a later scan dispatches them again
+        for action, namespace in self._remediation_actions(members, workload):
+            self.metrics.remediation(action, "circuit_open", namespace)
+        return False
+
+    def _remediation_actions(self, members, workload=None):
+        """List the (action, namespace) of the remediations a group would run, per pod or for its workload"""
+        helm_pods = [
+            pod
+            for handler, pod in members.values()
+            if handler == self._handle_pod_failure
+            and self.config["helm_rollback_enabled"]
+            and self._is_helm_managed_pod(pod)
+        ]
+        if workload is None:
+            actions = [("restart_pod", pod.namespace) for _, pod in members.values()]
+        else:
+            rollback = self.config["workload_remediation_action"] == "rollback" and workload.kind == "Deployment"
+            actions = [("rollback_workload" if rollback else "restart_workload", workload.namespace)]
+            # A workload group rolls its Helm release back once
+            helm_pods = helm_pods[:1]
+        return actions + [("helm_rollback", pod.namespace) for pod in helm_pods]
+
+    def _on_circuit_transition(self, namespace, old, new, ratio):
+        """Export a circuit breaker state change and tell the team when remediation pauses or resumes"""
+        scope = scope_label(namespace)
+        self.metrics.circuit_state.labels(scope=scope).set(STATE_VALUES[new])
+        self.metrics.circuit_transitions.labels(scope=scope, state=new).inc()
+
+        where = "the cluster" if namespace is None else f"namespace {namespace}"
+        if old == CLOSED:
+            action = (
+                "Failing pods are only observed"
+                if self.config["circuit_breaker_mode"] == "observe"
+                else f"Remediation is throttled to {self.config['circuit_breaker_throttle_per_minute']:g} per minute"
+            )
+            self._send_slack_notification(
+                f"🌩️ Failure Storm: {scope}",
+                f"{ratio:.0%} of pods in {where} failed within "
+                f"{self.config['circuit_breaker_window_seconds']}s. {action} until it subsides.",
+                group="circuit-breaker",
+            )
+        elif new == CLOSED:
+            self._send_slack_notification(
+                f"✅ Failure Storm Over: {scope}",
+                f"Failures in {where} dropped to {ratio:.0%}. Remediation resumed.",
+                group="circuit-breaker",
+            )
+
+    def _resolve_workload(self, pod):
+        """Get the workload owning a pod when workload batching is enabled"""
+        if not self.config["workload_batching_enabled"]:
+            return None
+
+        try:
+            return self.workload_resolver.resolve(pod)
+        except ApiException as e:
+            logger.error(f"Failed to resolve owner of pod {pod.key}: {e}")
+            return None
+
+    def _remediate_workload(self, workload, members):
+        """Handle a group of failing pods with one workload-level action"""
+        if not self.cooldowns.try_acquire(workload.key, self.config["pod_cooldown_seconds"]):
+            return
+        with self._restarted_lock:
+            self.restarted_workloads.setdefault(workload, set()).update(members)
+
+        logger.warning(f"{len(members)} failing pods detected for {workload.kind} {workload.namespace}/{workload.name}")
+        detected_at = self._detected_at(*members)
+        self._remediations_started += 1
+
+        self._send_slack_notification(
+            f"🚨 Workload Failure: {workload.name}",
+            f"{len(members)} pods of {workload.kind} {workload.name} in namespace {workload.namespace} are failing. "
+            f"Attempting {self.config['workload_remediation_action']}...",
+            group=workload.key,
+        )
+
+        if self.config["workload_remediation_action"] == "rollback" and workload.kind == "Deployment":
+            try:
+                with self.metrics.api_call("rollback", workload.kind.lower()):
+                    revision = rollback_deployment(self.apps_client, workload)
+            except ApiException:
+                self.metrics.remediation("rollback_workload", "failure", workload.namespace)
+                raise
+            if revision is not None:
+                logger.info(f"Rolled back {workload.kind} {workload.namespace}/{workload.name} to revision {revision}")
+                self.metrics.remediation("rollback_workload", "success", workload.namespace, detected_at)
+                return
+            logger.info(f"No previous revision for {workload.namespace}/{workload.name}, restarting instead")
+
+        try:
+            with self.metrics.api_call("patch", workload.kind.lower()):
+                restart_workload(self.apps_client, workload)
+        except ApiException:
+            self.metrics.remediation("restart_workload", "failure", workload.namespace)
+            raise
+        logger.info(f"Restarted {workload.kind} {workload.namespace}/{workload.name}")
+        self.metrics.remediation("restart_workload", "success", workload.namespace, detected_at)
+
+        # Roll back the owning Helm release once for the whole group
+        for handler, pod in members.values():
+            if handler == self._handle_pod_failure and self._is_helm_managed_pod(pod):
+                self._handle_helm_pod_failure(pod)
+                break
+
     def _start_pod_monitoring(self):
         """Start pod monitoring in a separate thread"""
+        if self.config["pod_watch_enabled"]:
+            self._start_pod_informer()
+            return
 
-        def monitor_pods():
-            while self.running:
-                try:
-                    self._check_pods()
-                    time.sleep(self.config["check_interval"])
-                except Exception as e:
-                    logger.error(f"Error in pod monitoring: {e}")
-                    time.sleep(10)
-
-        thread = threading.Thread(target=monitor_pods, daemon=True)
-        thread.start()
+        self._run_periodically(
+            "pod monitoring",
+            self._check_pods,
+            self.config["check_interval"],
+            retry_interval=10,
+            busy=self._pod_scan_busy,
+        )
         logger.info("Pod monitoring started")
 
+    def _pod_scan_busy(self):
+        """Check if the last pod scan cycle remediated anything or left remediations pending
+
+        Pods that are only held back, cooling down or reported do not count, so one chronically broken
+        pod does not keep scans at their shortest interval.
+        """
+        return self._last_scan_remediated or bool(self.pending_remediations)
+
+    def _start_pod_informer(self):
+        """Start watch-based pod monitoring backed by a local cache"""
+        self.pod_informer = Informer(
+            self.k8s_client.list_pod_for_all_namespaces,
+            self._on_pod_event,
+            name="pod-informer",
+            watch_timeout=self.config["watch_timeout_seconds"],
+            resync_period=self.config["informer_resync_period"],
+            page_size=self.config["pod_list_page_size"],
+            decoder=PodRecordCodec if self.config["pod_fast_path_enabled"] else None,
+            on_pass=self._finish_pod_checks,
+            **self._pod_list_selectors(),
+        )
+        self.pod_informer.start()
+        logger.info("Pod monitoring started (watch mode)")
+
+    def _on_pod_event(self, event_type, pod):
+        """Re-evaluate a pod when the informer reports a change"""
+        with self._check_lock:
+            if event_type == "DELETED":
+                pod_key = as_pod_record(pod).key
+                self._forget_pod_failure(pod_key)
+                self.restart_tracker.forget(pod_key)
+                self.cluster_index.remove_pod(pod_key)
+                return
+            informer = self.pod_informer
+            if informer is not None and informer.in_pass():
+                # A relist or resync delivers every pod; remediate once it is over, as a scan does
+                self._evaluate_pod(pod, self._deferred_pod_checks)
+                return
+            self._evaluate_pod(pod)
+            self._finish_pod_checks()
+
+    def _finish_pod_checks(self):
+        """Update the circuit breaker and remediate what pod checks found failing"""
+        with self._check_lock:
+            deferred, self._deferred_pod_checks = self._deferred_pod_checks, []
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.update()
+            for pod, handler in deferred:
+                self._dispatch_remediation(pod, handler)
+            self._flush_pending_remediations()
+            self._flush_node_incidents()
+
     def _start_node_monitoring(self):
         """Start node monitoring in a separate thread"""
-
-        def monitor_nodes():
-            while self.running:
-                try:
-                    self._check_nodes()
-                    time.sleep(self.config["check_interval"] * 2)  # Check nodes less frequently
-                except Exception as e:
-                    logger.error(f"Error in node monitoring: {e}")
-                    time.sleep(20)
-
-        thread = threading.Thread(target=monitor_nodes, daemon=True)
-        thread.start()
+        interval = self.config["check_interval"] * 2  # Check nodes less frequently
+        if self.config["node_lease_monitoring_enabled"]:
+            self._start_node_lease_monitoring()
+            # Heartbeats catch dead nodes; the full LIST only backs up kubelet-reported NotReady
+            interval = self.config["node_lease_resync_seconds"]
+
+        self._run_periodically(
+            "node monitoring", self._check_nodes, interval, retry_interval=20, busy=lambda: bool(self.node_failures)
+        )
         logger.info("Node monitoring started")
 
-    def _start_health_server(self):
-        """Start health check server"""
-        import threading
+    def _start_node_lease_monitoring(self):
+        """Start watching node heartbeat Leases and checking them for staleness"""
+        self.node_lease_informer = Informer(
+            self.coordination_client.list_namespaced_lease,
+            self._on_node_lease_event,
+            name="node-lease-informer",
+            watch_timeout=self.config["watch_timeout_seconds"],
+            namespace=NODE_LEASE_NAMESPACE,
+        )
+        self.node_lease_informer.start()
+
+        self._run_periodically(
+            "node lease monitoring",
+            self._check_node_leases,
+            self.config["node_lease_check_interval"],
+            component="node_lease",
+        )
+        logger.info("Node lease monitoring started")
+
+    def _on_node_lease_event(self, event_type, lease):
+        """Record a node heartbeat when the informer reports a lease change"""
+        node_name = lease.metadata.name
+        if event_type == "DELETED":
+            self.node_heartbeats.forget(node_name)
+            return
+
+        if self.node_heartbeats.observe(node_name, to_timestamp(lease.spec.renew_time)):
+            logger.info(f"Node {node_name} renewed its lease again")
+            self._update_node_state(node_name, None, False)
+
+    def _check_node_leases(self):
+        """Confirm nodes whose lease went stale and keep the readiness of the others fresh"""
+        start = time.perf_counter()
+        now = time.monotonic()
+
+        for node_name in self.node_heartbeats.stale(now):
+            self._confirm_node_down(node_name)
+
+        # A renewing lease is enough to consider a node alive, so pod checks need no node LIST
+        for node_name in self.node_heartbeats.alive(now):
+            self.cluster_index.touch_node(node_name, now)
+        self.cluster_index.mark_refreshed(now)
+
+        self._flush_node_incidents()
+        if self._is_leader():
+            self._schedule_reboots()
+        self.phases.record("nodes.leases", time.perf_counter() - start)
+
+    def _confirm_node_down(self, node_name):
+        """Read a node whose lease went stale and mark it down unless it is demonstrably alive"""
+        self.node_heartbeats.mark_checked(node_name)
+        try:
+            with self.metrics.api_call("get", "nodes"):
+                node = self.k8s_client.read_node(node_name)
+        except ApiException as e:
+            if e.status == 404:
+                # The node was removed and its lease will follow
+                self.node_heartbeats.forget(node_name)
+                return
+            logger.error(f"Failed to read node {node_name} with a stale lease: {e}")
+            self.metrics.error("node_lease")
+            return
+
+        if not self._is_node_heartbeat_lost(node):
+            return
+
+        logger.warning(f"Node {node_name} stopped renewing its lease")
+        self.node_heartbeats.mark_down(node_name)
+        self._update_node_state(node_name, node, True)
+        # Let a pod scan hold back the node's pods and raise the incident now rather than next interval
+        self.wake("pod monitoring")
+
+    def _is_node_heartbeat_lost(self, node):
+        """Check if a node with a stale lease has not reported a Ready status since its last renewal"""
+        node_name = node.metadata.name
+        for condition in node.status.conditions or []:
+            if condition.type != "Ready":
+                continue
+            if condition.status != "True":
+                return True
+            # Until a renewal was watched, a stale lease may only mean our clock is ahead of the kubelet's
+            if not self.node_heartbeats.seen_renewing(node_name):
+                return False
+            last_heartbeat = to_timestamp(condition.last_heartbeat_time)
+            renew_time = self.node_heartbeats.renew_time(node_name)
+            return last_heartbeat is None or last_heartbeat <= renew_time
+        return True
+
+    def _start_alert_receiver(self):
+        """Start checking the objects named by alerts Alertmanager pushes to the webhook"""
+        if not self.config["alert_webhook_enabled"]:
+            return
+        if not self.config["alert_webhook_token"]:
+            # Anyone reaching the health port could otherwise have arbitrary pods and nodes remediated
+            logger.error("Not starting the Alertmanager webhook receiver: ALERT_WEBHOOK_TOKEN is not set")
+            return
+
+        self.alert_receiver = AlertReceiver(
+            self._check_alert_target, token=self.config["alert_webhook_token"], metrics=self.metrics
+        )
+        self.alert_receiver.start()
+        logger.info("Alertmanager webhook receiver started")
+
+    def _check_alert_target(self, key):
+        """Check the object behind an alert's queue key right away instead of at the next scan"""
+        if key == SCAN_KEY:
+            self.wake("pod monitoring")
+            return
 
-        from flask import Flask, jsonify
+        kind, _, name = key.partition("/")
+        # A scan in progress finishes first, as both remediate inline and share the failure tracking
+        with self._check_lock:
+            if kind == "node":
+                self._check_node(name)
+                return
 
-        app = Flask(__name__)
+            namespace, _, name = name.partition("/")
+            if kind == "pod":
+                self._check_pod(namespace, name)
+            else:
+                self._check_workload(kind, namespace, name)
 
-        @app.route("/health")
-        def health():
-            return jsonify({"status": "healthy", "running": self.running})
+    def _check_pod(self, namespace, name):
+        """Evaluate one pod, read fresh from the API"""
+        try:
+            with self.metrics.api_call("get", "pods"):
+                pod = self.k8s_client.read_namespaced_pod(name, namespace)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            self._forget_pod_failure(f"{namespace}/{name}")
+            self.cluster_index.remove_pod(f"{namespace}/{name}")
+            return
+        self._on_pod_event("MODIFIED", pod)
+
+    def _check_workload(self, kind, namespace, name):
+        """Evaluate every pod of a Deployment, StatefulSet or DaemonSet"""
+        read = {
+            "deployment": self.apps_client.read_namespaced_deployment,
+            "statefulset": self.apps_client.read_namespaced_stateful_set,
+            "daemonset": self.apps_client.read_namespaced_daemon_set,
+        }[kind]
+        try:
+            with self.metrics.api_call("get", kind):
+                workload = read(name, namespace)
+        except ApiException as e:
+            if e.status == 404:
+                return
+            raise
 
-        @app.route("/ready")
-        def ready():
-            return jsonify({"status": "ready", "running": self.running})
+        selector = ",".join(f"{k}={v}" for k, v in sorted((workload.spec.selector.match_labels or {}).items()))
+        if not selector:
+            # Only matchExpressions; let a full scan find the pods
+            self.wake("pod monitoring")
+            return
 
-        @app.route("/metrics")
-        def metrics():
-            return jsonify(self.get_metrics())
+        with self.metrics.api_call("list", "pods"):
+            pods = self.k8s_client.list_namespaced_pod(namespace, label_selector=selector)
+        for pod in pods.items:
+            self._evaluate_pod(pod)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.update()
+        self._flush_pending_remediations()
+        self._flush_node_incidents()
+
+    def _check_node(self, name):
+        """Check one node, read fresh from the API"""
+        # Node handling is a singleton duty of the leader
+        if not self._is_leader():
+            return
 
-        def run_server():
-            app.run(host="0.0.0.0", port=8080)
+        try:
+            with self.metrics.api_call("get", "nodes"):
+                node = self.k8s_client.read_node(name)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            # The alert named the node some other way, such as by IP
+            self.wake("node monitoring")
+            return
 
-        thread = threading.Thread(target=run_server, daemon=True)
-        thread.start()
-        logger.info("Health server started on port 8080")
+        failing = self._is_node_failing(node) or self.node_heartbeats.is_down(name)
+        self._update_node_state(name, node, failing)
+        if failing:
+            self._handle_node_failure(node)
+            self._schedule_reboots()
+
+    def _start_health_server(self):
+        """Start health check server"""
+        post_handlers = {}
+        if self.alert_receiver is not None:
+            post_handlers["/webhooks/alertmanager"] = self.alert_receiver.handle
+        self.health_server = HealthServer(
+            self._endpoint_snapshots,
+            port=self.config["health_port"],
+            interval=self.config["health_snapshot_interval"],
+            post_handlers=post_handlers,
+        )
+        self.health_server.start()
+        logger.info(f"Health server started on port {self.config['health_port']}")
+
+    def _readiness(self):
+        """Check if every started cache has synced, returning the result and the state behind it"""
+        synced = {
+            informer.name: informer.has_synced()
+            for informer in (self.pod_informer, self.node_lease_informer, self.helm_informer)
+            if informer is not None
+        }
+        if not self.config["pod_watch_enabled"]:
+            synced["pod-scan"] = self.last_pod_scan_at is not None
+        return self.running and all(synced.values()), synced
+
+    def _endpoint_snapshots(self):
+        """Render the response of every HTTP endpoint from the current controller state"""
+        ready, synced = self._readiness()
+        body, content_type = self.metrics.exposition()
+        return {
+            "/health": json_snapshot({"status": "healthy", "running": self.running}),
+            "/ready": json_snapshot(
+                {"status": "ready" if ready else "not ready", "running": self.running, "synced": synced},
+                200 if ready else 503,
+            ),
+            "/metrics": (200, content_type, body),
+            "/debug/phases": json_snapshot({"enabled": self.phases.enabled, "phases": self.phases.snapshot()}),
+        }
 
     def _check_pods(self):
         """Check all pods for failures"""
-        try:
-            pods = self.k8s_client.list_pod_for_all_namespaces()
+        # Alert checks and watch events wait for a scan in progress
+        with self._check_lock:
+            self._scan_pods()
 
-            for pod in pods.items:
-                # Skip system pods and self-healing controller pods
-                if self._should_skip_pod(pod):
-                    continue
+    def _scan_pods(self):
+        """List and evaluate every pod, then remediate the failing ones"""
+        start = time.perf_counter()
+        try:
+            list_func = self.metrics.timed(self.k8s_client.list_pod_for_all_namespaces, "list", "pods")
+            if self.config["pod_fast_path_enabled"]:
+                # Parse the raw JSON into PodRecords instead of V1Pod models
+                list_func = raw_pod_lister(list_func, self.phases)
+
+            pages = list_pages(
+                list_func,
+                self.config["pod_list_page_size"],
+                **self._pod_list_selectors(),
+            )
 
-                # Check for pod failures
-                if self._is_pod_failing(pod):
-                    self._handle_pod_failure(pod)
-                elif self._is_pod_crash_looping(pod):
-                    self._handle_crash_looping_pod(pod)
+            failing = set()
+            # Remediations wait for the end of the sweep, so the circuit breaker sees every failing pod first
+            deferred = []
+            self.restart_tracker.start_sweep()
+            self.cluster_index.start_sweep()
+            for page in pages:
+                with self.phases.phase("pods.evaluate"):
+                    for pod in page.items:
+                        pod_key = self._evaluate_pod(pod, deferred)
+                        if pod_key:
+                            failing.add(pod_key)
+                # Release the page before the next one is fetched
+                del page
+
+            # Forget pods that recovered or disappeared since the last scan
+            for pod_key in list(self.pod_failures):
+                if pod_key not in failing:
+                    self._forget_pod_failure(pod_key)
+            self.restart_tracker.finish_sweep()
+            self.cluster_index.finish_sweep()
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.update()
+
+            with self.phases.phase("pods.remediate"):
+                for pod, handler in deferred:
+                    self._dispatch_remediation(pod, handler)
+                self._flush_pending_remediations()
+                self._flush_node_incidents()
+
+            # Remediations started since the previous scan, inline or by the workers in between
+            self._last_scan_remediated = self._remediations_started != self._remediations_at_last_scan
+            self._remediations_at_last_scan = self._remediations_started
+
+            elapsed = time.perf_counter() - start
+            self.metrics.scan_duration.labels(resource="pods").observe(elapsed)
+            self.phases.record("pods.scan", elapsed)
+            self.last_pod_scan_at = time.time()
+            self._log_phase_timings()
 
         except Exception as e:
             logger.error(f"Error checking pods: {e}")
+            self.metrics.error("pod_scan")
+
+    def _log_phase_timings(self):
+        """Log rolling phase percentiles as one structured line every log interval"""
+        if not self.phases.enabled:
+            return
+
+        now = time.monotonic()
+        if now - self._phases_logged_at < self.config["phase_timing_log_interval"]:
+            return
+
+        self._phases_logged_at = now
+        logger.info(json.dumps({"event": "phase_timings", "phases": self.phases.snapshot()}))
+
+    def _pod_list_selectors(self):
+        """Build the selectors that push pod filtering to the apiserver"""
+        field_selectors = [f"metadata.namespace!={namespace}" for namespace in self.config["excluded_namespaces"]]
+        field_selectors.append("status.phase!=Succeeded")
+
+        selectors = {"field_selector": ",".join(field_selectors)}
+        if self.config["pod_label_selector"]:
+            selectors["label_selector"] = self.config["pod_label_selector"]
+        return selectors
+
+    def _evaluate_pod(self, pod, deferred=None):
+        """Run failure detection on a single pod, returning its key if it is failing
+
+        Remediations are appended to deferred as (pod, handler) instead of being dispatched when it is given.
+        """
+        pod = as_pod_record(pod)
+
+        # Skip system pods and self-healing controller pods
+        if self._should_skip_pod(pod):
+            return None
+
+        # Leave namespaces sharded to other replicas alone
+        if not self._owns_namespace(pod.namespace):
+            return None
+
+        self.cluster_index.update_pod(pod)
+
+        # Check for pod failures
+        handler = None
+        crash_looping = self._is_pod_crash_looping(pod)
+        if (crash_looping or self._is_pod_failing(pod)) and self._is_notify_only_restart(pod):
+            # Deleting the pod would not help, however slowly it restarts in CrashLoopBackOff
+            self._record_pod_failure(pod, "crash_loop")
+            handler = self._handle_crash_looping_pod
+        elif self._is_pod_failing(pod):
+            self._record_pod_failure(pod, "failed")
+            if self._is_node_down(pod.node_name):
+                # Deleting pods cannot help until the node is dealt with
+                self._suppress_pod_remediation(pod)
+            else:
+                handler = self._handle_pod_failure
+        elif crash_looping:
+            self._record_pod_failure(pod, "crash_loop")
+            handler = self._handle_crash_looping_pod
+        elif self._signal_breaches(pod):
+            self._record_pod_failure(pod, "degraded")
+            handler = self._handle_degraded_pod
+        else:
+            self._forget_pod_failure(pod.key)
+            self._note_restarted_workload_pod(pod, failing=False)
+            self._forget_degraded_owner(pod)
+            return None
+
+        if handler is not None:
+            if self.circuit_breaker is not None:
+                if handler == self._handle_degraded_pod:
+                    # A workload-wide signal marks all its pods at once, which is no storm of broken pods
+                    self.circuit_breaker.mark_recovered(pod.key)
+                else:
+                    self.circuit_breaker.mark_failing(pod.key, pod.namespace)
+            if deferred is None:
+                self._dispatch_remediation(pod, handler)
+            else:
+                deferred.append((pod, handler))
+        return pod.key
+
+    def _is_node_down(self, node_name):
+        """Check if a node is NotReady, reading it when its known state is missing or stale"""
+        if not node_name:
+            return False
+
+        ready = self.cluster_index.node_ready(node_name)
+        if ready is None and self.cluster_index.needs_refresh():
+            # One LIST refreshes every node, instead of a read per failing pod
+            try:
+                self._refresh_nodes(handle_failures=False)
+            except ApiException as e:
+                logger.error(f"Failed to refresh node states: {e}")
+                self.metrics.error("node_scan")
+            ready = self.cluster_index.node_ready(node_name)
+        return ready is False
+
+    def _refresh_nodes(self, handle_failures=True):
+        """List all nodes into the cluster index, optionally handling the failing ones"""
+        self.cluster_index.mark_refreshed()
+        with self.metrics.api_call("list", "nodes"):
+            nodes = self.k8s_client.list_node()
+
+        self.reboot_scheduler.set_zones({node.metadata.name: self._node_zone(node) for node in nodes.items})
+        for node in nodes.items:
+            # A node that lost its lease stays down until it renews it, whatever its last status says
+            failing = self._is_node_failing(node) or self.node_heartbeats.is_down(node.metadata.name)
+            self._update_node_state(node.metadata.name, node, failing)
+            if failing and handle_failures:
+                self._handle_node_failure(node)
+
+    def _flush_node_incidents(self):
+        """Raise the incident for nodes found down by pod checks, once their pods have been indexed"""
+        if not self.node_failures or not self._is_leader():
+            return
+
+        for failure in list(self.node_failures.values()):
+            if failure.get("node") is not None:
+                self._handle_node_failure(failure["node"])
+
+    def _suppress_pod_remediation(self, pod):
+        """Hold back remediation of a pod whose node is down"""
+        if self.cluster_index.suppress(pod.node_name, pod.key):
+            logger.info(f"Suppressing remediation of {pod.key}: node {pod.node_name} is NotReady")
+            self.metrics.remediation("restart_pod", "suppressed", pod.namespace)
+
+    def _record_pod_failure(self, pod, reason):
+        """Track a failing pod, counting it once when it starts failing"""
+        if pod.key in self.pod_failures:
+            return
+
+        self.pod_failures[pod.key] = {"namespace": pod.namespace, "reason": reason, "detected_at": time.monotonic()}
+        self.metrics.pod_failures.labels(namespace=pod.namespace, reason=reason).inc()
+        self._note_restarted_workload_pod(pod, failing=True)
+
+    def _forget_pod_failure(self, pod_key):
+        """Stop tracking a pod that recovered or went away"""
+        if self.pod_failures.pop(pod_key, None) is not None:
+            # A later failure is a new incident, so it does not inherit this one's backoff
+            self.cooldowns.reset(pod_key)
+            if self.restarted_workloads:
+                with self._restarted_lock:
+                    for failing in self.restarted_workloads.values():
+                        failing.discard(pod_key)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.mark_recovered(pod_key)
+
+    def _note_restarted_workload_pod(self, pod, failing):
+        """Track the pods of a workload restarted as a group, resetting its cooldown once it has recovered
+
+        The workload has recovered when one of its pods is Ready while none of them is failing.
+        """
+        if not self.restarted_workloads:
+            return
+        with self._restarted_lock:
+            if not any(workload.namespace == pod.namespace for workload in self.restarted_workloads):
+                return
+        workload = self._resolve_workload(pod)
+        with self._restarted_lock:
+            failing_pods = self.restarted_workloads.get(workload) if workload else None
+            if failing_pods is None:
+                return
+            if failing:
+                failing_pods.add(pod.key)
+                return
+            if failing_pods:
+                return
+            del self.restarted_workloads[workload]
+        self.cooldowns.reset(workload.key)
+
+    def _detected_at(self, *keys):
+        """Get when the earliest of the given failures was first detected"""
+        times = [self.pod_failures[key]["detected_at"] for key in keys if key in self.pod_failures]
+        return min(times) if times else None
 
     def _should_skip_pod(self, pod):
         """Check if pod should be skipped"""
-        namespace = pod.metadata.namespace
-        pod_name = pod.metadata.name
+        pod = as_pod_record(pod)
+        namespace = pod.namespace
+        pod_name = pod.name
 
         # Skip system namespaces
-        if namespace in ["kube-system", "monitoring", "chaos-engineering", "self-healing"]:
+        if namespace in self.config["excluded_namespaces"]:
             return True
 
         # Skip self-healing controller pods
@@ -168,50 +1288,69 @@ class SelfHealingController:
             return True
 
         # Skip pods that are being terminated
-        if pod.metadata.deletion_timestamp:
+        if pod.deletion_timestamp:
+            return True
+
+        # Skip pods that ran to completion
+        if pod.phase == "Succeeded":
             return True
 
         return False
 
     def _is_pod_failing(self, pod):
         """Check if pod is in a failed state"""
-        if pod.status.phase in ["Failed", "Unknown"]:
+        pod = as_pod_record(pod)
+        if pod.phase in ["Failed", "Unknown"]:
             return True
 
-        if pod.status.conditions:
-            for condition in pod.status.conditions:
-                if condition.type == "Ready" and condition.status == "False":
-                    return True
-
-        return False
+        return pod.ready == "False"
 
     def _is_pod_crash_looping(self, pod):
-        """Check if pod is crash looping"""
-        if pod.status.container_statuses:
-            for container in pod.status.container_statuses:
-                if container.restart_count > self.config["pod_failure_threshold"]:
-                    return True
-        return False
+        """Check if any container restarted more than the threshold inside the crash-loop window"""
+        pod = as_pod_record(pod)
+        return self.restart_tracker.is_crash_looping(pod.key, pod.restart_counts, pod.last_terminations)
+
+    def _is_notify_only_crash_loop(self, pod):
+        """Check if a pod's containers last exited for a reason recreating the pod cannot fix, such as OOMKilled"""
+        return self._termination_reason(pod) in self.config["crash_loop_notify_only_reasons"]
+
+    def _is_notify_only_restart(self, pod):
+        """Check if a pod restarted and last exited for a notify-only reason, whatever its restart rate"""
+        return any(as_pod_record(pod).restart_counts) and self._is_notify_only_crash_loop(pod)
+
+    def _signal_breaches(self, pod):
+        """Get the cached Prometheus signals of a pod's workload that are above their thresholds"""
+        if self.prometheus_signals is None:
+            return []
+        owner = self.cluster_index.pod_owner(pod.key)
+        return self.prometheus_signals.breaches(owner) if owner else []
+
+    def _termination_reason(self, pod):
+        """Get why the most recently terminated container of a pod last exited"""
+        latest = None
+        for termination in as_pod_record(pod).last_terminations:
+            if termination and (latest is None or (termination[1] or 0) > (latest[1] or 0)):
+                latest = termination
+        return latest[0] if latest else None
 
     def _handle_pod_failure(self, pod):
         """Handle pod failure by attempting recovery"""
-        pod_name = pod.metadata.name
-        namespace = pod.metadata.namespace
-        pod_key = f"{namespace}/{pod_name}"
-
-        # Check if we've already handled this pod recently
-        current_time = time.time()
-        if pod_key in self.last_check:
-            if current_time - self.last_check[pod_key] < 60:  # Wait 60 seconds between checks
-                return
+        pod = as_pod_record(pod)
+        pod_name = pod.name
+        namespace = pod.namespace
+        pod_key = pod.key
 
-        self.last_check[pod_key] = current_time
+        # Check if we've already handled this pod recently (backs off on repeated failures)
+        if not self.cooldowns.try_acquire(pod_key, self.config["pod_cooldown_seconds"]):
+            return
 
         logger.warning(f"Pod failure detected: {pod_key}")
 
         # Send notification
         self._send_slack_notification(
-            f"🚨 Pod Failure: {pod_name}", f"Pod {pod_name} in namespace {namespace} has failed. Attempting recovery..."
+            f"🚨 Pod Failure: {pod_name}",
+            f"Pod {pod_name} in namespace {namespace} has failed. Attempting recovery...",
+            group=self._notification_group(pod),
         )
 
         # Attempt pod restart
@@ -221,104 +1360,263 @@ class SelfHealingController:
         if self._is_helm_managed_pod(pod):
             self._handle_helm_pod_failure(pod)
 
+    def _notification_group(self, pod):
+        """Group a pod's notifications by its workload, or its namespace if it has none"""
+        return owner_key(pod) or f"namespace/{pod.namespace}"
+
     def _handle_crash_looping_pod(self, pod):
         """Handle crash looping pod"""
-        pod_name = pod.metadata.name
-        namespace = pod.metadata.namespace
-        pod_key = f"{namespace}/{pod_name}"
-
-        # Check if we've already handled this pod recently
-        current_time = time.time()
-        if pod_key in self.last_check:
-            if current_time - self.last_check[pod_key] < 60:  # Wait 60 seconds between checks
-                return
+        pod = as_pod_record(pod)
+        pod_name = pod.name
+        namespace = pod.namespace
+        pod_key = pod.key
 
-        self.last_check[pod_key] = current_time
+        # Check if we've already handled this pod recently (backs off on repeated failures)
+        if not self.cooldowns.try_acquire(pod_key, self.config["pod_cooldown_seconds"]):
+            return
+
+        reason = self._termination_reason(pod)
+        logger.warning(f"Crash looping pod detected: {pod_key} (last exit: {reason})")
 
-        logger.warning(f"Crash looping pod detected: {pod_key}")
+        # Recreating the pod cannot fix e.g. an OOMKilled container, so only report it
+        if self._is_notify_only_crash_loop(pod):
+            self._send_slack_notification(
+                f"🔄 Crash Looping Pod: {pod_name}",
+                f"Pod {pod_name} in namespace {namespace} is crash looping ({reason}). "
+                "Not restarting it, as that would not help.",
+                group=self._notification_group(pod),
+            )
+            self.metrics.remediation("restart_pod", "skipped", namespace)
+            return
 
         # Send notification
         self._send_slack_notification(
             f"🔄 Crash Looping Pod: {pod_name}",
-            f"Pod {pod_name} in namespace {namespace} is crash looping. Attempting recovery...",
+            f"Pod {pod_name} in namespace {namespace} is crash looping ({reason or 'unknown'}). "
+            "Attempting recovery...",
+            group=self._notification_group(pod),
         )
 
         # Attempt pod restart
         self._restart_pod(pod)
 
+    def _handle_degraded_pod(self, pod):
+        """Handle a Ready pod whose workload Prometheus reports as unhealthy"""
+        pod = as_pod_record(pod)
+        breaches = self._signal_breaches(pod)
+        # The signals may have recovered while the pod was queued
+        if not breaches:
+            return
+
+        # One pod of a workload per cooldown, so a degraded workload is never deleted all at once
+        owner = self.cluster_index.pod_owner(pod.key)
+        if not self.cooldowns.try_acquire(f"degraded/{owner}", self.config["pod_cooldown_seconds"]):
+            return
+        self.degraded_owners.add(owner)
+
+        signals = ", ".join(f"{name} {value:.3g} > {threshold:g}" for name, value, threshold in breaches)
+        logger.warning(f"Degraded pod detected: {pod.key} ({signals})")
+
+        self._send_slack_notification(
+            f"📉 Degraded Pod: {pod.name}",
+            f"Pod {pod.name} in namespace {pod.namespace} is Ready, but its workload is unhealthy ({signals}). "
+            "Attempting recovery...",
+            group=self._notification_group(pod),
+        )
+
+        self._restart_pod(pod)
+
+    def _forget_degraded_owner(self, pod):
+        """Reset the degraded cooldown of a healthy pod's owner once its signals no longer breach"""
+        if not self.degraded_owners:
+            return
+        owner = self.cluster_index.pod_owner(pod.key)
+        if owner in self.degraded_owners:
+            self.degraded_owners.discard(owner)
+            self.cooldowns.reset(f"degraded/{owner}")
+
     def _restart_pod(self, pod):
         """Restart a pod by deleting it"""
+        pod = as_pod_record(pod)
+        self._remediations_started += 1
         try:
-            self.k8s_client.delete_namespaced_pod(
-                name=pod.metadata.name,
-                namespace=pod.metadata.namespace,
-                grace_period_seconds=0,  # Force delete immediately
-            )
-            logger.info(f"Restarted pod: {pod.metadata.namespace}/{pod.metadata.name}")
+            with self.metrics.api_call("delete", "pods"):
+                self.k8s_client.delete_namespaced_pod(
+                    name=pod.name,
+                    namespace=pod.namespace,
+                    grace_period_seconds=0,  # Force delete immediately
+                )
+            logger.info(f"Restarted pod: {pod.key}")
+            self.metrics.remediation("restart_pod", "success", pod.namespace, self._detected_at(pod.key))
         except ApiException as e:
             if e.status == 404:
-                logger.info(f"Pod {pod.metadata.name} already deleted")
+                logger.info(f"Pod {pod.name} already deleted")
+                self.metrics.remediation("restart_pod", "not_found", pod.namespace)
             else:
-                logger.error(f"Failed to restart pod {pod.metadata.name}: {e}")
+                logger.error(f"Failed to restart pod {pod.name}: {e}")
+                self.metrics.remediation("restart_pod", "failure", pod.namespace)
 
     def _is_helm_managed_pod(self, pod):
         """Check if pod is managed by Helm"""
-        if pod.metadata.labels:
-            return "app.kubernetes.io/managed-by" in pod.metadata.labels
-        return False
+        pod = as_pod_record(pod)
+        return "app.kubernetes.io/managed-by" in pod.labels
 
     def _handle_helm_pod_failure(self, pod):
         """Handle failure of Helm-managed pod"""
         if not self.config["helm_rollback_enabled"]:
             return
 
+        pod = as_pod_record(pod)
+
         # Extract Helm release name from pod labels
-        release_name = pod.metadata.labels.get("app.kubernetes.io/instance")
+        release_name = pod.labels.get("app.kubernetes.io/instance")
         if not release_name:
             return
 
-        logger.info(f"Attempting Helm rollback for release: {release_name}")
+        release_key = f"{pod.namespace}/{release_name}"
+        revision = None
+        if self.helm_cache is not None and self.helm_informer.has_synced():
+            # Decide from the cached release Secrets instead of asking helm
+            revision, reason = self.helm_cache.start_rollback(pod.namespace, release_name)
+            if revision is None:
+                logger.info(f"Not rolling back Helm release {release_key}: {reason}")
+                self.metrics.remediation("helm_rollback", "skipped", pod.namespace)
+                return
+
+        # Many pods of one release fail together; roll it back once
+        with self._helm_lock:
+            if release_key in self._helm_in_flight:
+                self.metrics.remediation("helm_rollback", "deduplicated", pod.namespace)
+                return
+            self._helm_in_flight.add(release_key)
 
-        # Perform Helm rollback
+        logger.info(f"Attempting Helm rollback for release: {release_name}")
+        release = self.helm_releases.setdefault(
+            release_key, {"namespace": pod.namespace, "release": release_name, "rollbacks": 0}
+        )
+        release["rollbacks"] += 1
+        release["last_rollback"] = time.time()
+        release["status"] = "running"
+        detected_at = self._detected_at(pod.key)
+
+        if self.engine is not None:
+            self.engine.spawn(self.engine.run_helm_rollback(release, revision, detected_at))
+        elif self.helm_pool is None:
+            self._run_helm_rollback(release, revision, detected_at)
+        else:
+            self.helm_pool.submit(self._run_helm_rollback, release, revision, detected_at)
+
+    def _helm_rollback_command(self, release, revision):
+        """Build the helm command rolling back a release, to a given revision or else the previous one"""
+        command = ["helm", "rollback", release["release"]]
+        if revision is not None:
+            command.append(str(revision))
+        return command + ["--namespace", release["namespace"]]
+
+    def _run_helm_rollback(self, release, revision, detected_at):
+        """Roll back a Helm release, to a given revision or else the previous one"""
         try:
-            result = subprocess.run(
-                ["helm", "rollback", release_name, "--namespace", pod.metadata.namespace],
-                capture_output=True,
-                text=True,
-                timeout=self.config["helm_rollback_timeout"],
-            )
+            with self.phases.phase("helm.rollback"):
+                result = subprocess.run(
+                    self._helm_rollback_command(release, revision),
+                    capture_output=True,
+                    text=True,
+                    timeout=self.config["helm_rollback_timeout"],
+                )
+            self._finish_helm_rollback(release, detected_at, result.returncode, result.stderr)
+        except subprocess.TimeoutExpired:
+            self._finish_helm_rollback(release, detected_at, timed_out=True)
+        except Exception as e:
+            self._finish_helm_rollback(release, detected_at, error=e)
 
-            if result.returncode == 0:
+    def _finish_helm_rollback(self, release, detected_at, returncode=None, stderr="", timed_out=False, error=None):
+        """Report how a Helm rollback ended and release its claim on the release"""
+        release_name = release["release"]
+        namespace = release["namespace"]
+
+        try:
+            if error is not None:
+                logger.error(f"Unexpected error during Helm rollback: {error}")
+                release["status"] = "error"
+                self.metrics.remediation("helm_rollback", "error", namespace)
+                self.metrics.error("helm")
+            elif timed_out:
+                logger.error(f"Helm rollback timed out for release: {release_name}")
+                release["status"] = "timeout"
+                self.metrics.remediation("helm_rollback", "timeout", namespace)
+                self._send_slack_notification(
+                    f"⏰ Helm Rollback Timeout: {release_name}",
+                    f"Helm rollback timed out for release {release_name}",
+                    group=f"helm/{namespace}/{release_name}",
+                )
+            elif returncode == 0:
                 logger.info(f"Successfully rolled back Helm release: {release_name}")
+                release["status"] = "success"
+                self.metrics.remediation("helm_rollback", "success", namespace, detected_at)
                 self._send_slack_notification(
                     f"✅ Helm Rollback: {release_name}",
-                    f"Successfully rolled back Helm release {release_name} in namespace {pod.metadata.namespace}",
+                    f"Successfully rolled back Helm release {release_name} in namespace {namespace}",
+                    group=f"helm/{namespace}/{release_name}",
                 )
             else:
-                logger.error(f"Failed to rollback Helm release {release_name}: {result.stderr}")
+                logger.error(f"Failed to rollback Helm release {release_name}: {stderr}")
+                release["status"] = "failure"
+                self.metrics.remediation("helm_rollback", "failure", namespace)
                 self._send_slack_notification(
                     f"❌ Helm Rollback Failed: {release_name}",
-                    f"Failed to rollback Helm release {release_name}: {result.stderr}",
+                    f"Failed to rollback Helm release {release_name}: {stderr}",
+                    group=f"helm/{namespace}/{release_name}",
                 )
-        except subprocess.TimeoutExpired:
-            logger.error(f"Helm rollback timed out for release: {release_name}")
-            self._send_slack_notification(
-                f"⏰ Helm Rollback Timeout: {release_name}", f"Helm rollback timed out for release {release_name}"
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error during Helm rollback: {e}")
+        finally:
+            with self._helm_lock:
+                self._helm_in_flight.discard(f"{namespace}/{release_name}")
+            if self.helm_cache is not None and release["status"] != "success":
+                self.helm_cache.abandon_rollback(namespace, release_name)
 
     def _check_nodes(self):
         """Check all nodes for failures"""
+        # Node handling is a singleton duty of the leader
+        if not self._is_leader():
+            return
+
+        start = time.perf_counter()
         try:
-            nodes = self.k8s_client.list_node()
+            self._refresh_nodes()
+            self._schedule_reboots()
 
-            for node in nodes.items:
-                if self._is_node_failing(node):
-                    self._handle_node_failure(node)
+            elapsed = time.perf_counter() - start
+            self.metrics.scan_duration.labels(resource="nodes").observe(elapsed)
+            self.phases.record("nodes.scan", elapsed)
 
         except Exception as e:
             logger.error(f"Error checking nodes: {e}")
+            self.metrics.error("node_scan")
+
+    def _update_node_state(self, node_name, node, failing):
+        """Record a node's readiness in the cluster index and failure tracking"""
+        changed = self.cluster_index.set_node_ready(node_name, not failing)
+        if failing:
+            self._record_node_failure(node)
+        else:
+            self.node_failures.pop(node_name, None)
+            if changed:
+                logger.info(f"Node {node_name} is Ready again, resuming pod remediation on it")
+                self.cooldowns.reset(f"node/{node_name}")
+            # Not only on the transition: the reboot may have been restored from a previous leader's state
+            self._complete_reboot(node_name)
+
+    def _complete_reboot(self, node_name):
+        """Release the reboot budget held for a node that is Ready"""
+        if self._is_leader() and self.reboot_scheduler.complete(node_name):
+            logger.info(f"Released the reboot budget held for node {node_name}")
+
+    def _record_node_failure(self, node):
+        """Track a failing node, counting it once when it starts failing"""
+        if node.metadata.name in self.node_failures:
+            return
+
+        self.node_failures[node.metadata.name] = {"detected_at": time.monotonic(), "node": node}
+        self.metrics.node_failures.inc()
 
     def _is_node_failing(self, node):
         """Check if node is in a failed state"""
@@ -333,41 +1631,121 @@ class SelfHealingController:
         node_name = node.metadata.name
         node_key = f"node/{node_name}"
 
-        # Check if we've already handled this node recently
-        current_time = time.time()
-        if node_key in self.last_check:
-            if current_time - self.last_check[node_key] < 300:  # Wait 5 minutes between checks
-                return
-
-        self.last_check[node_key] = current_time
+        # Check if we've already handled this node recently (backs off on repeated failures)
+        if not self.cooldowns.try_acquire(node_key, self.config["node_cooldown_seconds"]):
+            return
 
-        logger.warning(f"Node failure detected: {node_name}")
+        affected_pods = self.cluster_index.pods_on_node(node_name)
+        affected_workloads = self.cluster_index.owners_on_node(node_name)
+        logger.warning(f"Node failure detected: {node_name} ({len(affected_pods)} pods affected)")
 
-        # Send notification
+        # One correlated incident instead of a notification per pod on the node
         self._send_slack_notification(
-            f"🚨 Node Failure: {node_name}", f"Node {node_name} has failed. Triggering reboot..."
+            f"🚨 Node Failure: {node_name}",
+            f"Node {node_name} has failed. {len(affected_pods)} pods of {len(affected_workloads)} workloads "
+            "run on it; their remediation is suppressed until the node recovers. Queueing reboot...",
+            group=f"node/{node_name}",
         )
 
-        # Trigger node reboot via Kured
+        # Trigger node reboot via Kured, within the disruption budget
         if self.config["kured_integration_enabled"]:
-            self._trigger_node_reboot(node)
+            self._request_node_reboot(node)
+
+    def _node_zone(self, node):
+        """Get the zone a node belongs to for the reboot budget"""
+        return (node.metadata.labels or {}).get(self.config["node_zone_label"], "")
+
+    def _node_down_since(self, node):
+        """Get when a node went NotReady (epoch seconds), falling back to now"""
+        for condition in node.status.conditions or []:
+            if condition.type == "Ready":
+                down_since = to_timestamp(condition.last_transition_time)
+                if down_since is not None:
+                    return down_since
+        return time.time()
+
+    def _request_node_reboot(self, node):
+        """Queue a node for reboot and start whatever reboots the budget allows"""
+        node_name = node.metadata.name
+        if not self.reboot_scheduler.loaded:
+            self.reboot_scheduler.load()
+        if self.reboot_scheduler.request(node_name, self._node_zone(node), self._node_down_since(node)):
+            self.metrics.remediation("node_reboot", "queued")
+        self._schedule_reboots()
+
+    def _schedule_reboots(self):
+        """Reboot the longest-down nodes the disruption budget allows right now"""
+        if not self.config["kured_integration_enabled"] or not self._is_leader():
+            return
+
+        if not self.reboot_scheduler.loaded:
+            self.reboot_scheduler.load()
+
+        # Restored reboots of nodes that recovered while no replica was leading would hold the budget
+        for node_name in self.reboot_scheduler.nodes():
+            if self.cluster_index.node_ready(node_name):
+                self._complete_reboot(node_name)
+
+        for node_name in self.reboot_scheduler.due():
+            self._trigger_node_reboot(node_name)
 
-    def _trigger_node_reboot(self, node):
+    def _trigger_node_reboot(self, node_name):
         """Trigger node reboot using Kured"""
+        if not self._is_leader():
+            return
+
+        # The node may have recovered since it was queued, possibly under a previous leader
+        try:
+            with self.metrics.api_call("get", "nodes"):
+                node = self.k8s_client.read_node(node_name)
+        except ApiException as e:
+            if e.status != 404:
+                logger.error(f"Failed to read node {node_name} before rebooting it: {e}")
+                self.metrics.remediation("node_reboot", "failure")
+                self.reboot_scheduler.abort(node_name)
+                return
+            node = None
+
+        if node is None or not (self._is_node_failing(node) or self.node_heartbeats.is_down(node_name)):
+            logger.info(f"Node {node_name} is no longer NotReady, dropping its reboot")
+            self.metrics.remediation("node_reboot", "skipped")
+            if node is None:
+                self._complete_reboot(node_name)
+            else:
+                self._update_node_state(node_name, node, False)
+            return
+
         try:
             # Annotate node to trigger Kured reboot
-            self.k8s_client.patch_node(
-                name=node.metadata.name, body={"metadata": {"annotations": {"weave.works/kured-node-lock": ""}}}
-            )
-            logger.info(f"Triggered reboot for node: {node.metadata.name}")
+            with self.metrics.api_call("patch", "nodes"):
+                self.k8s_client.patch_node(
+                    name=node_name, body={"metadata": {"annotations": {"weave.works/kured-node-lock": ""}}}
+                )
+            logger.info(f"Triggered reboot for node: {node_name}")
+            detected_at = (self.node_failures.get(node_name) or {}).get("detected_at")
+            self.metrics.remediation("node_reboot", "success", detected_at=detected_at)
         except ApiException as e:
-            logger.error(f"Failed to trigger reboot for node {node.metadata.name}: {e}")
+            logger.error(f"Failed to trigger reboot for node {node_name}: {e}")
+            self.metrics.remediation("node_reboot", "failure")
+            self.reboot_scheduler.abort(node_name)
 
-    def _send_slack_notification(self, title, message):
-        """Send notification to Slack"""
+    def _send_slack_notification(self, title, message, group=None):
+        """Send notification to Slack, coalesced with others of the same group when sent in the background"""
         if not self.config["slack_notifications_enabled"] or not self.config["slack_webhook_url"]:
             return
 
+        if self.slack_notifier is not None:
+            self.slack_notifier.notify(title, message, group)
+            return
+
+        if self.engine is not None:
+            self.engine.submit("slack", self._post_slack_notification, title, message)
+            return
+
+        self._post_slack_notification(title, message)
+
+    def _post_slack_notification(self, title, message):
+        """Post one notification to the Slack webhook"""
         payload = {
             "channel": self.config["slack_channel"],
             "text": f"*{title}*\n{message}",
@@ -376,13 +1754,16 @@ class SelfHealingController:
         }
 
         try:
-            response = requests.post(self.config["slack_webhook_url"], json=payload, timeout=10)
+            with self.phases.phase("slack.post"):
+                response = requests.post(self.config["slack_webhook_url"], json=payload, timeout=10)
             if response.status_code == 200:
                 logger.info("Slack notification sent successfully")
             else:
                 logger.error(f"Failed to send Slack notification: {response.status_code}")
+                self.metrics.error("slack")
         except Exception as e:
             logger.error(f"Error sending Slack notification: {e}")
+            self.metrics.error("slack")
 
     def get_metrics(self):
         """Get metrics for monitoring"""
@@ -390,26 +1771,88 @@ class SelfHealingController:
             "pod_failures": len(self.pod_failures),
             "node_failures": len(self.node_failures),
             "helm_rollbacks": len(self.helm_releases),
+            "helm_rollbacks_in_flight": len(self._helm_in_flight),
+            "notifications_queued": len(self.slack_notifier) if self.slack_notifier else 0,
+            "notifications_dropped": self.slack_notifier.dropped if self.slack_notifier else 0,
+            "helm_releases_cached": len(self.helm_cache) if self.helm_cache else 0,
             "running": self.running,
-            "last_checks": len(self.last_check),
+            "last_checks": len(self.cooldowns),
+            "restart_tracked_pods": len(self.restart_tracker),
+            "nodes_not_ready": len(self.cluster_index.down_nodes()),
+            "suppressed_pods": self.cluster_index.suppressed_count(),
+            "node_leases": len(self.node_heartbeats),
+            "reboots_pending": self.reboot_scheduler.snapshot()["pending"],
+            "reboots_in_flight": self.reboot_scheduler.snapshot()["in_flight"],
+            "pod_cache_size": len(self.pod_informer.cache) if self.pod_informer else 0,
+            "remediation_queue_depth": len(self.remediation_queue) if self.remediation_queue else 0,
+            "alert_checks_queued": len(self.alert_receiver) if self.alert_receiver else 0,
+            "prometheus_signal_workloads": len(self.prometheus_signals) if self.prometheus_signals else 0,
+            "circuit_breakers_open": len(self.circuit_breaker.states()) if self.circuit_breaker else 0,
+            "engine_tasks": len(self.engine) if self.engine is not None else 0,
+            "is_leader": self._is_leader(),
+            "shard_members": len(self.shard_membership.ring.members) if self.shard_membership else 1,
         }
 
     def stop(self):
-        """Stop the controller"""
+        """Stop the controller, letting remediations in progress finish within the shutdown grace period"""
         self.running = False
+        self.scheduler.stop()
+        if self.engine is not None:
+            self.engine.stop()
+        if self.pod_informer:
+            self.pod_informer.stop()
+        if self.node_lease_informer:
+            self.node_lease_informer.stop()
+        if self.helm_informer:
+            self.helm_informer.stop()
+        if self.helm_pool:
+            self.helm_pool.shutdown(wait=False)
+        if self.slack_notifier:
+            self.slack_notifier.stop()
+        if self.health_server:
+            self.health_server.stop()
+        if self.alert_receiver:
+            self.alert_receiver.stop()
+        if self.remediation_queue:
+            self.remediation_queue.shut_down()
+            self._drain_remediation_workers()
+        if self.leader_lock:
+            self.leader_lock.release()
+        if self.shard_membership:
+            self.shard_membership.leave()
+        if self.event_recorder:
+            self.event_recorder.close()
         logger.info("Self-Healing Controller stopped")
 
+    def _drain_remediation_workers(self):
+        """Wait for the remediation workers to finish the keys they hold"""
+        deadline = time.monotonic() + self.config["shutdown_grace_seconds"]
+        for thread in self.remediation_threads:
+            if thread is not threading.current_thread():
+                thread.join(max(0, deadline - time.monotonic()))
+
+        busy = [thread.name for thread in self.remediation_threads if thread.is_alive()]
+        if busy:
+            logger.warning(f"Stopping with remediations still in progress on {', '.join(busy)}")
+
 
 def main():
     """Main function to start the Self-Healing Controller"""
     controller = SelfHealingController()
 
+    if controller.config["controller_engine"] == "asyncio":
+        logger.info("Running on the asyncio engine")
+        asyncio.run(AsyncEngine(controller).run())
+        return
+
+    # Kubernetes stops pods with SIGTERM; stop cleanly instead of dying mid-remediation
+    signal.signal(signal.SIGTERM, lambda signum, frame: controller.stop())
+
     try:
         controller.start_monitoring()
 
-        # Keep the main thread alive
-        while controller.running:
-            time.sleep(1)
+        # Keep the main thread alive until stop() is called
+        controller.scheduler.wait()
 
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
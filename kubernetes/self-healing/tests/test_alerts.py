@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Alertmanager webhook receiver
+"""
+
+import http.client
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from alerts import SCAN_KEY, AlertReceiver, alert_targets, payload_targets  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+
+
+def webhook(*alerts, status="firing"):
+    """Build a grouped Alertmanager webhook payload"""
+    return {
+        "version": "4",
+        "groupKey": '{}:{alertname="PodCrashLooping"}',
+        "status": status,
+        "receiver": "self-healing-controller",
+        "groupLabels": {"alertname": "PodCrashLooping"},
+        "commonLabels": {},
+        "alerts": [{"status": status, "labels": labels, "annotations": {}} for labels in alerts],
+    }
+
+
+def wait_for(condition, timeout=5):
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestAlertTargets:
+    def test_maps_labels_to_object_keys(self):
+        """Test pod, workload and node labels name the objects to check"""
+        assert alert_targets({"labels": {"namespace": "shop", "pod": "web-1", "container": "app"}}) == [
+            "pod/shop/web-1"
+        ]
+        assert alert_targets({"labels": {"kubernetes_namespace": "shop", "kubernetes_pod_name": "web-1"}}) == [
+            "pod/shop/web-1"
+        ]
+        assert alert_targets({"labels": {"namespace": "shop", "deployment": "web"}}) == ["deployment/shop/web"]
+        assert alert_targets({"labels": {"node": "node-1"}}) == ["node/node-1"]
+
+    def test_instance_names_a_node_only_for_node_jobs(self):
+        """Test a kubelet target's instance is a node, but another job's instance is not"""
+        assert alert_targets({"labels": {"job": "kubelet", "instance": "node-1:10250"}}) == ["node/node-1"]
+        assert alert_targets({"labels": {"job": "test-app", "instance": "10.0.0.5:8080"}}) == []
+
+    def test_alerts_on_controller_metrics_ask_for_a_scan(self):
+        """Test alerts on the controller's own metrics scan instead of checking the controller's pod"""
+        # As scraped by the kubernetes-pods and self-healing-controller jobs of prometheus-config.yaml
+        pod_target = {
+            "alertname": "HighPodFailureRate",
+            "job": "kubernetes-pods",
+            "instance": "10.0.0.5:8080",
+            "app": "self-healing-controller",
+            "pod_template_hash": "5d8f7c9b6",
+            "kubernetes_namespace": "self-healing",
+            "kubernetes_pod_name": "self-healing-controller-5d8f7c9b6-x2x7q",
+            "namespace": "shop",
+            "reason": "failed",
+            "severity": "warning",
+        }
+        static_target = {
+            "alertname": "HighPodFailureRate",
+            "job": "self-healing-controller",
+            "instance": "self-healing-controller.self-healing.svc.cluster.local:8080",
+            "namespace": "shop",
+            "reason": "failed",
+            "severity": "warning",
+        }
+
+        assert payload_targets(webhook(pod_target, static_target)) == [SCAN_KEY, SCAN_KEY]
+
+    def test_resolved_and_unmapped_alerts(self):
+        """Test resolved alerts are ignored and firing ones naming no object ask for a scan"""
+        assert payload_targets(webhook({"namespace": "shop", "pod": "web-1"}, status="resolved")) == []
+        assert payload_targets(webhook({"alertname": "HighPodFailureRate"})) == [SCAN_KEY]
+
+
+class TestAlertReceiver:
+    def test_requires_the_configured_token(self):
+        """Test requests without the bearer token are rejected"""
+        receiver = AlertReceiver(lambda key: None, token="secret")
+        body = json.dumps(webhook({"node": "node-1"})).encode()
+
+        assert receiver.handle({}, body)[0] == 401
+        assert receiver.handle({"Authorization": "Bearer secret"}, body)[0] == 200
+
+    def test_rejects_invalid_payloads(self):
+        """Test bodies that are not webhook payloads get a 400"""
+        receiver = AlertReceiver(lambda key: None)
+
+        assert receiver.handle({}, b"not json")[0] == 400
+        assert receiver.handle({}, b"[]")[0] == 400
+
+    def test_repeated_alerts_are_checked_once(self):
+        """Test an object named by several alerts is queued once"""
+        receiver = AlertReceiver(lambda key: None)
+        payload = webhook(
+            {"namespace": "shop", "pod": "web-1"}, {"namespace": "shop", "pod": "web-1", "container": "b"}
+        )
+
+        status, _, body = receiver.handle({}, json.dumps(payload).encode())
+
+        assert status == 200
+        assert json.loads(body) == {"queued": 1}
+        assert len(receiver) == 1
+
+
+class TestControllerAlerts:
+    @pytest.fixture
+    def controller(self):
+        """Create a controller serving the webhook on a free port of a fake cluster"""
+        with patch("self_healing_controller.config.load_incluster_config"):
+            with patch("self_healing_controller.client.CoreV1Api"):
+                controller = SelfHealingController()
+        controller.config.update(
+            {
+                "health_port": 0,
+                "workload_batching_enabled": False,
+                "alert_webhook_enabled": True,
+                "alert_webhook_token": "secret",
+            }
+        )
+        cluster = FakeCluster()
+        cluster.populate(pods=100, nodes=4, namespaces=2)
+        cluster.install(controller)
+        controller.cluster = cluster
+        controller._start_alert_receiver()
+        controller._start_health_server()
+        yield controller
+        controller.stop()
+
+    def post(self, controller, payload):
+        """Post a webhook payload to the controller"""
+        connection = http.client.HTTPConnection("127.0.0.1", controller.health_server.server_address[1], timeout=5)
+        connection.request(
+            "POST", "/webhooks/alertmanager", json.dumps(payload), headers={"Authorization": "Bearer secret"}
+        )
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_pod_alert_remediates_without_a_scan(self, controller):
+        """Test a firing pod alert gets that pod remediated before any scan runs"""
+        cluster = controller.cluster
+        key = sorted(cluster.objects["pods"])[0]
+        cluster.fail_pod(key)
+        namespace, name = key.split("/")
+        cluster.reset_counters()
+
+        assert self.post(controller, webhook({"namespace": namespace, "pod": name})) == (200, {"queued": 1})
+
+        assert wait_for(lambda: cluster.actions_for("delete_pod") == [key])
+        assert "list_pods" not in cluster.calls
+
+    def test_webhook_needs_a_token(self, controller):
+        """Test the webhook is off by default and does not start without a token"""
+        controller.stop()
+        assert controller._load_config()["alert_webhook_enabled"] is False
+
+        controller.alert_receiver = None
+        controller.config["alert_webhook_token"] = ""
+        controller._start_alert_receiver()
+
+        assert controller.alert_receiver is None
+
+    def test_alert_check_waits_for_a_scan_in_progress(self, controller):
+        """Test an alert check does not run concurrently with a pod scan"""
+        cluster = controller.cluster
+        key = sorted(cluster.objects["pods"])[0]
+        cluster.fail_pod(key)
+        namespace, name = key.split("/")
+
+        with controller._check_lock:
+            self.post(controller, webhook({"namespace": namespace, "pod": name}))
+            time.sleep(0.1)
+            assert cluster.actions_for("delete_pod") == []
+
+        assert wait_for(lambda: cluster.actions_for("delete_pod") == [key])
+
+    def test_node_alert_raises_the_node_incident(self, controller):
+        """Test a NodeFailure alert from the kubelet job checks that node"""
+        cluster = controller.cluster
+        cluster.set_node_ready("node-0001", False)
+
+        status, _ = self.post(
+            controller, webhook({"alertname": "NodeFailure", "job": "kubelet", "instance": "node-0001:10250"})
+        )
+
+        assert status == 200
+        assert wait_for(lambda: "node-0001" in controller.node_failures)
+        assert controller.cluster_index.node_ready("node-0001") is False
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio controller engine
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from async_engine import AsyncEngine  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+from workqueue import AsyncRateLimitingQueue  # noqa: E402
+
+
+def wait_for(condition, timeout=5):
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestAsyncRateLimitingQueue:
+    def test_deduplicates_and_requeues_keys_added_while_processing(self):
+        """Test a key is handed out once, and again after done() if re-added meanwhile"""
+
+        async def scenario():
+            queue = AsyncRateLimitingQueue(asyncio.get_running_loop(), rate=0)
+            queue.add("a")
+            queue.add("a")
+            queue.add("b")
+            await asyncio.sleep(0)
+
+            assert await queue.get() == "a"
+            queue.add("a")
+            assert await queue.get() == "b"
+            await asyncio.sleep(0)
+            assert len(queue) == 0
+
+            queue.done("a")
+            assert await queue.get() == "a"
+
+        asyncio.run(scenario())
+
+    def test_add_after_and_shut_down(self):
+        """Test delayed keys arrive later and shutdown releases the consumer"""
+
+        async def scenario():
+            queue = AsyncRateLimitingQueue(asyncio.get_running_loop(), rate=0)
+            start = time.monotonic()
+            queue.add_after("late", 0.05)
+
+            assert await queue.get() == "late"
+            assert time.monotonic() - start >= 0.05
+
+            queue.shut_down()
+            assert await queue.get() is None
+
+        asyncio.run(scenario())
+
+    def test_keys_added_from_other_threads(self):
+        """Test informer threads can add keys"""
+
+        async def scenario():
+            queue = AsyncRateLimitingQueue(asyncio.get_running_loop(), rate=0)
+            thread = threading.Thread(target=queue.add, args=("pod",))
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(queue.get(), 1)
+
+        assert asyncio.run(scenario()) == "pod"
+
+
+class TestAsyncEngine:
+    @pytest.fixture
+    def controller(self):
+        """Create a controller against a fake cluster, set up for the asyncio engine"""
+        with patch("self_healing_controller.config.load_incluster_config"):
+            with patch("self_healing_controller.client.CoreV1Api"):
+                controller = SelfHealingController()
+        controller.config.update(
+            {
+                "check_interval": 0.05,
+                "health_port": 0,
+                "workload_batching_enabled": False,
+                "kured_integration_enabled": False,
+                "remediation_rate_limit": 0,
+            }
+        )
+        return controller
+
+    def test_remediates_failing_pods_as_tasks(self, controller):
+        """Test the engine scans, queues and remediates failing pods, then stops promptly"""
+        cluster = FakeCluster()
+        cluster.populate(pods=100, nodes=4, namespaces=2)
+        cluster.install(controller)
+        failed = cluster.mass_failure(0.1)
+
+        engine = AsyncEngine(controller)
+        thread = threading.Thread(target=asyncio.run, args=(engine.run(),), daemon=True)
+        thread.start()
+
+        try:
+            assert wait_for(lambda: sorted(cluster.actions_for("delete_pod")) == sorted(failed))
+            assert controller.remediation_queue is not None
+            assert controller.get_metrics()["engine_tasks"] > 0
+        finally:
+            engine.stop()
+            thread.join(5)
+
+        assert not thread.is_alive()
+        assert controller.running is False
+
+    def test_idle_engine_is_stopped(self, controller):
+        """Test stopping the controller stops its engine even while the engine has no tasks"""
+        engine = AsyncEngine(controller)
+        controller.engine = engine
+
+        with patch.object(engine, "stop") as stop:
+            controller.stop()
+
+        assert len(engine) == 0
+        stop.assert_called_once_with()
+
+    def test_helm_rollback_runs_as_subprocess(self, controller):
+        """Test Helm rollbacks run as asyncio subprocesses and report through the controller"""
+        release = {"namespace": "team", "release": "web", "rollbacks": 1, "status": "running"}
+        controller._helm_in_flight.add("team/web")
+        engine = AsyncEngine(controller)
+
+        async def rollback(command, timeout=300):
+            engine.semaphores = {"helm": asyncio.Semaphore(1)}
+            controller.config["helm_rollback_timeout"] = timeout
+            with patch.object(controller, "_helm_rollback_command", return_value=[sys.executable, "-c", command]):
+                await engine.run_helm_rollback(release, None, None)
+
+        asyncio.run(rollback("pass"))
+        assert release["status"] == "success"
+        assert "team/web" not in controller._helm_in_flight
+
+        asyncio.run(rollback("import sys; sys.exit('no deployed releases')"))
+        assert release["status"] == "failure"
+
+        asyncio.run(rollback("import time; time.sleep(5)", timeout=0.2))
+        assert release["status"] == "timeout"
+
+    def test_selected_by_environment(self):
+        """Test CONTROLLER_ENGINE selects the engine"""
+        with patch.dict(os.environ, {"CONTROLLER_ENGINE": "asyncio"}):
+            with patch("self_healing_controller.config.load_incluster_config"):
+                with patch("self_healing_controller.client.CoreV1Api"):
+                    controller = SelfHealingController()
+
+        assert controller.config["controller_engine"] == "asyncio"
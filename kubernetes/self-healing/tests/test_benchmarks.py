@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Self-Healing Controller against the fake cluster
+
+Each benchmark measures one property of SelfHealingController on a
+synthetic cluster and compares it with tests/benchmarks/baselines.json:
+
+    BENCHMARK_PODS=20000 pytest tests/test_benchmarks.py    # other scale, report only
+    BENCHMARK_UPDATE_BASELINES=1 pytest tests/test_benchmarks.py
+    BENCHMARK_COMPARE_TIMINGS=1 pytest tests/test_benchmarks.py
+
+API call counts must not grow at all and traced peak memory only within
+BENCHMARK_MEMORY_TOLERANCE. Timings depend on the machine the baselines were
+recorded on, so they are only reported unless BENCHMARK_COMPARE_TIMINGS is
+set on that same machine.
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json  # noqa: E402
+import resource  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+
+import pytest  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baselines.json")
+BENCHMARK_PODS = int(os.getenv("BENCHMARK_PODS", 2000))
+UPDATE_BASELINES = os.getenv("BENCHMARK_UPDATE_BASELINES", "false").lower() in ("1", "true")
+COMPARE_TIMINGS = os.getenv("BENCHMARK_COMPARE_TIMINGS", "false").lower() in ("1", "true")
+TIME_TOLERANCE = float(os.getenv("BENCHMARK_TIME_TOLERANCE", 3.0))
+TIME_SLACK = float(os.getenv("BENCHMARK_TIME_SLACK", 0.05))
+MEMORY_TOLERANCE = float(os.getenv("BENCHMARK_MEMORY_TOLERANCE", 1.5))
+
+# How each metric may move before it counts as a regression
+LOWER_IS_BETTER = {"seconds": TIME_TOLERANCE, "bytes": MEMORY_TOLERANCE, "calls": 1.0}
+HIGHER_IS_BETTER = {"per_second": TIME_TOLERANCE}
+TIMING_UNITS = ("seconds", "per_second")
+
+
+def load_baselines():
+    """Load the stored baselines"""
+    if not os.path.exists(BASELINES_FILE):
+        return {"pods": BENCHMARK_PODS, "metrics": {}}
+    with open(BASELINES_FILE) as f:
+        return json.load(f)
+
+
+class BenchmarkRecorder:
+    def __init__(self):
+        """Initialize the recorder with the stored baselines"""
+        self.baselines = load_baselines()
+        self.results = {}
+
+    def check(self, name, value, unit):
+        """Record a measurement and fail if it regressed past its baseline"""
+        self.results[name] = {"value": value, "unit": unit}
+        print(f"benchmark {name}: {value:.6g} {unit}")
+
+        baseline = self.baselines["metrics"].get(name)
+        if UPDATE_BASELINES or baseline is None or self.baselines["pods"] != BENCHMARK_PODS:
+            return
+        if unit in TIMING_UNITS and not COMPARE_TIMINGS:
+            return
+
+        if unit in LOWER_IS_BETTER:
+            limit = baseline["value"] * LOWER_IS_BETTER[unit]
+            if unit == "seconds":
+                # Absorb scheduler noise on very short timings
+                limit += TIME_SLACK
+            assert value <= limit, f"{name} regressed: {value:.6g} {unit} > {limit:.6g} (baseline {baseline['value']})"
+        else:
+            limit = baseline["value"] / HIGHER_IS_BETTER[unit]
+            assert value >= limit, f"{name} regressed: {value:.6g} {unit} < {limit:.6g} (baseline {baseline['value']})"
+
+    def save(self):
+        """Write the recorded measurements as the new baselines"""
+        metrics = dict(self.baselines["metrics"]) if self.baselines["pods"] == BENCHMARK_PODS else {}
+        metrics.update(self.results)
+        os.makedirs(os.path.dirname(BASELINES_FILE), exist_ok=True)
+        with open(BASELINES_FILE, "w") as f:
+            json.dump({"pods": BENCHMARK_PODS, "metrics": metrics}, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+@pytest.fixture(scope="module")
+def recorder():
+    """Collect results across the module and optionally store them as baselines"""
+    recorder = BenchmarkRecorder()
+    yield recorder
+    if UPDATE_BASELINES:
+        recorder.save()
+
+
+def make_controller(cluster, **overrides):
+    """Create a controller wired to a fake cluster"""
+    overrides = dict(remediation_rate_limit=0, workload_batch_window=0, **overrides)
+    return cluster.install(SelfHealingController(clients=cluster, overrides=overrides))
+
+
+def make_cluster():
+    """Create a fake cluster at the benchmark scale"""
+    cluster = FakeCluster()
+    cluster.populate(pods=BENCHMARK_PODS, nodes=max(1, BENCHMARK_PODS // 100), namespaces=20)
+    return cluster
+
+
+def wait_for(condition, timeout=30):
+    """Poll until a condition holds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the controller"
+        time.sleep(0.001)
+
+
+@pytest.mark.slow
+class TestScanBenchmarks:
+    """Benchmarks for periodic full scans"""
+
+    @pytest.mark.parametrize("fast_path", [False, True], ids=["model", "fast_path"])
+    def test_scan_time(self, recorder, fast_path):
+        """Benchmark a full scan of a healthy cluster"""
+        cluster = make_cluster()
+        controller = make_controller(cluster, pod_fast_path_enabled=fast_path)
+
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            controller._check_pods()
+            timings.append(time.perf_counter() - start)
+
+        recorder.check(f"scan_seconds[{'fast_path' if fast_path else 'model'}]", min(timings), "seconds")
+
+    @pytest.mark.parametrize("fast_path", [False, True], ids=["model", "fast_path"])
+    def test_api_calls_per_scan(self, recorder, fast_path):
+        """Benchmark the API calls made by a scan with 1% of pods failing"""
+        cluster = make_cluster()
+        controller = make_controller(cluster, pod_fast_path_enabled=fast_path)
+        failed = cluster.mass_failure(0.01)
+        cluster.reset_counters()
+
+        controller._check_pods()
+
+        assert sorted(cluster.actions_for("delete_pod")) == sorted(failed)
+        recorder.check(
+            f"api_calls_per_scan[{'fast_path' if fast_path else 'model'}]", sum(cluster.calls.values()), "calls"
+        )
+
+    @pytest.mark.parametrize("fast_path", [False, True], ids=["model", "fast_path"])
+    def test_scan_peak_memory(self, recorder, fast_path):
+        """Benchmark the peak memory allocated during a scan"""
+        cluster = make_cluster()
+        controller = make_controller(cluster, pod_fast_path_enabled=fast_path)
+
+        tracemalloc.start()
+        try:
+            controller._check_pods()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        recorder.check(f"scan_peak_bytes[{'fast_path' if fast_path else 'model'}]", peak, "bytes")
+        # Process-wide and monotonic, so reported but not compared
+        print(f"benchmark peak_rss: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+
+
+@pytest.mark.slow
+class TestRemediationBenchmarks:
+    """Benchmarks for detection and remediation"""
+
+    def test_detection_latency(self, recorder):
+        """Benchmark the time from a pod failing to its deletion in watch mode"""
+        cluster = make_cluster()
+        controller = make_controller(
+            cluster, pod_watch_enabled=True, pod_fast_path_enabled=True, watch_timeout_seconds=5
+        )
+        controller._start_remediation_workers()
+        controller._start_pod_informer()
+        assert controller.pod_informer.wait_for_sync(30)
+
+        latencies = []
+        try:
+            for key in sorted(cluster.objects["pods"])[:: max(1, BENCHMARK_PODS // 20)]:
+                injected = time.monotonic()
+                cluster.fail_pod(key)
+                wait_for(lambda: key in cluster.actions_for("delete_pod"))
+                latencies.append(time.monotonic() - injected)
+        finally:
+            controller.stop()
+
+        recorder.check("detection_latency_seconds[p50]", statistics.median(latencies), "seconds")
+
+    def test_remediation_throughput(self, recorder):
+        """Benchmark how fast the worker pool remediates a mass failure"""
+        cluster = make_cluster()
+        controller = make_controller(cluster, pod_fast_path_enabled=True, workload_batching_enabled=False)
+        controller._start_remediation_workers()
+        failed = cluster.mass_failure(0.1)
+
+        start = time.perf_counter()
+        try:
+            controller._check_pods()
+            wait_for(lambda: len(cluster.actions_for("delete_pod")) >= len(failed))
+        finally:
+            controller.stop()
+        elapsed = time.perf_counter() - start
+
+        recorder.check("remediation_throughput", len(failed) / elapsed, "per_second")
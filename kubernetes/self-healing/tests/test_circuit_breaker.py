@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the storm-protection circuit breaker
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from circuit_breaker import CircuitBreaker  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from informer import Informer  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+
+
+class Clock:
+    """Clock advanced by hand"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, sizes=None, **kwargs):
+    """Create a breaker over namespaces of the given sizes"""
+    sizes = sizes or {"web": 50, "batch": 50}
+
+    def population(namespace):
+        return sum(sizes.values()) if namespace is None else sizes.get(namespace, 0)
+
+    transitions = []
+    options = {"failure_ratio": 0.3, "min_pods": 20, "window_seconds": 60, "open_seconds": 120, "probes": 2}
+    options.update(kwargs)
+    breaker = CircuitBreaker(
+        population, on_transition=lambda *transition: transitions.append(transition), clock=clock, **options
+    )
+    return breaker, transitions
+
+
+def fail(breaker, namespace, count, start=0):
+    """Mark count pods of a namespace failing"""
+    for index in range(start, start + count):
+        breaker.mark_failing(f"{namespace}/pod-{index}", namespace)
+
+
+class TestCircuitBreaker:
+    def test_stays_closed_below_threshold(self):
+        """Test remediation flows while the failing fraction is low"""
+        breaker, transitions = make_breaker(Clock())
+        fail(breaker, "web", 10)
+
+        assert all(breaker.allow("web") for _ in range(20))
+        assert transitions == []
+
+    def test_namespace_storm_opens_only_that_namespace(self):
+        """Test a namespace over the threshold holds its own pods back but not others"""
+        breaker, transitions = make_breaker(Clock())
+        fail(breaker, "web", 20)
+
+        assert breaker.allow("web") is False
+        assert breaker.allow("batch") is True
+        assert breaker.states() == {"namespace/web": "open"}
+        assert transitions == [("web", "closed", "open", 0.4)]
+
+    def test_cluster_storm_opens_every_namespace(self):
+        """Test a cluster-wide fraction over the threshold holds back all pods"""
+        breaker, _ = make_breaker(Clock(), sizes={f"ns-{index}": 10 for index in range(10)})
+        for index in range(10):
+            fail(breaker, f"ns-{index}", 4)
+
+        assert breaker.allow("ns-0") is False
+        assert breaker.states() == {"cluster": "open"}
+
+    def test_small_namespaces_never_trip(self):
+        """Test min_pods keeps tiny namespaces from tripping on a single failure"""
+        breaker, _ = make_breaker(Clock(), sizes={"tiny": 2, "web": 100})
+        fail(breaker, "tiny", 2)
+
+        assert breaker.allow("tiny") is True
+
+    def test_recovered_pods_count_until_the_window_passes(self):
+        """Test the failing fraction slides, so recovery closes the breaker only after the window"""
+        clock = Clock()
+        breaker, transitions = make_breaker(clock)
+        fail(breaker, "web", 20)
+        assert breaker.allow("web") is False
+        for index in range(20):
+            breaker.mark_recovered(f"web/pod-{index}")
+
+        clock.now += 120
+        breaker.update()
+        assert breaker.states() == {"namespace/web": "half_open"}
+
+        clock.now += 1
+        breaker.update()
+        assert breaker.states() == {}
+        assert [transition[2] for transition in transitions] == ["open", "half_open", "closed"]
+
+    def test_half_open_probes_then_reopens(self):
+        """Test a half-open scope lets a few probes through and reopens if failures persist"""
+        clock = Clock()
+        breaker, transitions = make_breaker(clock)
+        fail(breaker, "web", 20)
+        assert breaker.allow("web") is False
+
+        clock.now += 120
+        assert [breaker.allow("web") for _ in range(3)] == [True, True, False]
+
+        clock.now += 60
+        assert breaker.allow("web") is False
+        assert breaker.states() == {"namespace/web": "open"}
+        assert [transition[2] for transition in transitions] == ["open", "half_open", "open"]
+
+    def test_throttle_mode_remediates_at_a_fixed_rate(self):
+        """Test an open scope in throttle mode still remediates throttle_per_minute pods"""
+        clock = Clock()
+        breaker, _ = make_breaker(clock, mode="throttle", throttle_per_minute=6)
+        fail(breaker, "web", 20)
+
+        assert breaker.allow("web") is False
+        clock.now += 10
+        assert [breaker.allow("web") for _ in range(2)] == [True, False]
+
+
+class TestControllerCircuitBreaker:
+    @pytest.fixture
+    def controller(self):
+        """Create a controller against a fake cluster with a hand-driven breaker clock"""
+        with patch("self_healing_controller.config.load_incluster_config"):
+            with patch("self_healing_controller.client.CoreV1Api"):
+                controller = SelfHealingController()
+        controller.config["workload_batching_enabled"] = False
+        controller.circuit_breaker.clock = Clock()
+        return controller
+
+    def test_storm_is_observed_instead_of_deleted(self, controller):
+        """Test a mass failure deletes no pods and raises a storm notification per tripped scope"""
+        cluster = FakeCluster()
+        cluster.populate(pods=100, nodes=4, namespaces=2)
+        cluster.install(controller)
+        failed = cluster.mass_failure(0.5)
+
+        controller._check_pods()
+
+        assert cluster.actions_for("delete_pod") == []
+        notifications = [title for _, verb, title, _ in cluster.actions if verb == "slack"]
+        assert sorted(notifications) == [
+            "🌩️ Failure Storm: cluster",
+            "🌩️ Failure Storm: namespace/team-000",
+            "🌩️ Failure Storm: namespace/team-001",
+        ]
+        metrics = controller.metrics.exposition()[0].decode()
+        assert 'self_healing_circuit_breaker_state{scope="cluster"} 2.0' in metrics
+        assert 'outcome="circuit_open"' in metrics
+        assert controller.get_metrics()["circuit_breakers_open"] == 3
+        assert len(failed) == 50
+
+    def test_held_back_workload_restarts_are_counted_once(self, controller):
+        """Test a held-back workload group is counted as one restart_workload, not a restart per pod"""
+        controller.config["workload_batching_enabled"] = True
+        cluster = FakeCluster()
+        cluster.add_node("node-1")
+        for index in range(4):
+            cluster.add_deployment("web", f"app-{index}", 10, nodes=["node-1"])
+        cluster.install(controller)
+        for key in cluster.select_pods("web", {"app": "app-0"}):
+            cluster.fail_pod(key)
+        for index in range(1, 4):
+            cluster.fail_pod(cluster.select_pods("web", {"app": f"app-{index}"})[0])
+
+        controller._check_pods()
+
+        assert cluster.actions_for("patch_deployment") == []
+
+        def held(action):
+            labels = {"action": action, "outcome": "circuit_open", "namespace": "web"}
+            return controller.metrics.registry.get_sample_value("self_healing_remediations_total", labels)
+
+        assert held("restart_workload") == 1
+        assert held("restart_pod") == 3
+
+    def test_informer_pass_updates_the_breaker_once(self, controller):
+        """Test a relist of the watched pods updates the breaker once, before remediating any of them"""
+        cluster = FakeCluster()
+        cluster.populate(pods=100, nodes=4, namespaces=2)
+        cluster.install(controller)
+        cluster.mass_failure(0.5)
+        controller.pod_informer = Informer(
+            cluster.core_v1.list_pod_for_all_namespaces, controller._on_pod_event, on_pass=controller._finish_pod_checks
+        )
+
+        with patch.object(controller.circuit_breaker, "update", wraps=controller.circuit_breaker.update) as update:
+            controller.pod_informer.relist()
+
+        assert update.call_count == 1
+        assert cluster.actions_for("delete_pod") == []
+
+    def test_isolated_failures_are_still_remediated(self, controller):
+        """Test failures below the threshold are remediated as before"""
+        cluster = FakeCluster()
+        cluster.populate(pods=100, nodes=4, namespaces=2)
+        cluster.install(controller)
+        failed = cluster.mass_failure(0.1)
+
+        controller._check_pods()
+
+        assert sorted(cluster.actions_for("delete_pod")) == sorted(failed)
+        assert controller.circuit_breaker.states() == {}
@@ -3,8 +3,10 @@
 Unit tests for Self-Healing Controller
 """
 
+import datetime
 import os
 import sys
+import time
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,6 +14,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from unittest.mock import MagicMock, patch  # noqa: E402
 
 import pytest  # noqa: E402
+from disruption import ConfigMapState, RebootScheduler  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from pod_records import PodRecord  # noqa: E402
 from self_healing_controller import SelfHealingController  # noqa: E402
 
 
@@ -75,15 +80,170 @@ class TestSelfHealingController:
         assert result is False
 
     def test_is_pod_crash_looping_true(self, controller):
-        """Test crash looping detection when true"""
+        """Test crash looping detection when restarts pile up inside the window"""
         pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
         container = MagicMock()
-        container.restart_count = 5
+        container.restart_count = 1
         pod.status.container_statuses = [container]
 
+        assert controller._is_pod_crash_looping(pod) is False
+
+        container.restart_count = 5
         result = controller._is_pod_crash_looping(pod)
         assert result is True
 
+    def test_old_restarts_are_not_crash_looping(self, controller):
+        """Test a high lifetime restart count alone does not count as crash looping"""
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
+        container = MagicMock()
+        container.restart_count = 40
+        container.last_state.terminated.finished_at = None
+        pod.status.container_statuses = [container]
+
+        assert controller._is_pod_crash_looping(pod) is False
+        assert controller._is_pod_crash_looping(pod) is False
+
+    def test_oom_killed_crash_loop_is_only_reported(self, controller):
+        """Test pods crash looping on OOMKilled are reported but not deleted"""
+        pod = PodRecord("default", "app-1", restart_counts=(6,), last_terminations=(("OOMKilled", 1.0),))
+
+        with patch.object(controller, "_restart_pod") as mock_restart:
+            with patch.object(controller, "_send_slack_notification") as mock_notify:
+                controller._handle_crash_looping_pod(pod)
+
+        mock_restart.assert_not_called()
+        assert "OOMKilled" in mock_notify.call_args[0][1]
+
+    def test_oom_killed_crash_loop_is_not_remediated(self, controller):
+        """Test pods crash looping on OOMKilled are neither deleted nor restarted with their workload"""
+        cluster = FakeCluster()
+        cluster.add_node("node-1")
+        cluster.add_deployment("shop", "web", 3, nodes=["node-1"])
+        cluster.install(controller)
+        # Restart history starts with a pod's first restart
+        for key in cluster.select_pods("shop"):
+            cluster.crash_loop(key, restarts=1, reason="OOMKilled")
+            cluster.heal_pod(key)
+        controller._check_pods()
+        for key in cluster.select_pods("shop"):
+            cluster.crash_loop(key, restarts=6, reason="OOMKilled")
+
+        controller._check_pods()
+
+        assert cluster.actions_for("delete_pod") == []
+        assert cluster.actions_for("patch_deployment") == []
+        assert {failure["reason"] for failure in controller.pod_failures.values()} == {"crash_loop"}
+        titles = [title for _, verb, title, _ in cluster.actions if verb == "slack"]
+        assert len(titles) == 3 and all(title.startswith("🔄 Crash Looping Pod") for title in titles)
+
+    def test_steady_oom_killed_crash_loop_is_not_deleted(self, controller):
+        """Test a pod in CrashLoopBackOff on OOMKilled is not deleted though it restarts too slowly to count as one"""
+        cluster = FakeCluster()
+        cluster.add_node("node-1")
+        cluster.add_deployment("shop", "web", 1, nodes=["node-1"])
+        cluster.install(controller)
+        key = cluster.select_pods("shop")[0]
+        now = [time.time()]
+
+        # The kubelet's backoff tops out at 5 minutes, about two restarts per crash-loop window
+        with patch("restarts.time.time", lambda: now[0]):
+            for _ in range(10):
+                cluster.crash_loop(key, restarts=1, reason="OOMKilled")
+                controller._check_pods()
+                now[0] += 300
+
+        assert cluster.actions_for("delete_pod") == []
+        assert controller.pod_failures[key]["reason"] == "crash_loop"
+
+    def test_only_scans_that_remediate_are_busy(self, controller):
+        """Test a pod left failing without being remediated does not keep pod scans at the shortest interval"""
+        cluster = FakeCluster()
+        cluster.add_node("node-1")
+        cluster.add_deployment("shop", "web", 3, nodes=["node-1"])
+        cluster.add_deployment("shop", "api", 3, nodes=["node-1"])
+        cluster.install(controller)
+        chronic = cluster.select_pods("shop", {"app": "web"})[0]
+        fresh = cluster.select_pods("shop", {"app": "api"})[0]
+        controller.cooldowns.try_acquire(chronic, 600)
+        cluster.fail_pod(chronic)
+
+        controller._check_pods()
+        controller._check_pods()
+        assert chronic in controller.pod_failures
+        assert not controller._pod_scan_busy()
+
+        cluster.fail_pod(fresh)
+        controller._check_pods()
+        assert cluster.actions_for("delete_pod") == [fresh]
+        assert controller._pod_scan_busy()
+
+        controller._check_pods()
+        assert not controller._pod_scan_busy()
+
+    def test_recovery_resets_the_backoff(self, controller):
+        """Test a pod failing again after it recovered is remediated without waiting out the old backoff"""
+        cluster = FakeCluster(replace_deleted_pods=False)
+        cluster.add_node("node-1")
+        cluster.add_deployment("shop", "web", 1, nodes=["node-1"])
+        cluster.install(controller)
+        key = cluster.select_pods("shop")[0]
+        for _ in range(3):
+            controller.cooldowns.try_acquire(key, 60)
+        cluster.fail_pod(key)
+        controller._check_pods()
+        assert cluster.actions_for("delete_pod") == []
+
+        cluster.heal_pod(key)
+        controller._check_pods()
+        cluster.fail_pod(key)
+        controller._check_pods()
+
+        assert cluster.actions_for("delete_pod") == [key]
+
+    def test_workload_recovery_resets_its_cooldown(self, controller):
+        """Test a workload failing again after it recovered is restarted without waiting out the old cooldown"""
+        controller.config["workload_batch_window"] = 0
+        cluster = FakeCluster()
+        cluster.add_node("node-1")
+        cluster.add_deployment("shop", "web", 3, nodes=["node-1"])
+        cluster.install(controller)
+
+        def fail_two():
+            failed = cluster.select_pods("shop")[:2]
+            for key in failed:
+                cluster.fail_pod(key)
+            controller._check_pods()
+            return failed
+
+        fail_two()
+        # The replacements failing too is the same incident
+        failed = fail_two()
+        assert cluster.actions_for("patch_deployment") == ["shop/web"]
+
+        for key in failed:
+            cluster.heal_pod(key)
+        controller._check_pods()
+        controller._check_pods()
+        fail_two()
+
+        assert cluster.actions_for("patch_deployment") == ["shop/web", "shop/web"]
+
+    def test_restart_history_evicted_after_scan(self, controller):
+        """Test restart history of pods missing from a full scan is dropped"""
+        controller.restart_tracker.observe("default/gone", (3,))
+        page = MagicMock()
+        page.items = []
+        page.metadata._continue = None
+        controller.k8s_client.list_pod_for_all_namespaces.return_value = page
+
+        controller._check_pods()
+
+        assert len(controller.restart_tracker) == 0
+
     def test_is_pod_crash_looping_false(self, controller):
         """Test crash looping detection when false"""
         pod = MagicMock()
@@ -167,6 +327,23 @@ class TestSelfHealingController:
 
         mock_post.assert_not_called()
 
+    @patch("self_healing_controller.requests.post")
+    def test_send_slack_notification_queued_when_notifier_started(self, mock_post, controller):
+        """Test notifications only enqueue once the background notifier runs"""
+        controller.config["slack_notifications_enabled"] = True
+        controller.config["slack_webhook_url"] = "https://hooks.slack.com/test"
+        controller.config["slack_flush_interval"] = 60
+        controller._start_slack_notifier()
+
+        controller._send_slack_notification("Test Title", "Test Message", group="namespace/default")
+
+        mock_post.assert_not_called()
+        assert controller.get_metrics()["notifications_queued"] == 1
+        controller.slack_notifier.session = MagicMock()
+        controller.slack_notifier.session.post.return_value.status_code = 200
+        controller.slack_notifier.stop()
+        controller.slack_notifier.session.post.assert_called_once()
+
     def test_get_metrics(self, controller):
         """Test metrics collection"""
         controller.pod_failures = {"pod1": {}, "pod2": {}}
@@ -177,6 +354,62 @@ class TestSelfHealingController:
         assert metrics["pod_failures"] == 2
         assert metrics["node_failures"] == 1
 
+    def test_pod_failures_tracked_until_recovery(self, controller):
+        """Test failing pods are tracked and counted once until they recover"""
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
+        pod.metadata.deletion_timestamp = None
+        pod.status.phase = "Failed"
+
+        with patch.object(controller, "_dispatch_remediation"):
+            assert controller._evaluate_pod(pod) == "default/app-1"
+            controller._evaluate_pod(pod)
+            counted = controller.metrics.pod_failures.labels(namespace="default", reason="failed")._value.get()
+            assert controller.get_metrics()["pod_failures"] == 1
+
+            pod.status.phase = "Running"
+            pod.status.conditions = []
+            controller._evaluate_pod(pod)
+
+        assert counted == 1
+        assert controller.pod_failures == {}
+
+    def test_check_nodes_tracks_node_failures(self, controller):
+        """Test NotReady nodes are tracked and dropped once Ready again"""
+        node = MagicMock()
+        node.metadata.name = "node-1"
+        condition = MagicMock()
+        condition.type = "Ready"
+        condition.status = "False"
+        node.status.conditions = [condition]
+        controller.k8s_client.list_node.return_value.items = [node]
+
+        with patch.object(controller, "_handle_node_failure"):
+            controller._check_nodes()
+            assert list(controller.node_failures) == ["node-1"]
+
+            condition.status = "True"
+            controller._check_nodes()
+
+        assert controller.node_failures == {}
+        assert controller.metrics.node_failures._value.get() == 1
+
+    @patch("self_healing_controller.subprocess.run")
+    def test_helm_rollback_recorded(self, mock_run, controller):
+        """Test Helm rollbacks are recorded per release"""
+        mock_run.return_value.returncode = 0
+        pod = MagicMock()
+        pod.metadata.labels = {"app.kubernetes.io/instance": "test-release"}
+        pod.metadata.namespace = "test-namespace"
+
+        controller._handle_helm_pod_failure(pod)
+
+        release = controller.helm_releases["test-namespace/test-release"]
+        assert release["status"] == "success"
+        assert release["rollbacks"] == 1
+        assert controller.get_metrics()["helm_rollbacks"] == 1
+
     @patch("self_healing_controller.subprocess.run")
     def test_helm_rollback_success(self, mock_run, controller):
         """Test successful Helm rollback"""
@@ -217,6 +450,31 @@ class TestSelfHealingController:
 
         mock_run.assert_called_once()
 
+    @patch("self_healing_controller.subprocess.run")
+    def test_helm_rollback_once_per_release(self, mock_run, controller):
+        """Test many failing pods of one release cause a single rollback to the cached previous revision"""
+        mock_run.return_value.returncode = 0
+        cluster = FakeCluster()
+        labels = {"app.kubernetes.io/managed-by": "Helm", "app.kubernetes.io/instance": "web"}
+        cluster.add_deployment("team", "web", 50, labels=labels)
+        cluster.add_helm_revision("team", "web", 1)
+        cluster.add_helm_revision("team", "web", 2)
+        cluster.install(controller)
+        controller.config["helm_release_cache_enabled"] = True
+        with patch("self_healing_controller.Informer.start"):
+            controller._start_helm_release_cache()
+        controller.helm_informer.relist()
+
+        for pod in controller.k8s_client.list_pod_for_all_namespaces().items:
+            controller._handle_helm_pod_failure(pod)
+        controller.helm_pool.shutdown(wait=True)
+
+        mock_run.assert_called_once_with(
+            ["helm", "rollback", "web", "1", "--namespace", "team"], capture_output=True, text=True, timeout=300
+        )
+        assert controller.helm_releases["team/web"]["status"] == "success"
+        assert controller.get_metrics()["helm_releases_cached"] == 1
+
     def test_helm_rollback_disabled(self, controller):
         """Test Helm rollback when disabled"""
         controller.config["helm_rollback_enabled"] = False
@@ -239,6 +497,364 @@ class TestSelfHealingController:
 
         # Should not attempt rollback
 
+    def test_evaluate_pod_handles_failing_pod(self, controller):
+        """Test a single pod evaluation dispatches failure handling"""
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
+        pod.metadata.deletion_timestamp = None
+        pod.status.phase = "Failed"
+
+        with patch.object(controller, "_handle_pod_failure") as mock_handle:
+            controller._evaluate_pod(pod)
+
+        mock_handle.assert_called_once()
+        assert mock_handle.call_args[0][0].key == "default/app-1"
+
+    def test_pod_event_deleted_is_ignored(self, controller):
+        """Test deleted pods from the informer are not evaluated"""
+        with patch.object(controller, "_evaluate_pod") as mock_evaluate:
+            controller._on_pod_event("DELETED", MagicMock())
+
+        mock_evaluate.assert_not_called()
+
+    @patch("self_healing_controller.Informer")
+    def test_pod_watch_mode_starts_informer(self, mock_informer, controller):
+        """Test watch mode uses the informer instead of the polling thread"""
+        controller.config["pod_watch_enabled"] = True
+
+        controller._start_pod_monitoring()
+
+        mock_informer.return_value.start.assert_called_once()
+        assert controller.pod_informer is mock_informer.return_value
+
+    def test_pod_list_selectors_exclude_namespaces(self, controller):
+        """Test namespace exclusions and completed pods are filtered server-side"""
+        selectors = controller._pod_list_selectors()
+
+        assert "metadata.namespace!=kube-system" in selectors["field_selector"]
+        assert "status.phase!=Succeeded" in selectors["field_selector"]
+        assert "label_selector" not in selectors
+
+    def test_check_pods_streams_pages(self, controller):
+        """Test pod checks walk every page using the continue token"""
+        first_page = MagicMock()
+        first_page.items = [MagicMock()]
+        first_page.metadata._continue = "token-1"
+        second_page = MagicMock()
+        second_page.items = [MagicMock(), MagicMock()]
+        second_page.metadata._continue = None
+        controller.k8s_client.list_pod_for_all_namespaces.side_effect = [first_page, second_page]
+
+        with patch.object(controller, "_evaluate_pod") as mock_evaluate:
+            controller._check_pods()
+
+        assert mock_evaluate.call_count == 3
+        calls = controller.k8s_client.list_pod_for_all_namespaces.call_args_list
+        assert calls[0][1]["limit"] == 500
+        assert calls[1][1]["_continue"] == "token-1"
+
+    def test_check_pods_records_phase_timings(self, controller, caplog):
+        """Test scans time each phase and log them as one structured line"""
+        page = MagicMock()
+        page.items = [MagicMock()]
+        page.metadata._continue = None
+        controller.k8s_client.list_pod_for_all_namespaces.return_value = page
+        controller.phases.enabled = True
+        controller.config["phase_timing_log_interval"] = 0
+
+        with patch.object(controller, "_evaluate_pod", return_value=None):
+            with caplog.at_level("INFO", logger="self_healing_controller"):
+                controller._check_pods()
+
+        assert set(controller.phases.snapshot()) == {"api.list.pods", "pods.evaluate", "pods.remediate", "pods.scan"}
+        assert any('"event": "phase_timings"' in record.message for record in caplog.records)
+
+    def test_should_skip_completed_pod(self, controller):
+        """Test pods that ran to completion are skipped"""
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "job-1"
+        pod.metadata.deletion_timestamp = None
+        pod.status.phase = "Succeeded"
+
+        assert controller._should_skip_pod(pod) is True
+
+    def test_dispatch_remediation_queues_key(self, controller):
+        """Test remediations go through the work queue when workers run"""
+        controller.remediation_queue = MagicMock()
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
+        pod.metadata.labels = {}
+        handler = MagicMock()
+
+        controller._dispatch_remediation(pod, handler)
+
+        handler.assert_not_called()
+        controller.remediation_queue.add.assert_called_once_with("default/app-1", 2)
+        workload, members = controller.pending_remediations["default/app-1"]
+        assert workload is None
+        assert members["default/app-1"][0] is handler
+        assert members["default/app-1"][1].name == "app-1"
+
+    def test_remediation_worker_retries_failures(self, controller):
+        """Test a failing remediation is re-queued with backoff"""
+        controller.config["remediation_workers"] = 1
+        controller.config["remediation_backoff_base"] = 0.01
+        controller._start_remediation_workers()
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
+        calls = []
+
+        def flaky(failed_pod):
+            calls.append(failed_pod)
+            if len(calls) == 1:
+                raise RuntimeError("apiserver unavailable")
+
+        controller._dispatch_remediation(pod, flaky)
+
+        deadline = time.time() + 2
+        while len(calls) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        controller.stop()
+
+        assert [record.key for record in calls] == ["default/app-1", "default/app-1"]
+
+    def test_handle_pod_failure_respects_cooldown(self, controller):
+        """Test a pod is not remediated again while cooling down"""
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
+        pod.metadata.labels = {}
+
+        with patch.object(controller, "_restart_pod") as mock_restart:
+            controller._handle_pod_failure(pod)
+            controller._handle_pod_failure(pod)
+
+        mock_restart.assert_called_once()
+        assert controller.get_metrics()["last_checks"] == 1
+
+    def _owned_pod(self, name, owner_kind="ReplicaSet", owner_name="web-5d9c"):
+        """Create a failing pod owned by a controller"""
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = name
+        pod.metadata.labels = {}
+        owner = MagicMock()
+        owner.kind = owner_kind
+        owner.name = owner_name
+        owner.controller = True
+        pod.metadata.owner_references = [owner]
+        return pod
+
+    def test_failing_pods_are_grouped_by_workload(self, controller):
+        """Test failing pods of one Deployment become a single rollout restart"""
+        controller.apps_client = MagicMock()
+        controller.workload_resolver.apps_client = controller.apps_client
+        deployment_owner = MagicMock()
+        deployment_owner.kind = "Deployment"
+        deployment_owner.name = "web"
+        deployment_owner.controller = True
+        controller.apps_client.read_namespaced_replica_set.return_value.metadata.owner_references = [deployment_owner]
+
+        with patch.object(controller, "_restart_pod") as mock_restart:
+            for index in range(5):
+                controller._dispatch_remediation(self._owned_pod(f"web-{index}"), controller._handle_pod_failure)
+            controller._flush_pending_remediations()
+
+        mock_restart.assert_not_called()
+        controller.apps_client.patch_namespaced_deployment.assert_called_once()
+        body = controller.apps_client.patch_namespaced_deployment.call_args[1]["body"]
+        assert "kubectl.kubernetes.io/restartedAt" in body["spec"]["template"]["metadata"]["annotations"]
+        # The ReplicaSet owner is only looked up once
+        assert controller.apps_client.read_namespaced_replica_set.call_count == 1
+
+    def test_single_failing_pod_of_workload_is_restarted(self, controller):
+        """Test a lone failing pod is deleted instead of restarting its workload"""
+        controller.apps_client = MagicMock()
+
+        with patch.object(controller, "_restart_pod") as mock_restart:
+            pod = self._owned_pod("db-0", owner_kind="StatefulSet", owner_name="db")
+            controller._dispatch_remediation(pod, controller._handle_pod_failure)
+            controller._flush_pending_remediations()
+
+        mock_restart.assert_called_once()
+        assert mock_restart.call_args[0][0].key == "default/db-0"
+        controller.apps_client.patch_namespaced_stateful_set.assert_not_called()
+
+    def test_workload_group_waits_for_batch_window(self, controller):
+        """Test workload groups are queued once, after the batch window"""
+        controller.remediation_queue = MagicMock()
+
+        for index in range(3):
+            pod = self._owned_pod(f"db-{index}", owner_kind="StatefulSet", owner_name="db")
+            controller._dispatch_remediation(pod, controller._handle_pod_failure)
+
+        controller.remediation_queue.add_after.assert_called_once_with("statefulset/default/db", 5, 2)
+        assert len(controller.pending_remediations["statefulset/default/db"][1]) == 3
+
+    def test_pods_on_not_ready_node_are_suppressed(self, controller):
+        """Test a NotReady node raises one incident instead of a delete per pod"""
+        cluster = FakeCluster()
+        cluster.populate(pods=100, nodes=4, namespaces=2)
+        cluster.install(controller)
+        cluster.set_node_ready("node-0000", False)
+        failed = cluster.pods_on_node("node-0001")[0]
+        cluster.fail_pod(failed)
+
+        controller._check_pods()
+
+        assert cluster.actions_for("delete_pod") == [failed]
+        notifications = {title: detail for _, verb, title, detail in cluster.actions if verb == "slack"}
+        assert sorted(notifications) == ["🚨 Node Failure: node-0000", f"🚨 Pod Failure: {failed.split('/')[1]}"]
+        assert f"{len(cluster.pods_on_node('node-0000'))} pods" in notifications["🚨 Node Failure: node-0000"]
+        assert cluster.calls["list_nodes"] == 1
+        metrics = controller.get_metrics()
+        assert metrics["suppressed_pods"] == len(cluster.pods_on_node("node-0000"))
+        assert metrics["nodes_not_ready"] == 1
+
+    def _deliver_node_leases(self, controller, event_type="ADDED"):
+        """Feed every node lease to the controller as an informer would"""
+        leases = controller.coordination_client.list_namespaced_lease(namespace="kube-node-lease")
+        for lease in leases.items:
+            controller._on_node_lease_event(event_type, lease)
+
+    def test_stale_node_lease_is_confirmed_with_one_read(self, controller):
+        """Test a node that stops renewing its lease is confirmed down with a single node read"""
+        cluster = FakeCluster()
+        cluster.populate(pods=40, nodes=4, namespaces=1)
+        cluster.install(controller)
+        self._deliver_node_leases(controller)
+        for index in range(4):
+            cluster.renew_node_lease(f"node-{index:04d}", datetime.datetime.now(datetime.timezone.utc))
+        self._deliver_node_leases(controller, "MODIFIED")
+        controller.node_heartbeats.nodes["node-0000"].seen_at -= 60
+        cluster.reset_counters()
+
+        controller._check_node_leases()
+        controller._check_node_leases()
+
+        # One read confirms the node down, one more re-checks it right before the reboot
+        assert cluster.calls["read_node"] == 2
+        assert cluster.calls["list_nodes"] == 0
+        assert list(controller.node_failures) == ["node-0000"]
+        assert controller.cluster_index.node_ready("node-0000") is False
+        assert controller.cluster_index.node_ready("node-0001") is True
+        assert cluster.actions_for("patch_node") == ["node-0000"]
+
+        cluster.renew_node_lease("node-0000", datetime.datetime.now(datetime.timezone.utc))
+        self._deliver_node_leases(controller, "MODIFIED")
+
+        assert controller.node_failures == {}
+        assert controller.cluster_index.node_ready("node-0000") is True
+        assert "node/node-0000" not in controller.cooldowns
+
+    def test_stale_lease_before_any_renewal_needs_node_agreement(self, controller):
+        """Test a lease that was never seen renewing only counts once the node is not Ready"""
+        cluster = FakeCluster()
+        cluster.populate(pods=10, nodes=1, namespaces=1)
+        cluster.install(controller)
+        self._deliver_node_leases(controller)
+        controller.node_heartbeats.nodes["node-0000"].seen_at -= 60
+
+        controller._check_node_leases()
+        assert controller.node_failures == {}
+
+        cluster.set_node_ready("node-0000", False)
+        controller.node_heartbeats.nodes["node-0000"].checked_at -= 60
+        controller._check_node_leases()
+        assert list(controller.node_failures) == ["node-0000"]
+
+    def test_zone_outage_reboots_within_budget(self, controller):
+        """Test a zone going NotReady reboots one node at a time, spaced out, with the queue persisted"""
+        cluster = FakeCluster()
+        cluster.populate(pods=40, nodes=8, namespaces=1, zones=2)
+        cluster.install(controller)
+        zone_a = [f"node-{index:04d}" for index in range(0, 8, 2)]
+        for node_name in zone_a:
+            cluster.set_node_ready(node_name, False, fail_pods=False)
+
+        controller._check_nodes()
+        controller._check_nodes()
+
+        assert cluster.actions_for("patch_node") == ["node-0000"]
+        assert controller.get_metrics()["reboots_pending"] == 3
+        assert "self-healing/self-healing-disruption" in cluster.objects["configmaps"]
+
+        cluster.set_node_ready("node-0000", True, fail_pods=False)
+        controller._check_nodes()
+        assert cluster.actions_for("patch_node") == ["node-0000"]
+
+        controller.reboot_scheduler.last_reboot_at -= controller.config["reboot_spacing_seconds"]
+        controller._check_nodes()
+        assert cluster.actions_for("patch_node") == ["node-0000", "node-0002"]
+
+    def _restore_reboots(self, cluster, in_flight, pending):
+        """Persist reboots as a previous leader would have left them"""
+        previous = RebootScheduler(
+            max_concurrent=1,
+            spacing=0,
+            store=ConfigMapState(cluster.core_v1, "self-healing-disruption", "self-healing"),
+        )
+        previous.load()
+        for index, node_name in enumerate(in_flight + pending):
+            previous.request(node_name, "zone-a", down_since=float(index))
+        if in_flight:
+            assert previous.due() == in_flight
+
+    def test_restored_reboot_of_recovered_node_is_not_triggered(self, controller):
+        """Test a queued reboot restored for a node that is Ready by now is dropped instead of annotated"""
+        cluster = FakeCluster()
+        cluster.populate(pods=20, nodes=4, namespaces=1, zones=1)
+        cluster.install(controller)
+        self._restore_reboots(cluster, in_flight=[], pending=["node-0001"])
+
+        # Nothing indexed the node yet, so only the read before annotating can tell it recovered
+        controller._schedule_reboots()
+
+        assert cluster.actions_for("patch_node") == []
+        assert controller.reboot_scheduler.snapshot() == {"pending": 0, "in_flight": 0}
+
+    def test_restored_reboots_of_recovered_nodes_release_the_budget(self, controller):
+        """Test queued and in-flight reboots restored for Ready nodes stop holding the budget"""
+        cluster = FakeCluster()
+        cluster.populate(pods=20, nodes=4, namespaces=1, zones=1)
+        cluster.install(controller)
+        self._restore_reboots(cluster, in_flight=["node-0000"], pending=["node-0001"])
+
+        controller._check_nodes()
+
+        assert cluster.actions_for("patch_node") == []
+        assert controller.reboot_scheduler.snapshot() == {"pending": 0, "in_flight": 0}
+        assert ConfigMapState(cluster.core_v1, "self-healing-disruption", "self-healing").load()["in_flight"] == {}
+
+    def test_check_nodes_skipped_when_not_leader(self, controller):
+        """Test followers leave node handling to the leader"""
+        controller.leader_lock = MagicMock()
+        controller.leader_lock.is_held.return_value = False
+
+        controller._check_nodes()
+
+        controller.k8s_client.list_node.assert_not_called()
+
+    def test_evaluate_pod_skips_foreign_shard(self, controller):
+        """Test pods in namespaces owned by another replica are ignored"""
+        controller.shard_membership = MagicMock()
+        controller.shard_membership.owns.return_value = False
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.name = "app-1"
+        pod.metadata.deletion_timestamp = None
+        pod.status.phase = "Failed"
+
+        with patch.object(controller, "_dispatch_remediation") as mock_dispatch:
+            controller._evaluate_pod(pod)
+
+        mock_dispatch.assert_not_called()
+        controller.shard_membership.owns.assert_called_once_with("default")
+
 
 class TestControllerIntegration:
     """Integration tests for Self-Healing Controller"""
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the remediation cooldown store
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading  # noqa: E402
+
+from cooldown import CooldownStore  # noqa: E402
+
+
+class TestCooldownStore:
+    """Test cases for the CooldownStore"""
+
+    def test_first_remediation_is_allowed(self):
+        """Test an unknown key can be remediated immediately"""
+        store = CooldownStore()
+
+        assert store.try_acquire("default/app-1", 60, now=1000) is True
+        assert "default/app-1" in store
+
+    def test_repeated_remediation_backs_off_exponentially(self):
+        """Test the cooldown doubles with each consecutive remediation"""
+        store = CooldownStore(max_delay=1000)
+
+        assert store.try_acquire("key", 60, now=0)
+        assert not store.try_acquire("key", 60, now=59)
+        assert store.try_acquire("key", 60, now=60)
+        assert not store.try_acquire("key", 60, now=60 + 119)
+        assert store.try_acquire("key", 60, now=60 + 120)
+        assert store.attempts("key") == 3
+
+    def test_backoff_is_capped(self):
+        """Test the cooldown never exceeds max_delay"""
+        store = CooldownStore(max_delay=100)
+
+        assert store.cooldown(60, 10) == 100
+
+    def test_quiet_keys_expire_after_ttl(self):
+        """Test keys are forgotten once they have been quiet longer than the TTL"""
+        store = CooldownStore(ttl=600)
+        store.try_acquire("key", 60, now=0)
+        store.try_acquire("key", 60, now=60)
+
+        store.try_acquire("other", 60, now=1000)
+
+        assert "key" not in store
+        assert len(store) == 1
+
+    def test_size_cap_evicts_least_recently_remediated(self):
+        """Test the store never grows beyond max_entries"""
+        store = CooldownStore(max_entries=2)
+        store.try_acquire("a", 60, now=0)
+        store.try_acquire("b", 60, now=1)
+        store.try_acquire("c", 60, now=2)
+
+        assert len(store) == 2
+        assert "a" not in store
+        assert "c" in store
+
+    def test_reset_forgets_key(self):
+        """Test reset clears the backoff for a key"""
+        store = CooldownStore()
+        store.try_acquire("key", 60, now=0)
+
+        store.reset("key")
+
+        assert store.try_acquire("key", 60, now=1) is True
+
+    def test_concurrent_acquire_grants_once(self):
+        """Test only one thread wins the remediation for a key"""
+        store = CooldownStore()
+        results = []
+
+        def acquire():
+            results.append(store.try_acquire("key", 60, now=0))
+
+        threads = [threading.Thread(target=acquire) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count(True) == 1
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Unit tests for leader election and namespace sharding
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy  # noqa: E402
+import datetime  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+
+import pytest  # noqa: E402
+from coordination import LeaseLock, ShardMembership, ShardRing  # noqa: E402
+
+from kubernetes.client.rest import ApiException  # noqa: E402
+
+
+class FakeLeaseApi:
+    """In-memory stand-in for CoordinationV1Api leases with optimistic concurrency"""
+
+    def __init__(self):
+        self.leases = {}
+        self.version = 0
+        # Makes every update fail, as during an apiserver outage
+        self.fail_replace = False
+
+    def _bump(self, lease):
+        self.version += 1
+        lease.metadata.resource_version = str(self.version)
+
+    def read_namespaced_lease(self, name, namespace):
+        if (namespace, name) not in self.leases:
+            raise ApiException(status=404, reason="Not Found")
+        return copy.deepcopy(self.leases[(namespace, name)])
+
+    def create_namespaced_lease(self, namespace, body):
+        key = (namespace, body.metadata.name)
+        if key in self.leases:
+            raise ApiException(status=409, reason="AlreadyExists")
+        lease = copy.deepcopy(body)
+        self._bump(lease)
+        self.leases[key] = lease
+        return lease
+
+    def replace_namespaced_lease(self, name, namespace, body):
+        if self.fail_replace:
+            raise ApiException(status=503, reason="Service Unavailable")
+        current = self.leases[(namespace, name)]
+        if body.metadata.resource_version != current.metadata.resource_version:
+            raise ApiException(status=409, reason="Conflict")
+        lease = copy.deepcopy(body)
+        self._bump(lease)
+        self.leases[(namespace, name)] = lease
+        return lease
+
+    def list_namespaced_lease(self, namespace, label_selector=None):
+        key, _, value = (label_selector or "").partition("=")
+        items = [
+            copy.deepcopy(lease)
+            for (lease_namespace, _), lease in self.leases.items()
+            if lease_namespace == namespace and (not key or (lease.metadata.labels or {}).get(key) == value)
+        ]
+        return SimpleNamespace(items=items)
+
+
+def at(seconds):
+    """Get a fixed point in time offset by seconds"""
+    return datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(seconds=seconds)
+
+
+class TestLeaseLock:
+    """Test cases for leader election"""
+
+    @pytest.fixture
+    def api(self):
+        """Create an in-memory lease API"""
+        return FakeLeaseApi()
+
+    def _lock(self, api, identity):
+        return LeaseLock(api, "leader", "self-healing", identity, lease_duration=15)
+
+    def test_first_replica_becomes_leader(self, api):
+        """Test the first replica creates the lease and leads"""
+        lock = self._lock(api, "replica-a")
+
+        assert lock.try_acquire_or_renew(at(0)) is True
+        assert lock.is_held(at(1))
+
+    def test_second_replica_waits_for_expiry(self, api):
+        """Test another replica only takes over once the lease expires"""
+        leader = self._lock(api, "replica-a")
+        follower = self._lock(api, "replica-b")
+        leader.try_acquire_or_renew(at(0))
+
+        assert follower.try_acquire_or_renew(at(10)) is False
+        assert follower.try_acquire_or_renew(at(16)) is True
+        assert api.leases[("self-healing", "leader")].spec.lease_transitions == 1
+
+    def test_renewal_keeps_leadership(self, api):
+        """Test a renewing leader is never displaced"""
+        leader = self._lock(api, "replica-a")
+        follower = self._lock(api, "replica-b")
+
+        for second in range(0, 60, 5):
+            assert leader.try_acquire_or_renew(at(second))
+            assert not follower.try_acquire_or_renew(at(second + 1))
+
+    def test_leadership_lapses_without_renewal(self, api):
+        """Test a leader that cannot renew stops acting as leader"""
+        leader = self._lock(api, "replica-a")
+        leader.try_acquire_or_renew(at(0))
+
+        assert not leader.is_held(at(16))
+
+    def test_leader_steps_down_before_takeover(self, api):
+        """Test a leader whose renewals fail stops leading at the renew deadline, before anyone may take over"""
+        leader = LeaseLock(api, "leader", "self-healing", "replica-a", lease_duration=15, renew_deadline=10)
+        follower = self._lock(api, "replica-b")
+        leader.try_acquire_or_renew(at(0))
+        api.fail_replace = True
+
+        assert leader.try_acquire_or_renew(at(5)) is True
+        assert leader.try_acquire_or_renew(at(10)) is False
+        assert not leader.is_held(at(10))
+
+        api.fail_replace = False
+        assert follower.try_acquire_or_renew(at(14)) is False
+        assert follower.try_acquire_or_renew(at(16)) is True
+
+    def test_release_allows_immediate_takeover(self, api):
+        """Test a released lease can be taken over right away"""
+        leader = self._lock(api, "replica-a")
+        follower = self._lock(api, "replica-b")
+        leader.try_acquire_or_renew(at(0))
+
+        leader.release()
+
+        assert follower.try_acquire_or_renew(at(1)) is True
+
+
+class TestSharding:
+    """Test cases for namespace sharding"""
+
+    def test_ring_spreads_namespaces(self):
+        """Test every replica owns a share of the namespaces"""
+        ring = ShardRing(["a", "b", "c"])
+        owners = [ring.owner(f"namespace-{index}") for index in range(300)]
+
+        for member in ("a", "b", "c"):
+            assert owners.count(member) > 50
+
+    def test_ring_moves_few_namespaces_on_join(self):
+        """Test adding a replica only moves the namespaces it takes over"""
+        before = ShardRing(["a", "b", "c"])
+        after = ShardRing(["a", "b", "c", "d"])
+        namespaces = [f"namespace-{index}" for index in range(1000)]
+
+        moved = [ns for ns in namespaces if before.owner(ns) != after.owner(ns)]
+
+        assert all(after.owner(ns) == "d" for ns in moved)
+        assert len(moved) < 400
+
+    def test_members_partition_namespaces(self):
+        """Test live replicas agree on exactly one owner per namespace"""
+        api = FakeLeaseApi()
+        members = [ShardMembership(api, "self-healing", name, "controller") for name in ("a", "b", "c")]
+
+        for _ in range(2):
+            for member in members:
+                member.heartbeat(at(0))
+
+        for index in range(100):
+            namespace = f"namespace-{index}"
+            assert sum(member.owns(namespace) for member in members) == 1
+
+    def test_dead_member_is_rebalanced(self):
+        """Test namespaces of an expired replica move to the survivors"""
+        api = FakeLeaseApi()
+        a, b = (ShardMembership(api, "self-healing", name, "controller", lease_duration=15) for name in ("a", "b"))
+        a.heartbeat(at(0))
+        b.heartbeat(at(0))
+        a.heartbeat(at(0))
+
+        a.heartbeat(at(30))
+
+        assert a.ring.members == ["a"]
+        assert all(a.owns(f"namespace-{index}") for index in range(20))
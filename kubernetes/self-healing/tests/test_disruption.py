@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Kured reboot disruption budget
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disruption import ConfigMapState, RebootScheduler  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+
+
+def scheduler(**kwargs):
+    """Create a scheduler for two zones of eight nodes"""
+    kwargs.setdefault("spacing", 0)
+    reboots = RebootScheduler(**kwargs)
+    reboots.set_zones({f"node-{zone}{index}": zone for zone in "ab" for index in range(8)})
+    return reboots
+
+
+class TestRebootScheduler:
+    """Test cases for RebootScheduler"""
+
+    def test_longest_down_node_reboots_first(self):
+        """Test reboots are released in order of how long nodes have been down"""
+        reboots = scheduler(max_concurrent=1)
+        reboots.request("node-a1", "a", down_since=300.0)
+        reboots.request("node-a2", "a", down_since=100.0)
+        reboots.request("node-b1", "b", down_since=200.0)
+
+        assert reboots.due(now=1000.0) == ["node-a2"]
+        assert reboots.due(now=1001.0) == []
+
+        reboots.complete("node-a2")
+        assert reboots.due(now=1002.0) == ["node-b1"]
+
+    def test_zone_fraction_limits_a_zone_wide_outage(self):
+        """Test a zone losing every node only reboots its share while other zones proceed"""
+        reboots = scheduler(max_concurrent=10, max_zone_fraction=0.25)
+        for index in range(8):
+            reboots.request(f"node-a{index}", "a", down_since=float(index))
+        reboots.request("node-b0", "b", down_since=50.0)
+
+        assert reboots.due(now=1000.0) == ["node-a0", "node-a1", "node-b0"]
+        assert reboots.snapshot() == {"pending": 6, "in_flight": 3}
+
+    def test_spacing_between_reboots(self):
+        """Test only one reboot starts per spacing interval"""
+        reboots = scheduler(max_concurrent=5, spacing=300)
+        reboots.request("node-a1", "a", down_since=1.0)
+        reboots.request("node-b1", "b", down_since=2.0)
+
+        assert reboots.due(now=1000.0) == ["node-a1"]
+        assert reboots.due(now=1200.0) == []
+        assert reboots.due(now=1300.0) == ["node-b1"]
+
+    def test_stuck_reboot_frees_its_slot(self):
+        """Test a reboot that never completes stops holding the budget after the timeout"""
+        reboots = scheduler(max_concurrent=1, reboot_timeout=600)
+        reboots.request("node-a1", "a", down_since=1.0)
+        reboots.request("node-a2", "a", down_since=2.0)
+
+        assert reboots.due(now=1000.0) == ["node-a1"]
+        assert reboots.due(now=1500.0) == []
+        assert reboots.due(now=1601.0) == ["node-a2"]
+
+    def test_duplicates_cancellation_and_abort(self):
+        """Test repeated requests are ignored, recovered nodes dropped and failed starts re-queued"""
+        reboots = scheduler(max_concurrent=1)
+        assert reboots.request("node-a1", "a", down_since=1.0)
+        assert not reboots.request("node-a1", "a", down_since=5.0)
+        reboots.request("node-a2", "a", down_since=2.0)
+        reboots.complete("node-a1")
+
+        assert reboots.due(now=1000.0) == ["node-a2"]
+        reboots.abort("node-a2")
+        assert reboots.snapshot() == {"pending": 1, "in_flight": 0}
+        assert reboots.due(now=1001.0) == ["node-a2"]
+
+
+class TestConfigMapState:
+    """Test cases for persisting the budget in a ConfigMap"""
+
+    def test_restart_keeps_the_budget(self):
+        """Test a new scheduler picks up queued and in-flight reboots"""
+        cluster = FakeCluster()
+        first = scheduler(max_concurrent=1, store=ConfigMapState(cluster.core_v1, "disruption", "self-healing"))
+        first.load()
+        first.request("node-a1", "a", down_since=1.0)
+        first.request("node-a2", "a", down_since=2.0)
+        assert first.due(now=1000.0) == ["node-a1"]
+
+        second = scheduler(max_concurrent=1, store=ConfigMapState(cluster.core_v1, "disruption", "self-healing"))
+        second.load()
+
+        assert second.snapshot() == {"pending": 1, "in_flight": 1}
+        assert second.due(now=1001.0) == []
+        second.complete("node-a1")
+        assert second.due(now=1002.0) == ["node-a2"]
+
+    def test_conflicting_writer_wins(self):
+        """Test a stale writer reloads instead of overwriting and starts nothing"""
+        cluster = FakeCluster()
+        first = scheduler(max_concurrent=1, store=ConfigMapState(cluster.core_v1, "disruption", "self-healing"))
+        first.load()
+        first.request("node-a1", "a", down_since=1.0)
+        second = scheduler(max_concurrent=1, store=ConfigMapState(cluster.core_v1, "disruption", "self-healing"))
+        second.load()
+        assert second.due(now=1000.0) == ["node-a1"]
+
+        assert first.due(now=1000.0) == []
+        assert first.snapshot() == {"pending": 0, "in_flight": 1}
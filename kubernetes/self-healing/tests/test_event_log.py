@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit tests for recording and replaying cluster event streams
+"""
+
+import gzip
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_log import EventRecorder, EventReplayer, RecordingApi, read_log, replay_controller  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from informer import list_pages  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+
+
+class Clock:
+    """Clock advanced by hand"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def record_watch(api, resource_version):
+    """Drain the pending watch events of a recording API"""
+    response = api.list_pod_for_all_namespaces(
+        watch=True, _preload_content=False, resource_version=resource_version, timeout_seconds=0.01
+    )
+    return list(response.stream())
+
+
+class TestEventRecorder:
+    def test_records_lists_and_watch_events(self, tmp_path):
+        """Test raw and model LISTs and watch lines are appended as records"""
+        path = str(tmp_path / "events.jsonl.gz")
+        cluster = FakeCluster()
+        cluster.populate(pods=20, nodes=2, namespaces=1)
+        recorder = EventRecorder(path)
+        api = RecordingApi(cluster.core_v1, recorder)
+
+        pages = list(list_pages(lambda **kwargs: api.list_pod_for_all_namespaces(**kwargs), 8))
+        api.list_node()
+        api.list_pod_for_all_namespaces(_preload_content=False)
+        version = cluster.resource_version
+        cluster.fail_pod(sorted(cluster.objects["pods"])[0])
+        lines = record_watch(api, version)
+        recorder.close()
+
+        records = list(read_log(path))
+        assert len(pages) == 3
+        assert [(record["kind"], "list" in record) for record in records] == [("pods", True)] * 3 + [
+            ("nodes", True),
+            ("pods", True),
+            ("pods", False),
+        ]
+        assert sum(len(record["list"]["items"]) for record in records[:3]) == 20
+        assert records[-1]["watch"]["type"] == "MODIFIED"
+        assert len(lines) == 1
+
+    def test_appends_across_restarts_and_survives_torn_tail(self, tmp_path):
+        """Test a reopened log keeps earlier records and a truncated tail is ignored"""
+        path = str(tmp_path / "events.jsonl.gz")
+        for _ in range(2):
+            recorder = EventRecorder(path)
+            recorder.record("pods", "watch", b'{"type":"ADDED","object":{"metadata":{"name":"a"}}}')
+            recorder.close()
+
+        with open(path, "ab") as f:
+            f.write(gzip.compress(b'{"t":1,"kind":"pods","watch":{"type":"ADD')[:-12])
+
+        assert len(list(read_log(path))) == 2
+
+    def test_controller_records_when_configured(self, tmp_path):
+        """Test EVENT_LOG_PATH wraps the controller's clients"""
+        path = str(tmp_path / "events.jsonl.gz")
+        with patch.dict(os.environ, {"EVENT_LOG_PATH": path}):
+            with patch("self_healing_controller.config.load_incluster_config"):
+                with patch("self_healing_controller.client.CoreV1Api"):
+                    controller = SelfHealingController()
+
+        assert isinstance(controller.k8s_client, RecordingApi)
+        assert isinstance(controller.coordination_client, RecordingApi)
+        controller.stop()
+
+
+class TestEventReplayer:
+    def test_replay_reproduces_cluster_state(self, tmp_path):
+        """Test a LIST followed by watch events rebuilds the recorded objects"""
+        path = str(tmp_path / "events.jsonl.gz")
+        clock = Clock()
+        source = FakeCluster()
+        source.populate(pods=20, nodes=2, namespaces=1)
+        recorder = EventRecorder(path, clock=clock)
+        api = RecordingApi(source.core_v1, recorder)
+
+        api.list_pod_for_all_namespaces(_preload_content=False)
+        version = source.resource_version
+        failed = sorted(source.objects["pods"])[:3]
+        for key in failed:
+            source.fail_pod(key)
+        source.delete_pod(sorted(source.objects["pods"])[-1])
+        clock.now += 30
+        record_watch(api, version)
+        recorder.close()
+
+        target = FakeCluster(replace_deleted_pods=False)
+        EventReplayer(target).replay(read_log(path))
+
+        assert sorted(target.objects["pods"]) == sorted(source.objects["pods"])
+        assert sorted(target.failing_pods()) == sorted(failed)
+
+    def test_later_list_removes_missing_objects(self):
+        """Test a relist drops objects it no longer contains"""
+        target = FakeCluster(replace_deleted_pods=False)
+        replayer = EventReplayer(target)
+        node = {"metadata": {"name": "node-a"}, "status": {}}
+
+        replayer.apply({"t": 1, "kind": "nodes", "list": {"metadata": {}, "items": [node]}})
+        replayer.apply({"t": 2, "kind": "nodes", "list": {"metadata": {}, "items": []}})
+
+        assert target.objects["nodes"] == {}
+
+    def test_ticks_follow_log_time(self):
+        """Test on_tick runs on the log's clock, seeing only earlier records"""
+        target = FakeCluster(replace_deleted_pods=False)
+        seen = []
+        records = [
+            {"t": 100 + t, "kind": "nodes", "watch": {"type": "ADDED", "object": {"metadata": {"name": f"n{t}"}}}}
+            for t in (0, 5, 25)
+        ]
+
+        elapsed = EventReplayer(target).replay(
+            records, on_tick=lambda t: seen.append((t, len(target.objects["nodes"]))), tick_interval=10
+        )
+
+        assert elapsed == 25
+        assert seen == [(10, 2), (20, 2), (25, 3)]
+
+
+class TestReplayController:
+    def test_replayed_storm_is_remediated(self, tmp_path):
+        """Test replaying a recorded failure storm drives the controller to the same deletes"""
+        path = str(tmp_path / "events.jsonl.gz")
+        clock = Clock()
+        source = FakeCluster()
+        source.populate(pods=100, nodes=4, namespaces=2)
+        recorder = EventRecorder(path, clock=clock)
+        api = RecordingApi(source.core_v1, recorder)
+        api.list_pod_for_all_namespaces(_preload_content=False)
+        api.list_node()
+        version = source.resource_version
+        failed = source.mass_failure(0.1)
+        clock.now += 60
+        record_watch(api, version)
+        recorder.close()
+
+        target = FakeCluster(replace_deleted_pods=False)
+        controller = SelfHealingController(clients=target)
+        controller.config["check_interval"] = 30
+        controller.config["workload_batching_enabled"] = False
+        summary = replay_controller(controller, target, path)
+
+        assert summary["records"] == 2 + len(failed)
+        assert summary["log_seconds"] == 60
+        assert summary["scans"]["pods"] == 3
+        assert sorted(target for verb, target in summary["actions"] if verb == "delete_pod") == sorted(failed)
+        assert summary["action_counts"]["delete_pod"] == len(failed)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-process fake Kubernetes API
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json  # noqa: E402
+
+import pytest  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from informer import list_pages  # noqa: E402
+from pod_records import raw_pod_lister  # noqa: E402
+
+from kubernetes import watch  # noqa: E402
+from kubernetes.client.rest import ApiException  # noqa: E402
+
+
+@pytest.fixture
+def cluster():
+    """Create a small populated fake cluster"""
+    cluster = FakeCluster()
+    cluster.populate(pods=100, nodes=4, namespaces=5)
+    return cluster
+
+
+class TestListing:
+    """Test cases for LIST requests"""
+
+    def test_pagination_returns_every_pod_once(self, cluster):
+        """Test limit/continue pages cover the whole cluster"""
+        pages = list(list_pages(cluster.core_v1.list_pod_for_all_namespaces, 30))
+
+        names = [pod.metadata.name for page in pages for pod in page.items]
+        assert len(pages) == 4
+        assert len(names) == len(set(names)) == 100
+        assert cluster.calls["list_pods"] == 4
+
+    def test_field_and_label_selectors(self, cluster):
+        """Test field and label selectors filter server-side"""
+        api = cluster.core_v1
+
+        excluded = api.list_pod_for_all_namespaces(field_selector="metadata.namespace!=team-000")
+        selected = api.list_pod_for_all_namespaces(label_selector="app=app-00001")
+
+        assert len(excluded.items) == 80
+        assert {pod.metadata.labels["app"] for pod in selected.items} == {"app-00001"}
+
+    def test_raw_listing_matches_models(self, cluster):
+        """Test _preload_content=False serves the same pods as raw JSON"""
+        records = raw_pod_lister(cluster.core_v1.list_pod_for_all_namespaces)(limit=10)
+        models = cluster.core_v1.list_pod_for_all_namespaces(limit=10)
+
+        assert [record.key for record in records.items] == [
+            f"{pod.metadata.namespace}/{pod.metadata.name}" for pod in models.items
+        ]
+        assert records.metadata._continue == models.metadata._continue
+
+
+class TestWatch:
+    """Test cases for WATCH requests"""
+
+    def test_watch_resumes_from_resource_version(self, cluster):
+        """Test a watch only streams changes after its resourceVersion"""
+        version = cluster.core_v1.list_pod_for_all_namespaces(limit=1).metadata.resource_version
+        key = sorted(cluster.objects["pods"])[0]
+        cluster.fail_pod(key)
+
+        events = list(
+            watch.Watch().stream(
+                cluster.core_v1.list_pod_for_all_namespaces, resource_version=version, timeout_seconds=1
+            )
+        )
+
+        assert [(event["type"], event["object"].metadata.name) for event in events] == [("MODIFIED", key.split("/")[1])]
+
+    def test_expired_resource_version_is_gone(self):
+        """Test a watch older than the retained history fails with 410"""
+        cluster = FakeCluster(watch_history=10)
+        cluster.populate(pods=50, nodes=1, namespaces=1)
+
+        with pytest.raises(ApiException) as error:
+            list(
+                watch.Watch().stream(
+                    cluster.core_v1.list_pod_for_all_namespaces, resource_version="1", timeout_seconds=1
+                )
+            )
+
+        assert error.value.status == 410
+
+
+class TestFailureInjection:
+    """Test cases for failure patterns and simulated controllers"""
+
+    def test_deleted_pod_is_replaced(self, cluster):
+        """Test deleting a ReplicaSet pod creates a healthy replacement"""
+        key = cluster.mass_failure(0.1)[0]
+        namespace, name = key.split("/")
+
+        cluster.core_v1.delete_namespaced_pod(name=name, namespace=namespace)
+
+        assert key not in cluster.objects["pods"]
+        assert len(cluster.objects["pods"]) == 100
+        assert cluster.actions_for("delete_pod") == [key]
+        assert len(cluster.failing_pods()) == 9
+
+    def test_node_not_ready_fails_its_pods(self, cluster):
+        """Test a NotReady node takes its pods down with it"""
+        cluster.set_node_ready("node-0000", False)
+
+        assert set(cluster.failing_pods()) == set(cluster.pods_on_node("node-0000"))
+
+        cluster.set_node_ready("node-0000", True)
+
+        assert cluster.failing_pods() == []
+
+    def test_crash_loop_sets_last_state(self, cluster):
+        """Test crash loops bump restart counts and record the termination reason"""
+        key = sorted(cluster.objects["pods"])[0]
+
+        pod = cluster.crash_loop(key, restarts=6, reason="OOMKilled")
+
+        status = pod["status"]["containerStatuses"][0]
+        assert status["restartCount"] == 6
+        assert status["lastState"]["terminated"]["reason"] == "OOMKilled"
+        assert key in cluster.failing_pods()
+        assert json.loads(json.dumps(pod)) == pod
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the chaos game-day runner
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from gameday import (  # noqa: E402
+    FakeChaos,
+    GameDay,
+    Run,
+    experiment_type,
+    fake_game_day,
+    load_experiments,
+    parse_duration,
+    report,
+)
+
+EXPERIMENTS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "chaos-engineering", "chaos-experiments.yaml"
+)
+
+
+def experiment(kind="PodChaos", action="pod-failure", duration="30s", mode="one"):
+    """Build a Chaos Mesh experiment against the test-app pods"""
+    spec = {
+        "mode": mode,
+        "selector": {"namespaces": ["test-app"], "labelSelectors": {"app": "test-app"}},
+        "duration": duration,
+    }
+    if action:
+        spec["action"] = action
+    return {"kind": kind, "metadata": {"name": f"{action}-test", "namespace": "test-app"}, "spec": spec}
+
+
+class TestExperiments:
+    def test_loads_the_repository_experiments(self):
+        """Test every experiment of the chaos-engineering manifests gets a type"""
+        experiments = load_experiments(EXPERIMENTS)
+
+        assert [experiment_type(e) for e in experiments] == [
+            "PodChaos/pod-failure",
+            "NetworkChaos/delay",
+            "StressChaos/cpu",
+            "StressChaos/memory",
+            "PodChaos/container-kill",
+        ]
+
+    def test_parse_duration(self):
+        """Test Go durations are parsed into seconds"""
+        assert parse_duration("30s") == 30
+        assert parse_duration("1m30s") == 90
+        assert parse_duration("250ms") == 0.25
+        assert parse_duration(None) is None
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+
+class TestReport:
+    def test_percentiles_per_type(self):
+        """Test runs are summed up per experiment type, leaving out phases never reached"""
+        runs = []
+        for index in range(20):
+            run = Run(experiment(), [f"test-app/pod-{index}"], 100.0, 30, 5)
+            run.detected = 100.0 + 0.1 * (index + 1)
+            run.ready = 100.0 + (index + 1)
+            runs.append(run)
+
+        result = report(runs)
+
+        summary = result["summary"]["PodChaos/pod-failure"]
+        assert summary["runs"] == 20
+        assert summary["remediated"] == 0
+        assert "remediated_seconds" not in summary
+        assert summary["ready_seconds"] == {"p50": 11.0, "p95": 20.0, "max": 20.0}
+        assert summary["detected_seconds"]["max"] == 2.0
+        assert result["runs"][0]["remediated_seconds"] is None
+
+
+class TestFakeChaos:
+    def test_fault_clears_at_the_end_of_its_duration(self):
+        """Test a fault nobody remediates ends after the experiment's duration"""
+        cluster = FakeCluster()
+        cluster.add_deployment("test-app", "test-app", 3)
+        chaos = FakeChaos(cluster, SimpleNamespace(pod_failures={}), duration_scale=0.01)
+
+        (run,) = GameDay(chaos, timeout=5, poll_interval=0.01).run([experiment(duration="5s")])
+
+        assert run.remediated is None
+        assert 0.05 <= run.seconds("ready") < 1
+        assert cluster.failing_pods() == []
+        assert chaos.active == []
+
+    def test_parallel_runs_pick_different_pods(self):
+        """Test experiments injected together never share a target"""
+        cluster = FakeCluster()
+        cluster.add_deployment("test-app", "test-app", 3)
+        chaos = FakeChaos(cluster, SimpleNamespace(pod_failures={}), duration_scale=0.01)
+
+        runs = GameDay(chaos, timeout=5, poll_interval=0.01).run(
+            [experiment(duration="1s"), experiment(kind="NetworkChaos", action="delay", duration="1s")], parallel=True
+        )
+
+        assert len({target for run in runs for target in run.targets}) == 2
+
+
+class TestGameDay:
+    def test_controller_recovers_failed_pods(self):
+        """Test runs against a live controller time detection, remediation and return to Ready"""
+        experiments = [experiment(), experiment(action="container-kill")]
+        _, controller, chaos = fake_game_day(
+            experiments,
+            pods=50,
+            duration_scale=1,
+            seed=1,
+            config={"check_interval": 0.1, "workload_batching_enabled": False},
+        )
+        try:
+            runs = GameDay(chaos, timeout=10, poll_interval=0.01).run(experiments, repeat=2)
+        finally:
+            controller.stop()
+
+        assert [run.type for run in runs] == ["PodChaos/pod-failure", "PodChaos/container-kill"] * 2
+        for run in runs:
+            # Well before the 30s the faults would last on their own
+            assert run.detected <= run.remediated <= run.ready < run.injected_at + 10
+        summary = report(runs)["summary"]
+        assert summary["PodChaos/pod-failure"]["ready"] == 2
+        assert summary["PodChaos/container-kill"]["remediated"] == 2
+
+    def test_environment_wins_over_fake_defaults(self):
+        """Test settings from the environment override the fake game day's defaults"""
+        with patch.dict(os.environ, {"CHECK_INTERVAL": "7"}):
+            _, controller, _ = fake_game_day([experiment()], pods=10)
+        controller.stop()
+
+        assert controller.config["check_interval"] == 7
+        assert controller.config["health_port"] == 0
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the health, readiness and metrics HTTP server
+"""
+
+import http.client
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from health_server import HealthServer, json_snapshot  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+
+
+@pytest.fixture
+def serve():
+    """Start servers on free ports, stopping them after the test"""
+    servers = []
+
+    def start(build, interval=60, post_handlers=None):
+        server = HealthServer(build, host="127.0.0.1", port=0, interval=interval, post_handlers=post_handlers)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def connect(server):
+    """Open a connection to a server"""
+    return http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+
+def get(connection, path):
+    """Get a path, returning the status, content type and body"""
+    connection.request("GET", path)
+    response = connection.getresponse()
+    return response.status, response.getheader("Content-Type"), response.read()
+
+
+class TestHealthServer:
+    def test_serves_snapshots_over_one_keep_alive_connection(self, serve):
+        """Test many requests share a connection"""
+        server = serve(
+            lambda: {"/health": json_snapshot({"status": "healthy"}), "/metrics": (200, "text/plain", b"x 1\n")}
+        )
+        connection = connect(server)
+
+        for _ in range(20):
+            status, content_type, body = get(connection, "/health")
+            assert status == 200
+            assert content_type == "application/json"
+            assert json.loads(body) == {"status": "healthy"}
+        sock = connection.sock
+
+        assert get(connection, "/metrics?name=x") == (200, "text/plain", b"x 1\n")
+        assert connection.sock is sock
+        connection.close()
+
+    def test_unknown_path(self, serve):
+        """Test unknown paths are not found"""
+        server = serve(lambda: {})
+        connection = connect(server)
+
+        status, _, body = get(connection, "/nope")
+
+        assert status == 404
+        assert json.loads(body) == {"error": "not found"}
+        connection.close()
+
+    def test_post_handlers(self, serve):
+        """Test POSTs reach the handler of their path and oversized bodies are refused"""
+        received = []
+
+        def handle(headers, body):
+            received.append(body)
+            return json_snapshot({"ok": True})
+
+        server = serve(lambda: {}, post_handlers={"/hook": handle})
+        connection = connect(server)
+
+        connection.request("POST", "/hook", b'{"a": 1}')
+        assert connection.getresponse().read() == b'{"ok": true}'
+        connection.request("POST", "/nope", b"{}")
+        response = connection.getresponse()
+        assert (response.status, response.read()) == (404, b'{"error": "not found"}')
+        connection.request("POST", "/hook", headers={"Content-Length": str(2 << 20)})
+        assert connection.getresponse().status == 413
+        assert received == [b'{"a": 1}']
+        connection.close()
+
+    def test_refresh_publishes_new_snapshots(self, serve):
+        """Test a refresh replaces what is served"""
+        state = {"count": 0}
+
+        def build():
+            state["count"] += 1
+            return {"/health": json_snapshot({"count": state["count"]})}
+
+        server = serve(build)
+        connection = connect(server)
+        assert json.loads(get(connection, "/health")[2]) == {"count": 1}
+
+        server.refresh()
+
+        assert json.loads(get(connection, "/health")[2]) == {"count": 2}
+        connection.close()
+
+    def test_failed_refresh_keeps_previous_snapshots(self, serve):
+        """Test a build error leaves the last snapshots in place"""
+        build = MagicMock(side_effect=[{"/health": json_snapshot({"ok": True})}, RuntimeError("boom")])
+        server = serve(build)
+
+        server.refresh()
+
+        assert get(connect(server), "/health")[0] == 200
+
+
+class TestControllerEndpoints:
+    @pytest.fixture
+    def controller(self):
+        """Create a test controller instance"""
+        with patch("self_healing_controller.config.load_incluster_config"):
+            with patch("self_healing_controller.client.CoreV1Api"):
+                return SelfHealingController()
+
+    def test_ready_waits_for_informer_sync(self, controller):
+        """Test /ready fails until the pod informer has synced"""
+        controller.running = True
+        controller.config["pod_watch_enabled"] = True
+        controller.pod_informer = MagicMock()
+        controller.pod_informer.name = "pod-informer"
+        controller.pod_informer.has_synced.return_value = False
+
+        status, _, body = controller._endpoint_snapshots()["/ready"]
+        assert status == 503
+        assert json.loads(body)["synced"] == {"pod-informer": False}
+
+        controller.pod_informer.has_synced.return_value = True
+        status, _, body = controller._endpoint_snapshots()["/ready"]
+        assert status == 200
+        assert json.loads(body)["status"] == "ready"
+
+    def test_ready_waits_for_first_scan_when_polling(self, controller):
+        """Test /ready fails until the first pod scan when not watching"""
+        controller.running = True
+        controller.config["pod_watch_enabled"] = False
+
+        assert controller._endpoint_snapshots()["/ready"][0] == 503
+
+        controller.last_pod_scan_at = 1.0
+        assert controller._endpoint_snapshots()["/ready"][0] == 200
+
+    def test_metrics_snapshot(self, controller):
+        """Test /metrics serves the Prometheus exposition"""
+        status, content_type, body = controller._endpoint_snapshots()["/metrics"]
+
+        assert status == 200
+        assert content_type.startswith("text/plain")
+        assert b"pod_failures_total" in body
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Unit tests for lease-based node heartbeat tracking
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heartbeats import NodeHeartbeats  # noqa: E402
+
+
+class TestNodeHeartbeats:
+    """Test cases for NodeHeartbeats"""
+
+    def test_first_sight_is_aged_by_renew_time(self):
+        """Test a lease already old when first listed is stale right away"""
+        heartbeats = NodeHeartbeats(stale_after=40)
+        heartbeats.observe("node-a", 1000.0, now=500.0, wall_now=1005.0)
+        heartbeats.observe("node-b", 900.0, now=500.0, wall_now=1005.0)
+
+        assert heartbeats.stale(now=500.0) == ["node-b"]
+        assert heartbeats.alive(now=500.0) == ["node-a"]
+
+    def test_renewals_use_the_local_clock(self):
+        """Test staleness is measured from when a renewal was observed, not from renewTime"""
+        heartbeats = NodeHeartbeats(stale_after=40)
+        heartbeats.observe("node-a", 1000.0, now=0.0, wall_now=1000.0)
+        # The kubelet's clock runs an hour behind ours
+        heartbeats.observe("node-a", 1000.0 - 3600 + 10, now=10.0)
+        heartbeats.observe("node-a", 1000.0 + 10, now=10.0)
+
+        assert heartbeats.seen_renewing("node-a")
+        assert heartbeats.stale(now=45.0) == []
+        assert heartbeats.stale(now=51.0) == ["node-a"]
+
+    def test_stale_node_is_reported_once_per_period(self):
+        """Test a checked node is only reported again after another stale period"""
+        heartbeats = NodeHeartbeats(stale_after=40)
+        heartbeats.observe("node-a", 1000.0, now=0.0, wall_now=1000.0)
+
+        assert heartbeats.stale(now=50.0) == ["node-a"]
+        heartbeats.mark_checked("node-a", now=50.0)
+        assert heartbeats.stale(now=60.0) == []
+        assert heartbeats.stale(now=91.0) == ["node-a"]
+
+    def test_down_node_recovers_on_renewal(self):
+        """Test a node marked down is reported as recovered when it renews its lease"""
+        heartbeats = NodeHeartbeats(stale_after=40)
+        heartbeats.observe("node-a", 1000.0, now=0.0, wall_now=1000.0)
+        heartbeats.mark_down("node-a")
+
+        assert heartbeats.is_down("node-a")
+        assert heartbeats.stale(now=100.0) == []
+        assert heartbeats.observe("node-a", 1000.0, now=100.0) is False
+        assert heartbeats.observe("node-a", 1100.0, now=100.0) is True
+        assert not heartbeats.is_down("node-a")
+
+    def test_forget(self):
+        """Test deleted leases are dropped"""
+        heartbeats = NodeHeartbeats()
+        heartbeats.observe("node-a", 1000.0, now=0.0, wall_now=1000.0)
+        heartbeats.observe("node-b", None, now=0.0)
+
+        heartbeats.forget("node-a")
+
+        assert len(heartbeats) == 0
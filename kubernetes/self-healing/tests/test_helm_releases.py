@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Helm release cache
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_cluster import FakeCluster  # noqa: E402
+from helm_releases import RELEASE_SECRET_SELECTOR, HelmReleaseCache, HelmRevision, HelmRevisionCodec  # noqa: E402
+from informer import Informer  # noqa: E402
+
+
+def revision(version, status="superseded", description="Upgrade complete"):
+    """Create a revision of the default/web release"""
+    return HelmRevision("default", "web", version, status, description)
+
+
+class TestHelmRevision:
+    """Test cases for decoding release Secrets"""
+
+    def test_decodes_release_payload(self):
+        """Test the double base64, gzipped release payload is decoded"""
+        cluster = FakeCluster()
+        secret = cluster.add_helm_revision("default", "web", 3, description="Upgrade complete")
+
+        decoded = HelmRevision.from_dict(secret)
+
+        assert decoded.release_key == "default/web"
+        assert decoded.version == 3
+        assert decoded.status == "deployed"
+        assert decoded.description == "Upgrade complete"
+        assert decoded.chart == "web-1.0.3"
+        assert decoded.key == "default/sh.helm.release.v1.web.v3"
+
+    def test_informer_keeps_revisions(self):
+        """Test an informer with the codec feeds the cache from raw Secret lists"""
+        cluster = FakeCluster()
+        cluster.add_helm_revision("default", "web", 1)
+        cluster.add_helm_revision("default", "web", 2)
+        cache = HelmReleaseCache()
+        informer = Informer(
+            cluster.core_v1.list_secret_for_all_namespaces,
+            cache.on_event,
+            decoder=HelmRevisionCodec,
+            label_selector=RELEASE_SECRET_SELECTOR,
+        )
+
+        informer.relist()
+
+        assert len(cache) == 1
+        assert cache.current("default", "web").version == 2
+        assert cache.rollback_target("default", "web") == (1, None)
+
+
+class TestHelmReleaseCache:
+    """Test cases for in-process rollback eligibility"""
+
+    def cache(self, *revisions):
+        cache = HelmReleaseCache()
+        for item in revisions:
+            cache.on_event("ADDED", item)
+        return cache
+
+    def test_rolls_back_to_previous_good_revision(self):
+        """Test the target skips failed revisions"""
+        cache = self.cache(revision(1), revision(2, status="failed"), revision(3, status="deployed"))
+
+        assert cache.rollback_target("default", "web") == (1, None)
+
+    def test_ineligible_releases(self):
+        """Test unknown, first, pending and already rolled back releases are not rolled back"""
+        assert self.cache().rollback_target("default", "web") == (None, "unknown release")
+        assert self.cache(revision(1, "deployed")).rollback_target("default", "web") == (None, "no previous revision")
+
+        pending = self.cache(revision(1), revision(2, "pending-upgrade"))
+        assert pending.rollback_target("default", "web") == (None, "revision 2 is pending-upgrade")
+
+        rolled_back = self.cache(revision(1), revision(2), revision(3, "deployed", "Rollback to 1"))
+        assert rolled_back.rollback_target("default", "web") == (None, "revision 3 is already a rollback")
+
+    def test_one_rollback_per_revision(self):
+        """Test a started rollback blocks more until it fails or a new revision arrives"""
+        cache = self.cache(revision(1), revision(2, "deployed"))
+
+        assert cache.start_rollback("default", "web") == (1, None)
+        assert cache.start_rollback("default", "web")[0] is None
+
+        cache.abandon_rollback("default", "web")
+        assert cache.start_rollback("default", "web") == (1, None)
+
+        cache.on_event("ADDED", revision(3, "deployed"))
+        assert cache.start_rollback("default", "web") == (2, None)
+
+    def test_deleted_revisions(self):
+        """Test pruned revisions and uninstalled releases are dropped"""
+        cache = self.cache(revision(1), revision(2, "deployed"))
+
+        cache.on_event("DELETED", revision(1))
+        assert cache.rollback_target("default", "web") == (None, "no previous revision")
+        cache.on_event("DELETED", revision(2))
+        assert len(cache) == 0
+        assert cache.current("default", "web") is None
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Informer
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import MagicMock, patch  # noqa: E402
+
+import pytest  # noqa: E402
+from informer import Informer, list_pages  # noqa: E402
+
+from kubernetes.client.rest import ApiException  # noqa: E402
+
+
+def make_pod(name, resource_version, namespace="default"):
+    """Create a mock pod with metadata"""
+    pod = MagicMock()
+    pod.metadata.name = name
+    pod.metadata.namespace = namespace
+    pod.metadata.resource_version = resource_version
+    return pod
+
+
+def make_list(pods, resource_version, continue_token=None):
+    """Create a mock list response"""
+    response = MagicMock()
+    response.items = pods
+    response.metadata.resource_version = resource_version
+    response.metadata._continue = continue_token
+    return response
+
+
+class TestInformer:
+    """Test cases for the Informer"""
+
+    @pytest.fixture
+    def events(self):
+        """Collect dispatched events"""
+        return []
+
+    @pytest.fixture
+    def informer(self, events):
+        """Create an informer with a mock list function"""
+        list_func = MagicMock()
+        return Informer(list_func, lambda event_type, obj: events.append((event_type, obj.metadata.name)))
+
+    def test_initial_list_populates_cache(self, informer, events):
+        """Test the initial list fills the cache and dispatches ADDED"""
+        informer.list_func.return_value = make_list([make_pod("a", "1"), make_pod("b", "2")], "10")
+
+        informer.relist()
+
+        assert informer.has_synced()
+        assert informer.resource_version == "10"
+        assert informer.get("default/a") is not None
+        assert sorted(events) == [("ADDED", "a"), ("ADDED", "b")]
+
+    def test_on_pass_runs_once_after_a_relist(self, events):
+        """Test handlers can tell a relist is in progress and on_pass runs once it has delivered everything"""
+        passes = []
+        informer = Informer(
+            MagicMock(),
+            lambda event_type, obj: events.append((event_type, informer.in_pass())),
+            on_pass=lambda: passes.append(informer.in_pass()),
+        )
+        informer.list_func.return_value = make_list([make_pod("a", "1"), make_pod("b", "2")], "10")
+
+        informer.relist()
+
+        assert events == [("ADDED", True), ("ADDED", True)]
+        assert passes == [False]
+
+    def test_relist_dispatches_only_changes(self, informer, events):
+        """Test a relist only dispatches changed, new and removed objects"""
+        informer.list_func.return_value = make_list([make_pod("a", "1"), make_pod("b", "2")], "10")
+        informer.relist()
+        events.clear()
+
+        informer.list_func.return_value = make_list([make_pod("a", "1"), make_pod("c", "5")], "20")
+        informer.relist()
+
+        assert sorted(events) == [("ADDED", "c"), ("DELETED", "b")]
+
+    def test_watch_event_skips_unchanged_resource_version(self, informer, events):
+        """Test watch events with an already cached resourceVersion are ignored"""
+        informer.list_func.return_value = make_list([make_pod("a", "1")], "10")
+        informer.relist()
+        events.clear()
+
+        informer._apply_event({"type": "MODIFIED", "object": make_pod("a", "1")})
+        informer._apply_event({"type": "MODIFIED", "object": make_pod("a", "2")})
+
+        assert events == [("MODIFIED", "a")]
+        assert informer.resource_version == "2"
+
+    def test_watch_deleted_event_evicts_cache(self, informer, events):
+        """Test DELETED events remove the object from the cache"""
+        informer.list_func.return_value = make_list([make_pod("a", "1")], "10")
+        informer.relist()
+
+        informer._apply_event({"type": "DELETED", "object": make_pod("a", "3")})
+
+        assert informer.get("default/a") is None
+        assert events[-1] == ("DELETED", "a")
+
+    def test_bookmark_updates_resource_version(self, informer, events):
+        """Test BOOKMARK events only advance the resourceVersion"""
+        informer._apply_event({"type": "BOOKMARK", "raw_object": {"metadata": {"resourceVersion": "42"}}})
+
+        assert informer.resource_version == "42"
+        assert events == []
+
+    def test_resync_on_request(self, informer, events):
+        """Test resync() re-delivers the cache without waiting out a resync period"""
+        informer.list_func.return_value = make_list([make_pod("a", "1")], "10")
+        informer.relist()
+        informer.running = True
+        thread = threading.Thread(target=informer._resync_loop, daemon=True)
+        thread.start()
+
+        informer.resync()
+        deadline = time.monotonic() + 1
+        while ("SYNC", "a") not in events and time.monotonic() < deadline:
+            time.sleep(0.01)
+        informer.stop()
+        thread.join(1)
+
+        assert ("SYNC", "a") in events
+        assert not thread.is_alive()
+
+    def test_watch_resumes_from_resource_version(self, informer):
+        """Test the watch is started from the listed resourceVersion"""
+        informer.running = True
+        informer.resource_version = "10"
+
+        with patch("informer.watch.Watch") as mock_watch:
+            mock_watch.return_value.stream.return_value = iter([])
+            informer.watch_once()
+
+        kwargs = mock_watch.return_value.stream.call_args[1]
+        assert kwargs["resource_version"] == "10"
+
+    def test_gone_triggers_relist(self, informer):
+        """Test a 410 Gone from the watch resets the resourceVersion for a relist"""
+        informer.running = True
+        informer.resource_version = "10"
+
+        def expire():
+            informer.running = False
+            raise ApiException(status=410, reason="Gone")
+
+        with patch.object(informer, "watch_once", side_effect=expire):
+            informer.run()
+
+        assert informer.resource_version is None
+
+    def test_relist_follows_pages(self, informer, events):
+        """Test the initial list is fetched page by page"""
+        informer.page_size = 1
+        informer.list_func.side_effect = [
+            make_list([make_pod("a", "1")], "10", continue_token="token-1"),
+            make_list([make_pod("b", "2")], "10"),
+        ]
+
+        informer.relist()
+
+        assert sorted(events) == [("ADDED", "a"), ("ADDED", "b")]
+        assert informer.list_func.call_args_list[1][1]["_continue"] == "token-1"
+
+    def test_handler_errors_do_not_break_dispatch(self):
+        """Test a failing handler does not stop other events being dispatched"""
+        handler = MagicMock(side_effect=RuntimeError("boom"))
+        informer = Informer(MagicMock(return_value=make_list([make_pod("a", "1"), make_pod("b", "1")], "5")), handler)
+
+        informer.relist()
+
+        assert handler.call_count == 2
+
+
+class TestListPages:
+    """Test cases for paginated listing"""
+
+    def test_list_pages_passes_limit_and_continue(self):
+        """Test pages are requested with limit and the previous continue token"""
+        list_func = MagicMock(
+            side_effect=[
+                make_list([make_pod("a", "1")], "10", continue_token="token-1"),
+                make_list([make_pod("b", "1")], "10", continue_token="token-2"),
+                make_list([make_pod("c", "1")], "10"),
+            ]
+        )
+
+        pages = list(list_pages(list_func, 1, field_selector="status.phase!=Succeeded"))
+
+        assert len(pages) == 3
+        calls = [call[1] for call in list_func.call_args_list]
+        assert all(call["limit"] == 1 for call in calls)
+        assert all(call["field_selector"] == "status.phase!=Succeeded" for call in calls)
+        assert "_continue" not in calls[0]
+        assert calls[1]["_continue"] == "token-1"
+        assert calls[2]["_continue"] == "token-2"
+
+    def test_list_pages_fetches_lazily(self):
+        """Test the next page is only fetched once the current one is consumed"""
+        list_func = MagicMock(
+            side_effect=[
+                make_list([make_pod("a", "1")], "10", continue_token="token-1"),
+                make_list([make_pod("b", "1")], "10"),
+            ]
+        )
+
+        pages = list_pages(list_func, 1)
+        next(pages)
+
+        assert list_func.call_count == 1
@@ -57,9 +57,10 @@ class TestSelfHealingInfrastructure(unittest.TestCase):
         try:
             response = requests.get(f"{self.base_url}/metrics", timeout=10)
             self.assertEqual(response.status_code, 200)
-            data = response.json()
-            self.assertIn("pod_failures_total", data)
-            self.assertIn("node_failures_total", data)
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+            self.assertIn("# TYPE pod_failures_total counter", response.text)
+            self.assertIn("# TYPE node_failures_total counter", response.text)
+            self.assertIn("# TYPE self_healing_errors_total counter", response.text)
         except requests.exceptions.RequestException as e:
             self.skipTest(f"Self-Healing Controller not accessible: {e}")
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Prometheus metrics of the Self-Healing Controller
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re  # noqa: E402
+import time  # noqa: E402
+
+from metrics import ControllerMetrics  # noqa: E402
+from prometheus_client.parser import text_string_to_metric_families  # noqa: E402
+
+ALERTS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "monitoring", "prometheus-alerts.yaml"
+)
+
+
+def samples(metrics):
+    """Parse the exposition into a {(name, labels): value} dict"""
+    body, _ = metrics.exposition()
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(body.decode())
+        for sample in family.samples
+    }
+
+
+class TestControllerMetrics:
+    """Test cases for ControllerMetrics"""
+
+    def test_exposition_is_prometheus_text(self):
+        """Test the exposition parses as the Prometheus text format"""
+        metrics = ControllerMetrics()
+        metrics.pod_failures.labels(namespace="default", reason="failed").inc()
+        metrics.node_failures.inc()
+        metrics.error("pod_scan")
+
+        body, content_type = metrics.exposition()
+        values = samples(metrics)
+
+        assert content_type.startswith("text/plain")
+        assert values[("pod_failures_total", (("namespace", "default"), ("reason", "failed")))] == 1
+        assert values[("node_failures_total", ())] == 1
+        assert values[("self_healing_errors_total", (("component", "pod_scan"),))] == 1
+
+    def test_alert_series_are_exported(self):
+        """Test every controller series used by the alert rules is exported"""
+        with open(ALERTS_FILE) as f:
+            alerts = f.read()
+        metrics = ControllerMetrics()
+        body, _ = metrics.exposition()
+
+        for name in ("self_healing_errors_total", "pod_failures_total", "node_failures_total"):
+            assert re.search(rf"\b{name}\b", alerts), name
+            assert f"# TYPE {name} counter" in body.decode()
+
+    def test_remediation_observes_detection_to_action(self):
+        """Test remediations are counted and timed from detection"""
+        metrics = ControllerMetrics()
+
+        metrics.remediation("restart_pod", "success", "default", detected_at=time.monotonic() - 2)
+        metrics.remediation("restart_pod", "failure", "default")
+        values = samples(metrics)
+
+        labels = (("action", "restart_pod"), ("namespace", "default"), ("outcome", "success"))
+        assert values[("self_healing_remediations_total", labels)] == 1
+        assert values[("self_healing_detection_to_action_seconds_count", (("action", "restart_pod"),))] == 1
+        assert values[("self_healing_detection_to_action_seconds_sum", (("action", "restart_pod"),))] >= 2
+
+    def test_timed_wraps_api_calls(self):
+        """Test wrapped API functions are timed and keep their docstring"""
+        metrics = ControllerMetrics()
+
+        def list_pods(**kwargs):
+            """List pods
+
+            :return: V1PodList
+            """
+            return kwargs
+
+        timed = metrics.timed(list_pods, "list", "pods")
+
+        assert timed(limit=5) == {"limit": 5}
+        assert timed.__doc__ == list_pods.__doc__
+        values = samples(metrics)
+        assert (
+            values[("self_healing_api_request_duration_seconds_count", (("resource", "pods"), ("verb", "list")))] == 1
+        )
+
+    def test_snapshot_exported_as_gauges(self):
+        """Test numeric snapshot values become gauges and others are skipped"""
+        metrics = ControllerMetrics(snapshot=lambda: {"pod_failures": 3, "is_leader": True, "mode": "watch"})
+        values = samples(metrics)
+
+        assert values[("self_healing_pod_failures", ())] == 3
+        assert values[("self_healing_is_leader", ())] == 1
+        assert not any(name == "self_healing_mode" for name, _ in values)
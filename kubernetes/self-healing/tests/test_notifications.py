@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asynchronous Slack notifier
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import MagicMock  # noqa: E402
+
+from metrics import ControllerMetrics  # noqa: E402
+from notifications import SlackNotifier  # noqa: E402
+
+
+def response(status_code, headers=None):
+    """Create a webhook response"""
+    result = MagicMock()
+    result.status_code = status_code
+    result.headers = headers or {}
+    return result
+
+
+def notifier(**kwargs):
+    """Create a notifier posting through a mocked session"""
+    session = MagicMock()
+    session.post.return_value = response(200)
+    metrics = ControllerMetrics()
+    return SlackNotifier("https://hooks.slack.com/test", "#alerts", metrics=metrics, session=session, **kwargs)
+
+
+def count(slack, outcome):
+    """Get a notification outcome counter"""
+    return slack.metrics.notifications.labels(outcome=outcome)._value.get()
+
+
+class TestSlackNotifier:
+    """Test cases for SlackNotifier"""
+
+    def test_events_of_a_group_become_one_digest(self):
+        """Test events are coalesced per group within a flush"""
+        slack = notifier()
+        for index in range(5):
+            slack.notify(f"🚨 Pod Failure: web-{index}", "Attempting recovery...", group="replicaset/default/web")
+        slack.notify("🚨 Node Failure: node-1", "Node node-1 has failed", group="node/node-1")
+
+        assert slack.flush() == 2
+
+        texts = [call[1]["json"]["text"] for call in slack.session.post.call_args_list]
+        assert texts[0].startswith("*5 notifications for replicaset/default/web*\n• *🚨 Pod Failure: web-0*")
+        assert texts[1] == "*🚨 Node Failure: node-1*\nNode node-1 has failed"
+        assert count(slack, "coalesced") == 4
+        assert count(slack, "sent") == 2
+
+    def test_messages_per_flush_are_capped(self):
+        """Test groups past the per-flush budget are summarised in one message"""
+        slack = notifier(max_messages=3)
+        for index in range(10):
+            slack.notify(f"🚨 Pod Failure: app-{index}", "failed", group=f"namespace/team-{index}")
+
+        assert slack.flush() == 3
+        assert slack.session.post.call_args[1]["json"]["text"].startswith(
+            "*8 more notifications*\n• 🚨 Pod Failure: app-2"
+        )
+
+    def test_overflow_is_dropped_and_counted(self):
+        """Test a full queue drops instead of blocking the caller"""
+        slack = notifier(max_queue=2)
+
+        results = [slack.notify("title", "message") for _ in range(5)]
+
+        assert results == [True, True, False, False, False]
+        assert slack.dropped == 3
+        assert count(slack, "dropped") == 3
+        assert len(slack) == 2
+
+    def test_retry_after_is_honored(self):
+        """Test a 429 waits for Retry-After before posting again"""
+        slack = notifier()
+        slack.session.post.side_effect = [response(429, {"Retry-After": "0.2"}), response(200)]
+        slack.notify("title", "message")
+
+        start = time.monotonic()
+        assert slack.flush() == 1
+
+        assert time.monotonic() - start >= 0.2
+        assert slack.session.post.call_count == 2
+        assert count(slack, "rate_limited") == 1
+
+    def test_failures_are_counted(self):
+        """Test errors and exhausted retries count as failed"""
+        slack = notifier(max_attempts=2)
+        slack.session.post.side_effect = [response(500), response(429, {"Retry-After": "0"}), response(429)]
+        slack.notify("first", "message", group="a")
+        slack.notify("second", "message", group="b")
+
+        assert slack.flush() == 0
+        assert count(slack, "failed") == 2
+        assert slack.metrics.errors.labels(component="slack")._value.get() == 2
+
+    def test_background_flush_and_stop(self):
+        """Test the background thread posts queued events and flushes on stop"""
+        slack = notifier(flush_interval=60)
+        slack.start()
+        slack.notify("title", "message")
+
+        slack.stop()
+
+        slack.session.post.assert_called_once()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-phase timing
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phases import NULL_PHASE, PhaseTimers, RollingWindow  # noqa: E402
+
+
+class TestRollingWindow:
+    """Test cases for RollingWindow"""
+
+    def test_percentiles(self):
+        """Test percentiles over a full window"""
+        window = RollingWindow(100)
+        for value in range(1, 101):
+            window.add(value / 1000)
+
+        summary = window.summary()
+
+        assert summary["count"] == 100
+        assert summary["p50"] == 0.051
+        assert summary["p95"] == 0.096
+        assert summary["p99"] == 0.1
+        assert summary["max"] == 0.1
+
+    def test_old_samples_roll_out(self):
+        """Test only the most recent samples count towards percentiles"""
+        window = RollingWindow(10)
+        for _ in range(10):
+            window.add(5.0)
+        for _ in range(10):
+            window.add(0.001)
+
+        summary = window.summary()
+
+        assert summary["max"] == 0.001
+        assert summary["count"] == 20
+
+    def test_empty_window(self):
+        """Test an empty window only reports its count"""
+        assert RollingWindow(10).summary() == {"count": 0}
+
+
+class TestPhaseTimers:
+    """Test cases for PhaseTimers"""
+
+    def test_disabled_timers_are_no_ops(self):
+        """Test disabled timers hand back a shared no-op and record nothing"""
+        timers = PhaseTimers(enabled=False)
+
+        with timers.phase("pods.list") as phase:
+            pass
+        timers.record("slack.post", 1.0)
+
+        assert timers.phase("pods.list") is NULL_PHASE
+        assert phase is None
+        assert timers.snapshot() == {}
+
+    def test_phase_records_duration(self):
+        """Test a phase records its duration even if it raises"""
+        timers = PhaseTimers(enabled=True, window=8)
+
+        with timers.phase("pods.list"):
+            pass
+        try:
+            with timers.phase("helm.rollback"):
+                raise RuntimeError("helm failed")
+        except RuntimeError:
+            pass
+
+        snapshot = timers.snapshot()
+        assert list(snapshot) == ["helm.rollback", "pods.list"]
+        assert snapshot["pods.list"]["count"] == 1
+        assert snapshot["pods.list"]["p99"] >= 0
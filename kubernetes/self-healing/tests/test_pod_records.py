@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit tests for compact pod records and the raw-JSON fast path
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+from unittest.mock import MagicMock  # noqa: E402
+
+from informer import Informer  # noqa: E402
+from pod_records import PodRecord, PodRecordCodec, as_pod_record, raw_pod_lister, to_timestamp  # noqa: E402
+
+from kubernetes import client  # noqa: E402
+
+RAW_POD = {
+    "metadata": {
+        "name": "web-5d9c-abcde",
+        "namespace": "default",
+        "resourceVersion": "1234",
+        "labels": {"app": "web", "app.kubernetes.io/managed-by": "Helm"},
+        "ownerReferences": [
+            {"apiVersion": "apps/v1", "kind": "ReplicaSet", "name": "web-5d9c", "controller": True, "uid": "u1"}
+        ],
+        "annotations": {"big": "x" * 1000},
+    },
+    "spec": {"nodeName": "node-1", "containers": [{"name": "web", "image": "nginx"}]},
+    "status": {
+        "phase": "Running",
+        "conditions": [
+            {"type": "Initialized", "status": "True"},
+            {"type": "Ready", "status": "False"},
+        ],
+        "containerStatuses": [
+            {
+                "name": "web",
+                "restartCount": 7,
+                "ready": False,
+                "image": "nginx",
+                "imageID": "sha256:1",
+                "lastState": {
+                    "terminated": {"reason": "OOMKilled", "exitCode": 137, "finishedAt": "2024-01-01T00:00:00Z"}
+                },
+            }
+        ],
+    },
+}
+
+
+def raw_response(body):
+    """Create a mock urllib3 response carrying a JSON body"""
+    response = MagicMock()
+    response.data = json.dumps(body).encode()
+    return response
+
+
+class TestPodRecord:
+    """Test cases for PodRecord"""
+
+    def test_from_dict_extracts_needed_fields(self):
+        """Test only the fields used by the controller are kept"""
+        record = PodRecord.from_dict(RAW_POD)
+
+        assert record.key == "default/web-5d9c-abcde"
+        assert record.resource_version == "1234"
+        assert record.phase == "Running"
+        assert record.ready == "False"
+        assert record.restart_counts == (7,)
+        assert record.last_terminations == (("OOMKilled", 1704067200.0),)
+        assert record.node_name == "node-1"
+        assert record.owner_references[0].kind == "ReplicaSet"
+        assert record.owner_references[0].controller is True
+        assert not hasattr(record, "__dict__")
+
+    def test_from_model_matches_from_dict(self):
+        """Test a V1Pod and its raw JSON produce the same record"""
+        api_client = client.ApiClient()
+        model = api_client.deserialize(SimpleNamespace(data=json.dumps(RAW_POD)), "V1Pod")
+
+        from_model = PodRecord.from_model(model)
+        from_dict = PodRecord.from_dict(RAW_POD)
+
+        for field in PodRecord.__slots__:
+            if field == "owner_references":
+                continue
+            assert getattr(from_model, field) == getattr(from_dict, field), field
+
+    def test_as_pod_record_is_identity_for_records(self):
+        """Test records are not converted again"""
+        record = PodRecord("default", "app-1")
+
+        assert as_pod_record(record) is record
+
+    def test_missing_status_fields(self):
+        """Test pending pods without conditions or container statuses"""
+        record = PodRecord.from_dict({"metadata": {"name": "p", "namespace": "ns"}, "status": {"phase": "Pending"}})
+
+        assert record.ready is None
+        assert record.restart_counts == ()
+        assert record.labels == {}
+
+    def test_to_timestamp_accepts_micro_time(self):
+        """Test second and microsecond precision timestamps both parse"""
+        assert to_timestamp("2024-01-01T00:00:00Z") == 1704067200.0
+        assert to_timestamp("2024-01-01T00:00:00.500000Z") == 1704067200.5
+        assert to_timestamp("yesterday") is None
+
+
+class TestRawListing:
+    """Test cases for raw-JSON listing"""
+
+    def test_parse_list_reads_continue_token(self):
+        """Test pages parsed from raw JSON carry list metadata"""
+        page = PodRecordCodec.parse_list(
+            json.dumps({"metadata": {"resourceVersion": "99", "continue": "token-1"}, "items": [RAW_POD]})
+        )
+
+        assert page.metadata.resource_version == "99"
+        assert page.metadata._continue == "token-1"
+        assert page.items[0].name == "web-5d9c-abcde"
+
+    def test_raw_pod_lister_skips_model_deserialization(self):
+        """Test the raw lister requests unparsed content"""
+        list_func = MagicMock(return_value=raw_response({"metadata": {}, "items": [RAW_POD]}))
+
+        page = raw_pod_lister(list_func)(limit=500)
+
+        assert list_func.call_args[1] == {"_preload_content": False, "limit": 500}
+        assert isinstance(page.items[0], PodRecord)
+
+    def test_informer_caches_records(self):
+        """Test an informer with the codec caches PodRecords from raw lists and watch events"""
+        list_func = MagicMock(return_value=raw_response({"metadata": {"resourceVersion": "5"}, "items": [RAW_POD]}))
+        informer = Informer(list_func, MagicMock(), decoder=PodRecordCodec)
+
+        informer.relist()
+        modified = json.loads(json.dumps(RAW_POD))
+        modified["metadata"]["resourceVersion"] = "1235"
+        informer._apply_event({"type": "MODIFIED", "object": modified, "raw_object": modified})
+
+        record = informer.get("default/web-5d9c-abcde")
+        assert isinstance(record, PodRecord)
+        assert record.resource_version == "1235"
+        assert informer.resource_version == "1235"
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for remediation priorities
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from pod_records import PodRecord  # noqa: E402
+from priorities import RemediationPriorities, parse_tier  # noqa: E402
+
+
+@pytest.fixture
+def cluster():
+    """Create a fake cluster with one annotated namespace"""
+    cluster = FakeCluster()
+    cluster.add_namespace("payments", {"self-healing.io/priority": "1"})
+    cluster.add_namespace("batch")
+    return cluster
+
+
+@pytest.fixture
+def priorities(cluster):
+    """Create priorities with a tier for system-critical pods"""
+    priorities = RemediationPriorities(cluster.core_v1, default_tier=2, class_tiers={"system-node-critical": 0})
+    priorities.refresh()
+    return priorities
+
+
+def record(cluster, key, **kwargs):
+    """Add a pod to the cluster and get its PodRecord"""
+    namespace, name = key.split("/")
+    return PodRecord.from_dict(cluster.add_pod(namespace, name, **kwargs))
+
+
+class TestRemediationPriorities:
+    def test_label_overrides_namespace_and_class(self, cluster, priorities):
+        """Test a pod's own priority label wins"""
+        pod = record(
+            cluster, "payments/api-0", labels={"self-healing.io/priority": "3"}, priority_class="system-node-critical"
+        )
+
+        assert priorities.tier(pod) == 3
+
+    def test_namespace_annotation_overrides_class(self, cluster, priorities):
+        """Test an annotated namespace sets the tier of its pods"""
+        pod = record(cluster, "payments/api-0", priority_class="system-node-critical")
+
+        assert priorities.tier(pod) == 1
+
+    def test_priority_class_then_default(self, cluster, priorities):
+        """Test unannotated pods fall back to their PriorityClass tier, then the default"""
+        assert priorities.tier(record(cluster, "batch/agent-0", priority_class="system-node-critical")) == 0
+        assert priorities.tier(record(cluster, "batch/job-0")) == 2
+
+    def test_invalid_tiers_are_ignored(self, cluster, priorities):
+        """Test labels that are not non-negative integers fall through"""
+        pod = record(cluster, "payments/api-0", labels={"self-healing.io/priority": "urgent"})
+
+        assert priorities.tier(pod) == 1
+        assert parse_tier("-1") is None
+        assert parse_tier(None) is None
+
+    def test_failed_refresh_keeps_known_tiers(self, cluster, priorities):
+        """Test a failing namespace LIST leaves the last tiers in place"""
+        priorities.core_client = MagicMock()
+        priorities.core_client.list_namespace.side_effect = Exception("API unavailable")
+
+        with pytest.raises(Exception):
+            priorities.refresh()
+
+        assert priorities.tier(record(cluster, "payments/api-0")) == 1
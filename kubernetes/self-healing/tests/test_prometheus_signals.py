@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Prometheus health signals
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fake_cluster import FakeCluster  # noqa: E402
+from prometheus_signals import DEFAULT_QUERIES, PrometheusSignals  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+
+THRESHOLDS = {"error_rate": 0.5, "latency_p95": 2, "restarts": 10}
+
+
+class Clock:
+    """Clock advanced by hand"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        promql = parse_qs(url.query)["query"][0]
+        self.server.queries.append(promql)
+
+        status, result = self.server.responses.get(promql, (200, []))
+        if status == 200:
+            body = {"status": "success", "data": {"resultType": "vector", "result": result}}
+        else:
+            body = {"status": "error", "errorType": "execution", "error": "query timed out"}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubPrometheus(ThreadingHTTPServer):
+    """Prometheus HTTP API answering instant queries with canned vectors"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.queries = []
+        # PromQL -> (HTTP status, vector result)
+        self.responses = {}
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def respond(self, signal, values, status=200):
+        """Answer the default query of a signal with {pod key: value}"""
+        result = [
+            {
+                "metric": {"kubernetes_namespace": key.split("/")[0], "kubernetes_pod_name": key.split("/")[1]},
+                "value": [1700000000.0, str(value)],
+            }
+            for key, value in values.items()
+        ]
+        self.responses[DEFAULT_QUERIES[signal]] = (status, result)
+
+
+@pytest.fixture
+def prometheus():
+    """Start a stub Prometheus on a free port"""
+    server = StubPrometheus()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def owners(pod_key):
+    """Owner of the pods in these tests: the part of the name before the last dash"""
+    namespace, name = pod_key.split("/")
+    return f"replicaset/{namespace}/{name.rsplit('-', 1)[0]}" if "-" in name else None
+
+
+class TestPrometheusSignals:
+    def test_one_query_per_signal_averaged_per_workload(self, prometheus):
+        """Test every pod's signal comes from one query and is averaged over its workload"""
+        prometheus.respond("error_rate", {"shop/web-1": 0.8, "shop/web-2": 0.6, "shop/api-1": 0.1, "shop/db": 0.9})
+        prometheus.respond("restarts", {"shop/web-1": "NaN", "shop/web-2": 4})
+        signals = PrometheusSignals(prometheus.url, THRESHOLDS, owners, clock=Clock())
+
+        signals.refresh()
+
+        assert sorted(prometheus.queries) == sorted(DEFAULT_QUERIES.values())
+        assert signals.signals("replicaset/shop/web") == {"error_rate": pytest.approx(0.7), "restarts": 4}
+        assert signals.breaches("replicaset/shop/web") == [("error_rate", pytest.approx(0.7), 0.5)]
+        assert signals.breaches("replicaset/shop/api") == []
+        assert len(signals) == 2
+
+    def test_signals_expire_after_the_ttl(self, prometheus):
+        """Test values are only used while fresh and dropped once Prometheus stops answering"""
+        clock = Clock()
+        prometheus.respond("error_rate", {"shop/web-1": 0.9})
+        signals = PrometheusSignals(prometheus.url, THRESHOLDS, owners, ttl=60, clock=clock)
+        signals.refresh()
+
+        prometheus.respond("error_rate", {}, status=503)
+        clock.now += 30
+        with pytest.raises(Exception):
+            signals.refresh()
+        assert signals.breaches("replicaset/shop/web") == [("error_rate", 0.9, 0.5)]
+
+        clock.now += 31
+        assert signals.breaches("replicaset/shop/web") == []
+        with pytest.raises(Exception):
+            signals.refresh()
+        assert len(signals) == 0
+
+    def test_failed_query_still_updates_other_signals(self, prometheus):
+        """Test one failing query neither blocks the others nor goes unreported"""
+        prometheus.respond("error_rate", {}, status=422)
+        prometheus.respond("latency_p95", {"shop/web-1": 3.5})
+        signals = PrometheusSignals(prometheus.url, THRESHOLDS, owners, clock=Clock())
+
+        with pytest.raises(Exception, match="query timed out"):
+            signals.refresh()
+
+        assert signals.signals("replicaset/shop/web") == {"latency_p95": 3.5}
+
+    def test_zero_threshold_turns_a_signal_off(self, prometheus):
+        """Test a signal without a threshold is not queried"""
+        signals = PrometheusSignals(prometheus.url, dict(THRESHOLDS, latency_p95=0), owners, clock=Clock())
+
+        signals.refresh()
+
+        assert sorted(prometheus.queries) == sorted([DEFAULT_QUERIES["error_rate"], DEFAULT_QUERIES["restarts"]])
+
+
+class TestControllerSignals:
+    @pytest.fixture
+    def setup(self, prometheus):
+        """Create a controller reading a stub Prometheus, against a fake cluster of two Deployments"""
+        with patch.dict(os.environ, {"PROMETHEUS_URL": prometheus.url}):
+            with patch("self_healing_controller.config.load_incluster_config"):
+                with patch("self_healing_controller.client.CoreV1Api"):
+                    controller = SelfHealingController()
+        cluster = FakeCluster()
+        cluster.add_node("node-1")
+        cluster.add_deployment("shop", "web", 4, nodes=["node-1"])
+        cluster.add_deployment("shop", "api", 4, nodes=["node-1"])
+        cluster.install(controller)
+
+        web = sorted(key for key in cluster.objects["pods"] if key.startswith("shop/web-"))
+        api = sorted(key for key in cluster.objects["pods"] if key.startswith("shop/api-"))
+        prometheus.respond("error_rate", dict({key: 0.9 for key in web}, **{key: 0.01 for key in api}))
+        # Signals map pods through the index the first scan fills
+        controller._check_pods()
+        controller.prometheus_signals.refresh()
+        return controller, cluster, web
+
+    def test_degraded_workload_is_not_batched(self, setup):
+        """Test Ready pods of a workload with a high error rate are not folded into a rollout restart"""
+        controller, cluster, web = setup
+
+        controller._check_pods()
+
+        assert cluster.actions_for("patch_deployment") == []
+        assert len(cluster.actions_for("delete_pod")) == 1
+        assert cluster.actions_for("delete_pod")[0] in web
+        assert controller.get_metrics()["prometheus_signal_workloads"] == 2
+
+    def test_recovered_workload_is_not_held_back(self, setup, prometheus):
+        """Test a workload degraded again after its signals recovered does not wait out the old cooldown"""
+        controller, cluster, _ = setup
+        controller._check_pods()
+
+        prometheus.respond("error_rate", {key: 0.01 for key in cluster.objects["pods"]})
+        controller.prometheus_signals.refresh()
+        controller._check_pods()
+        prometheus.respond("error_rate", {key: 0.9 for key in cluster.select_pods("shop", {"app": "web"})})
+        controller.prometheus_signals.refresh()
+        controller._check_pods()
+
+        assert len(cluster.actions_for("delete_pod")) == 2
+
+    def test_degraded_pods_do_not_trip_the_circuit_breaker(self, setup):
+        """Test degraded pods are not counted as failing by the circuit breaker"""
+        controller, cluster, _ = setup
+
+        controller._check_pods()
+
+        assert controller.circuit_breaker.failure_ratio_of("shop")[0] == 0.0
+
+    def test_degraded_pods_are_replaced_one_at_a_time(self, setup):
+        """Test without workload batching only one pod of a degraded workload is deleted per cooldown"""
+        controller, cluster, web = setup
+        controller.config["workload_batching_enabled"] = False
+
+        controller._check_pods()
+        controller._check_pods()
+
+        assert len(cluster.actions_for("delete_pod")) == 1
+        assert cluster.actions_for("delete_pod")[0] in web
+        assert sum(1 for _, verb, title, _ in cluster.actions if verb == "slack" and "Degraded" in title) == 1
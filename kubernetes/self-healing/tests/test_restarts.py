@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for restart-rate crash-loop detection
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from restarts import RestartTracker  # noqa: E402
+
+
+class TestRestartTracker:
+    """Test cases for RestartTracker"""
+
+    def test_restarts_inside_window_trip_threshold(self):
+        """Test more than threshold restarts inside the window is crash looping"""
+        tracker = RestartTracker(window_seconds=600, threshold=3)
+
+        assert not tracker.is_crash_looping("ns/pod", (1,), now=1000)
+        assert not tracker.is_crash_looping("ns/pod", (3,), now=1060)
+        assert tracker.is_crash_looping("ns/pod", (5,), now=1120)
+
+    def test_restarts_spread_over_time_are_not_crash_looping(self):
+        """Test restarts older than the window stop counting"""
+        tracker = RestartTracker(window_seconds=600, threshold=3)
+        tracker.observe("ns/pod", (0,), now=0)
+
+        for index in range(1, 10):
+            assert not tracker.is_crash_looping("ns/pod", (index,), now=index * 400)
+
+    def test_stable_lifetime_count_is_not_crash_looping(self):
+        """Test a high but unchanging restart count never trips detection"""
+        tracker = RestartTracker(window_seconds=600, threshold=3)
+
+        for second in range(0, 3600, 30):
+            assert not tracker.is_crash_looping("ns/pod", (40,), now=second)
+
+    def test_seeds_from_recent_termination(self):
+        """Test the last termination counts when it happened inside the window"""
+        tracker = RestartTracker(window_seconds=600, threshold=1)
+
+        assert tracker.observe("ns/pod", (9, 9), (("Error", 950.0), ("Error", 10.0)), now=1000) == 1
+        assert tracker.is_crash_looping("ns/pod", (10, 9), now=1010)
+
+    def test_recreated_container_resets_history(self):
+        """Test a lower restart count starts the container's history over"""
+        tracker = RestartTracker(window_seconds=600, threshold=1)
+        tracker.observe("ns/pod", (0,), now=0)
+        tracker.observe("ns/pod", (2,), now=10)
+
+        assert tracker.observe("ns/pod", (0,), now=20) == 0
+
+    def test_memory_is_fixed_per_pod(self):
+        """Test the ring buffer never grows past threshold + 1 samples per container"""
+        tracker = RestartTracker(window_seconds=600, threshold=3)
+        tracker.observe("ns/pod", (1, 1), now=0)
+
+        assert tracker.observe("ns/pod", (100, 50), now=1) == 4
+        assert len(tracker.pods["ns/pod"].stamps) == 2 * 4
+
+    def test_untouched_pods_are_not_tracked(self):
+        """Test pods that never restarted take no memory"""
+        tracker = RestartTracker()
+
+        tracker.observe("ns/pod", (0, 0))
+
+        assert len(tracker) == 0
+
+    def test_sweep_evicts_unseen_pods(self):
+        """Test a full sweep drops pods that were not observed"""
+        tracker = RestartTracker()
+        tracker.observe("ns/gone", (1,))
+        tracker.observe("ns/kept", (1,))
+
+        tracker.start_sweep()
+        tracker.observe("ns/kept", (1,))
+
+        assert tracker.finish_sweep() == 1
+        assert list(tracker.pods) == ["ns/kept"]
+
+    def test_forget(self):
+        """Test deleted pods are evicted"""
+        tracker = RestartTracker()
+        tracker.observe("ns/pod", (1,))
+
+        tracker.forget("ns/pod")
+
+        assert "ns/pod" not in tracker.pods
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unit tests for periodic loop scheduling
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from scheduler import AdaptiveInterval, Scheduler  # noqa: E402
+from self_healing_controller import SelfHealingController  # noqa: E402
+
+
+class TestAdaptiveInterval:
+    def test_shrinks_while_busy_and_backs_off_while_quiet(self):
+        """Test active failures shorten the wait and quiet runs stretch it up to the maximum"""
+        schedule = AdaptiveInterval(30, min_interval=10, max_interval=60, retry_interval=5)
+
+        assert [schedule.next_delay() for _ in range(4)] == [30, 45, 60, 60]
+        assert schedule.next_delay(busy=True) == 10
+        assert schedule.next_delay() == 30
+        assert schedule.next_delay(failed=True) == 5
+
+    def test_jitter_stays_within_bounds(self):
+        """Test jitter spreads the wait by at most the configured fraction"""
+        low = AdaptiveInterval(30, jitter=0.1, rng=lambda: 0.0)
+        high = AdaptiveInterval(30, jitter=0.1, rng=lambda: 1.0)
+
+        assert low.next_delay() == pytest.approx(27)
+        assert high.next_delay() == pytest.approx(33)
+
+
+class TestScheduler:
+    @pytest.fixture
+    def scheduler(self):
+        """Create a scheduler that is stopped after the test"""
+        scheduler = Scheduler()
+        yield scheduler
+        scheduler.stop()
+
+    def test_trigger_runs_the_loop_at_once(self, scheduler):
+        """Test a triggered loop does not wait out its interval"""
+        runs = threading.Semaphore(0)
+        scheduler.every("scan", runs.release, AdaptiveInterval(60))
+        assert runs.acquire(timeout=1)
+
+        scheduler.trigger("scan")
+
+        assert runs.acquire(timeout=1)
+
+    def test_stop_ends_waits_immediately(self, scheduler):
+        """Test stopping does not wait for the rest of an interval"""
+        thread = scheduler.every("scan", lambda: None, AdaptiveInterval(60))
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        scheduler.stop()
+        thread.join(1)
+
+        assert not thread.is_alive()
+        assert time.monotonic() - start < 0.1
+        assert scheduler.wait(0) is True
+
+    def test_errors_wait_the_retry_interval(self, scheduler):
+        """Test a failing run is reported and retried after retry_interval"""
+        errors = []
+
+        def fail():
+            raise RuntimeError("API unavailable")
+
+        scheduler.every("scan", fail, AdaptiveInterval(60, retry_interval=0.01), on_error=errors.append)
+        time.sleep(0.1)
+
+        assert len(errors) > 1
+        assert str(errors[0]) == "API unavailable"
+
+
+class TestControllerShutdown:
+    @pytest.fixture
+    def controller(self):
+        """Create a controller with a remediation worker"""
+        with patch("self_healing_controller.config.load_incluster_config"):
+            with patch("self_healing_controller.client.CoreV1Api"):
+                controller = SelfHealingController()
+        controller.config["remediation_workers"] = 1
+        controller.config["remediation_rate_limit"] = 0
+        return controller
+
+    def test_stop_drains_remediation_in_progress(self, controller):
+        """Test stop() returns once the remediation in progress finished, dropping queued ones"""
+        controller._start_remediation_workers()
+        started = threading.Event()
+        finished = []
+
+        def remediate(key):
+            if key == "default/slow":
+                started.set()
+                time.sleep(0.1)
+            finished.append(key)
+
+        with patch.object(controller, "_process_remediation", side_effect=remediate):
+            controller.remediation_queue.add("default/slow")
+            assert started.wait(1)
+            controller.remediation_queue.add("default/queued")
+            controller.stop()
+
+        assert finished == ["default/slow"]
+        assert not any(thread.is_alive() for thread in controller.remediation_threads)
+
+    def test_wake_runs_a_scan_now(self, controller):
+        """Test wake() starts the next pod scan without waiting for the interval"""
+        scans = threading.Semaphore(0)
+        with patch.object(controller, "_check_pods", side_effect=scans.release):
+            controller._start_pod_monitoring()
+            assert scans.acquire(timeout=1)
+
+            controller.wake("pod monitoring")
+
+            assert scans.acquire(timeout=1)
+        controller.stop()
+
+    def test_wake_resyncs_watched_pods(self, controller):
+        """Test wake() re-evaluates the cached pods when pods are watched instead of scanned"""
+        controller.pod_informer = MagicMock()
+
+        controller.wake("pod monitoring")
+
+        controller.pod_informer.resync.assert_called_once()
+        assert controller.scheduler.triggered == set()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the node/pod cluster index
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pod_records import OwnerRef, PodRecord  # noqa: E402
+from topology import ClusterIndex  # noqa: E402
+
+
+def pod(name, node, owner="web-5d9c"):
+    """Create a pod record owned by a ReplicaSet"""
+    return PodRecord("default", name, owner_references=(OwnerRef("ReplicaSet", owner, True),), node_name=node)
+
+
+class TestClusterIndex:
+    """Test cases for ClusterIndex"""
+
+    def test_maps_nodes_to_pods_and_owners(self):
+        """Test pods are indexed by node and owner"""
+        index = ClusterIndex()
+        index.update_pod(pod("web-1", "node-a"))
+        index.update_pod(pod("web-2", "node-a"))
+        index.update_pod(pod("db-1", "node-a", owner="db-7f8"))
+        index.update_pod(pod("web-3", "node-b"))
+
+        assert index.pods_on_node("node-a") == {"default/web-1", "default/web-2", "default/db-1"}
+        assert index.owners_on_node("node-a") == {"replicaset/default/web-5d9c", "replicaset/default/db-7f8"}
+
+    def test_rescheduled_and_removed_pods(self):
+        """Test moving and deleting pods keeps the node side consistent"""
+        index = ClusterIndex()
+        index.update_pod(pod("web-1", None))
+        index.update_pod(pod("web-1", "node-a"))
+        index.update_pod(pod("web-2", "node-a"))
+
+        index.remove_pod("default/web-1")
+
+        assert index.pods_on_node("node-a") == {"default/web-2"}
+        index.remove_pod("default/web-2")
+        assert index.node_pods == {}
+        assert index.pod_count() == 0
+        assert index.namespace_sizes == {}
+
+    def test_sweep_drops_unseen_pods(self):
+        """Test a full sweep drops pods that were not seen"""
+        index = ClusterIndex()
+        index.update_pod(pod("web-1", "node-a"))
+        index.update_pod(pod("web-2", "node-a"))
+
+        index.start_sweep()
+        index.update_pod(pod("web-2", "node-a"))
+
+        assert index.finish_sweep() == 1
+        assert index.pods_on_node("node-a") == {"default/web-2"}
+        assert index.pod_count("default") == 1
+
+    def test_node_state_expires(self):
+        """Test node readiness counts as unknown once older than the TTL"""
+        index = ClusterIndex(node_state_ttl=60)
+
+        assert index.set_node_ready("node-a", False, now=0) is True
+        assert index.node_ready("node-a", now=30) is False
+        assert index.node_ready("node-a", now=61) is None
+        assert index.node_ready("node-b", now=0) is None
+
+    def test_suppressions_clear_on_recovery(self):
+        """Test suppressed pods are counted once and cleared when the node recovers"""
+        index = ClusterIndex()
+        index.set_node_ready("node-a", False)
+
+        assert index.suppress("node-a", "default/web-1") is True
+        assert index.suppress("node-a", "default/web-1") is False
+        assert index.suppressed_count() == 1
+        assert index.down_nodes() == ["node-a"]
+
+        assert index.set_node_ready("node-a", True) is True
+        assert index.suppressed_count() == 0
+        assert index.down_nodes() == []
+
+    def test_needs_refresh(self):
+        """Test node refreshes are rate limited by the TTL"""
+        index = ClusterIndex(node_state_ttl=60)
+
+        assert index.needs_refresh(now=0)
+        index.mark_refreshed(now=0)
+        assert not index.needs_refresh(now=30)
+        assert index.needs_refresh(now=61)
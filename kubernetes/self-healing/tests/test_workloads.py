@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for workload helpers
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import MagicMock  # noqa: E402
+
+from workloads import WorkloadRef, WorkloadResolver, rollback_deployment  # noqa: E402
+
+
+def make_owner(kind, name):
+    """Create a controlling owner reference"""
+    owner = MagicMock()
+    owner.kind = kind
+    owner.name = name
+    owner.controller = True
+    return owner
+
+
+def make_replica_set(revision, owner_name="web"):
+    """Create a ReplicaSet with a revision annotation"""
+    replica_set = MagicMock()
+    replica_set.metadata.annotations = {"deployment.kubernetes.io/revision": str(revision)}
+    replica_set.metadata.owner_references = [make_owner("Deployment", owner_name)]
+    replica_set.spec.template = f"template-{revision}"
+    return replica_set
+
+
+class TestWorkloadResolver:
+    """Test cases for the WorkloadResolver"""
+
+    def test_resolves_statefulset_without_api_calls(self):
+        """Test StatefulSet pods resolve straight from their ownerReferences"""
+        apps_client = MagicMock()
+        pod = MagicMock()
+        pod.metadata.namespace = "default"
+        pod.metadata.owner_references = [make_owner("StatefulSet", "db")]
+
+        workload = WorkloadResolver(apps_client).resolve(pod)
+
+        assert workload == WorkloadRef("StatefulSet", "default", "db")
+        apps_client.read_namespaced_replica_set.assert_not_called()
+
+    def test_bare_pod_has_no_workload(self):
+        """Test pods without a controller are not grouped"""
+        pod = MagicMock()
+        pod.metadata.owner_references = None
+
+        assert WorkloadResolver(MagicMock()).resolve(pod) is None
+
+    def test_job_pod_has_no_workload(self):
+        """Test pods owned by a Job are not grouped"""
+        pod = MagicMock()
+        pod.metadata.owner_references = [make_owner("Job", "backup")]
+
+        assert WorkloadResolver(MagicMock()).resolve(pod) is None
+
+
+class TestRollbackDeployment:
+    """Test cases for rollback_deployment"""
+
+    def test_rolls_back_to_previous_revision(self):
+        """Test the Deployment template is replaced with the previous revision"""
+        apps_client = MagicMock()
+        apps_client.read_namespaced_deployment.return_value.spec.selector.match_labels = {"app": "web"}
+        apps_client.list_namespaced_replica_set.return_value.items = [
+            make_replica_set(1),
+            make_replica_set(3),
+            make_replica_set(2),
+            make_replica_set(9, owner_name="other"),
+        ]
+        apps_client.api_client.sanitize_for_serialization.side_effect = lambda template: {
+            "metadata": {"labels": {"app": "web", "pod-template-hash": "abc"}},
+            "spec": template,
+        }
+
+        revision = rollback_deployment(apps_client, WorkloadRef("Deployment", "default", "web"))
+
+        assert revision == 2
+        body = apps_client.patch_namespaced_deployment.call_args[1]["body"]
+        assert body == [
+            {
+                "op": "replace",
+                "path": "/spec/template",
+                "value": {"metadata": {"labels": {"app": "web"}}, "spec": "template-2"},
+            }
+        ]
+        assert apps_client.list_namespaced_replica_set.call_args[1]["label_selector"] == "app=web"
+
+    def test_no_previous_revision(self):
+        """Test nothing is patched when there is only one revision"""
+        apps_client = MagicMock()
+        apps_client.read_namespaced_deployment.return_value.spec.selector.match_labels = {"app": "web"}
+        apps_client.list_namespaced_replica_set.return_value.items = [make_replica_set(1)]
+
+        assert rollback_deployment(apps_client, WorkloadRef("Deployment", "default", "web")) is None
+        apps_client.patch_namespaced_deployment.assert_not_called()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the remediation work queue
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading  # noqa: E402
+import time  # noqa: E402
+
+import pytest  # noqa: E402
+from workqueue import AgingPriorityQueue, ExponentialBackoff, RateLimitingQueue, TokenBucket  # noqa: E402
+
+
+class TestRateLimitingQueue:
+    """Test cases for the RateLimitingQueue"""
+
+    @pytest.fixture
+    def queue(self):
+        """Create a queue without a global rate limit"""
+        return RateLimitingQueue(base_delay=0.01, max_delay=0.1, rate=0)
+
+    def test_add_deduplicates_queued_keys(self, queue):
+        """Test a queued key is not added twice"""
+        queue.add("default/app-1")
+        queue.add("default/app-1")
+        queue.add("default/app-2")
+
+        assert len(queue) == 2
+
+    def test_key_in_flight_is_requeued_once_after_done(self, queue):
+        """Test a key added while processing is handed out again only after done"""
+        queue.add("default/app-1")
+        key = queue.get(timeout=1)
+
+        queue.add("default/app-1")
+        queue.add("default/app-1")
+        assert len(queue) == 0
+
+        queue.done(key)
+        assert len(queue) == 1
+        assert queue.get(timeout=1) == "default/app-1"
+
+    def test_get_times_out_when_empty(self, queue):
+        """Test get returns None when nothing becomes ready"""
+        assert queue.get(timeout=0.01) is None
+
+    def test_add_after_delays_key(self, queue):
+        """Test delayed keys are only handed out once their delay has passed"""
+        queue.add_after("default/app-1", 0.05)
+
+        assert queue.get(timeout=0.01) is None
+        assert queue.get(timeout=1) == "default/app-1"
+
+    def test_add_rate_limited_backs_off_exponentially(self, queue):
+        """Test retries of a failing key back off and can be forgotten"""
+        queue.add_rate_limited("default/app-1")
+        queue.add_rate_limited("default/app-1")
+
+        assert queue.num_requeues("default/app-1") == 2
+
+        queue.forget("default/app-1")
+        assert queue.num_requeues("default/app-1") == 0
+
+    def test_shut_down_wakes_workers(self, queue):
+        """Test blocked workers return None on shutdown"""
+        results = []
+        worker = threading.Thread(target=lambda: results.append(queue.get()))
+        worker.start()
+
+        queue.shut_down()
+        worker.join(timeout=1)
+
+        assert results == [None]
+
+    def test_urgent_keys_are_handed_out_first(self, queue):
+        """Test keys come out by priority tier, then in the order they were added"""
+        queue.add("default/batch", 3)
+        queue.add("default/web", 1)
+        queue.add("kube-system/dns", 0)
+        queue.add("default/api", 1)
+
+        assert [queue.get(timeout=1) for _ in range(4)] == [
+            "kube-system/dns",
+            "default/web",
+            "default/api",
+            "default/batch",
+        ]
+
+    def test_priority_survives_requeue(self, queue):
+        """Test a key re-added while in flight keeps the most urgent tier it was given"""
+        queue.add("default/app-1", 0)
+        key = queue.get(timeout=1)
+        queue.add("default/app-1")
+        queue.add("default/app-2", 1)
+
+        queue.done(key)
+
+        assert queue.get(timeout=1) == "default/app-1"
+        queue.done("default/app-1")
+        queue.forget("default/app-1")
+        assert "default/app-1" not in queue.priorities
+
+
+class TestAgingPriorityQueue:
+    """Test cases for the AgingPriorityQueue"""
+
+    def test_waiting_keys_overtake_more_urgent_tiers(self):
+        """Test a key that waited longer than the aging interval per tier goes first"""
+        now = [0.0]
+        queue = AgingPriorityQueue(aging_seconds=30, clock=lambda: now[0])
+        queue.append("low", 2)
+        now[0] = 45
+        queue.append("high", 0)
+        now[0] = 75
+        queue.append("newest", 0)
+
+        assert [queue.popleft() for _ in range(len(queue))] == ["high", "low", "newest"]
+
+
+class TestExponentialBackoff:
+    """Test cases for ExponentialBackoff"""
+
+    def test_delay_doubles_and_is_capped(self):
+        """Test the backoff doubles per failure up to the maximum"""
+        backoff = ExponentialBackoff(base_delay=1, max_delay=5)
+
+        delays = [backoff.when("key") for _ in range(5)]
+
+        assert delays == [1, 2, 4, 5, 5]
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket"""
+
+    def test_burst_is_free_then_rate_limited(self):
+        """Test the burst is served immediately and later tokens must wait"""
+        bucket = TokenBucket(rate=10, burst=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_global_limit_applies_to_get(self):
+        """Test workers are throttled by the token bucket"""
+        queue = RateLimitingQueue(rate=20, burst=1)
+        for index in range(3):
+            queue.add(f"default/app-{index}")
+
+        start = time.monotonic()
+        for _ in range(3):
+            queue.done(queue.get(timeout=1))
+
+        assert time.monotonic() - start >= 0.08
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Shared node/pod index for correlated-failure handling
+
+When a node goes NotReady every pod on it fails with it, and deleting
+those pods one by one cannot help until the node itself is dealt with.
+ClusterIndex maps nodes to the pods scheduled on them and pods to their
+controlling owner. The pod loop keeps the pod side current, the node
+loop (or an on-demand node read) keeps node readiness current, and pod
+remediation consults it to suppress pods whose root cause is their node.
+"""
+
+import threading
+import time
+
+
+def owner_key(pod):
+    """Get kind/namespace/name of a pod record's controlling owner, or None"""
+    for owner in pod.owner_references:
+        if owner.controller:
+            return f"{owner.kind.lower()}/{pod.namespace}/{owner.name}"
+    return None
+
+
+class NodeState:
+    __slots__ = ("ready", "checked_at", "down_since", "suppressed")
+
+    def __init__(self, ready, checked_at):
+        """Initialize the last known readiness of a node"""
+        self.ready = ready
+        self.checked_at = checked_at
+        self.down_since = None if ready else checked_at
+        self.suppressed = set()
+
+
+class ClusterIndex:
+    def __init__(self, node_state_ttl=60):
+        """Initialize an empty index; node readiness older than node_state_ttl counts as unknown"""
+        self.node_state_ttl = node_state_ttl
+        # pod key -> [node name, owner key, sweep generation]
+        self.pods = {}
+        self.node_pods = {}
+        # namespace -> number of indexed pods
+        self.namespace_sizes = {}
+        self.nodes = {}
+        self.generation = 0
+        self.refreshed_at = None
+        self._lock = threading.Lock()
+
+    def update_pod(self, pod):
+        """Record which node a pod runs on and which workload owns it"""
+        key = pod.key
+        node = pod.node_name
+
+        with self._lock:
+            entry = self.pods.get(key)
+            if entry is None:
+                self.pods[key] = [node, owner_key(pod), self.generation]
+                self.namespace_sizes[pod.namespace] = self.namespace_sizes.get(pod.namespace, 0) + 1
+                if node:
+                    self.node_pods.setdefault(node, set()).add(key)
+                return
+
+            entry[2] = self.generation
+            if entry[0] != node:
+                self._unlink(key, entry[0])
+                entry[0] = node
+                if node:
+                    self.node_pods.setdefault(node, set()).add(key)
+
+    def pod_owner(self, key):
+        """Get the owner key of an indexed pod, or None"""
+        entry = self.pods.get(key)
+        return entry[1] if entry is not None else None
+
+    def remove_pod(self, key):
+        """Drop a pod that went away"""
+        with self._lock:
+            if key in self.pods:
+                self._drop(key)
+
+    def _drop(self, key):
+        """Remove a pod from the index while holding the lock"""
+        self._unlink(key, self.pods.pop(key)[0])
+        namespace = key.split("/", 1)[0]
+        self.namespace_sizes[namespace] -= 1
+        if not self.namespace_sizes[namespace]:
+            del self.namespace_sizes[namespace]
+
+    def _unlink(self, key, node):
+        if not node:
+            return
+        pods = self.node_pods.get(node)
+        if pods is not None:
+            pods.discard(key)
+            if not pods:
+                del self.node_pods[node]
+        state = self.nodes.get(node)
+        if state is not None:
+            state.suppressed.discard(key)
+
+    def start_sweep(self):
+        """Begin a full pass over all pods; pods not updated before finish_sweep are dropped"""
+        with self._lock:
+            self.generation += 1
+
+    def finish_sweep(self):
+        """Drop pods that were not seen since start_sweep"""
+        with self._lock:
+            stale = [key for key, entry in self.pods.items() if entry[2] != self.generation]
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def set_node_ready(self, name, ready, now=None):
+        """Record a node's readiness, returning True if it changed"""
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            state = self.nodes.get(name)
+            if state is None:
+                self.nodes[name] = NodeState(ready, now)
+                return not ready
+
+            state.checked_at = now
+            if state.ready == ready:
+                return False
+
+            state.ready = ready
+            state.down_since = None if ready else now
+            state.suppressed.clear()
+            return True
+
+    def touch_node(self, name, now=None):
+        """Note that a node was seen alive without changing a known readiness, defaulting to Ready"""
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            state = self.nodes.get(name)
+            if state is None:
+                self.nodes[name] = NodeState(True, now)
+            else:
+                state.checked_at = now
+
+    def mark_refreshed(self, now=None):
+        """Note that every node's readiness was just read"""
+        self.refreshed_at = time.monotonic() if now is None else now
+
+    def needs_refresh(self, now=None):
+        """Check if node readiness has not been read within the TTL"""
+        now = time.monotonic() if now is None else now
+        return self.refreshed_at is None or now - self.refreshed_at > self.node_state_ttl
+
+    def node_ready(self, name, now=None):
+        """Get a node's last known readiness, or None if unknown or stale"""
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            state = self.nodes.get(name)
+            if state is None or now - state.checked_at > self.node_state_ttl:
+                return None
+            return state.ready
+
+    def suppress(self, name, key):
+        """Note that a pod's remediation was suppressed because its node is down, returning True if new"""
+        with self._lock:
+            state = self.nodes.get(name)
+            if state is None or key in state.suppressed:
+                return False
+            state.suppressed.add(key)
+            return True
+
+    def pod_count(self, namespace=None):
+        """Count the indexed pods of a namespace, or of the whole cluster with None"""
+        with self._lock:
+            if namespace is None:
+                return len(self.pods)
+            return self.namespace_sizes.get(namespace, 0)
+
+    def pods_on_node(self, name):
+        """Get the keys of the pods scheduled on a node"""
+        with self._lock:
+            return set(self.node_pods.get(name, ()))
+
+    def owners_on_node(self, name):
+        """Get the workloads with pods on a node"""
+        with self._lock:
+            owners = (self.pods[key][1] for key in self.node_pods.get(name, ()))
+            return {owner for owner in owners if owner}
+
+    def suppressed_count(self):
+        """Count pods whose remediation is currently suppressed"""
+        with self._lock:
+            return sum(len(state.suppressed) for state in self.nodes.values())
+
+    def down_nodes(self):
+        """Get the names of nodes currently known to be NotReady"""
+        with self._lock:
+            return [name for name, state in self.nodes.items() if not state.ready]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Workload helpers for the Self-Healing Controller
+
+Resolves pods to the workload that owns them by following the
+ownerReferences chain (Pod -> ReplicaSet -> Deployment, or Pod ->
+StatefulSet/DaemonSet) and performs workload-level remediations: a
+rollout restart or a native rollback to the previous ReplicaSet revision.
+"""
+
+import datetime
+import threading
+
+from pod_records import as_pod_record
+
+RESTARTED_AT_ANNOTATION = "kubectl.kubernetes.io/restartedAt"
+REVISION_ANNOTATION = "deployment.kubernetes.io/revision"
+
+
+class WorkloadRef:
+    __slots__ = ("kind", "namespace", "name")
+
+    def __init__(self, kind, namespace, name):
+        """Initialize a reference to a workload"""
+        self.kind = kind
+        self.namespace = namespace
+        self.name = name
+
+    @property
+    def key(self):
+        """Get the queue key for the workload"""
+        return f"{self.kind.lower()}/{self.namespace}/{self.name}"
+
+    def __eq__(self, other):
+        return isinstance(other, WorkloadRef) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"WorkloadRef({self.kind}, {self.namespace}/{self.name})"
+
+
+def controller_owner(owner_references):
+    """Get the controlling owner reference from a list of ownerReferences"""
+    for owner in owner_references or []:
+        if owner.controller:
+            return owner
+    return None
+
+
+class WorkloadResolver:
+    def __init__(self, apps_client, max_cached=10000):
+        """Initialize the resolver with an AppsV1Api client"""
+        self.apps_client = apps_client
+        self.max_cached = max_cached
+        # namespace/replicaset -> owning Deployment name (or None)
+        self.replica_set_owners = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, pod):
+        """Get the restartable workload owning a pod, or None"""
+        pod = as_pod_record(pod)
+        owner = controller_owner(pod.owner_references)
+        if owner is None:
+            return None
+
+        namespace = pod.namespace
+        if owner.kind in ("StatefulSet", "DaemonSet"):
+            return WorkloadRef(owner.kind, namespace, owner.name)
+
+        if owner.kind == "ReplicaSet":
+            deployment = self._replica_set_owner(namespace, owner.name)
+            if deployment:
+                return WorkloadRef("Deployment", namespace, deployment)
+
+        return None
+
+    def _replica_set_owner(self, namespace, name):
+        """Get the Deployment owning a ReplicaSet, caching the answer"""
+        cache_key = f"{namespace}/{name}"
+        with self._lock:
+            if cache_key in self.replica_set_owners:
+                return self.replica_set_owners[cache_key]
+
+        replica_set = self.apps_client.read_namespaced_replica_set(name=name, namespace=namespace)
+        owner = controller_owner(replica_set.metadata.owner_references)
+        deployment = owner.name if owner is not None and owner.kind == "Deployment" else None
+
+        with self._lock:
+            if len(self.replica_set_owners) >= self.max_cached:
+                self.replica_set_owners.clear()
+            self.replica_set_owners[cache_key] = deployment
+        return deployment
+
+
+def restart_workload(apps_client, workload):
+    """Trigger a rollout restart of a workload by bumping its pod template annotation"""
+    restarted_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    body = {"spec": {"template": {"metadata": {"annotations": {RESTARTED_AT_ANNOTATION: restarted_at}}}}}
+
+    patch = {
+        "Deployment": apps_client.patch_namespaced_deployment,
+        "StatefulSet": apps_client.patch_namespaced_stateful_set,
+        "DaemonSet": apps_client.patch_namespaced_daemon_set,
+    }[workload.kind]
+    patch(name=workload.name, namespace=workload.namespace, body=body)
+
+
+def rollback_deployment(apps_client, workload):
+    """Roll a Deployment back to its previous ReplicaSet revision
+
+    Returns the revision rolled back to, or None if there is no previous
+    revision.
+    """
+    deployment = apps_client.read_namespaced_deployment(name=workload.name, namespace=workload.namespace)
+    match_labels = deployment.spec.selector.match_labels or {}
+    selector = ",".join(f"{key}={value}" for key, value in sorted(match_labels.items()))
+
+    replica_sets = apps_client.list_namespaced_replica_set(namespace=workload.namespace, label_selector=selector)
+
+    revisions = []
+    for replica_set in replica_sets.items:
+        owner = controller_owner(replica_set.metadata.owner_references)
+        if owner is None or owner.kind != "Deployment" or owner.name != workload.name:
+            continue
+        revision = (replica_set.metadata.annotations or {}).get(REVISION_ANNOTATION)
+        if revision and revision.isdigit():
+            revisions.append((int(revision), replica_set))
+
+    if len(revisions) < 2:
+        return None
+
+    revisions.sort(key=lambda item: item[0], reverse=True)
+    revision, previous = revisions[1]
+
+    template = apps_client.api_client.sanitize_for_serialization(previous.spec.template)
+    template.get("metadata", {}).get("labels", {}).pop("pod-template-hash", None)
+    # Replace the whole template like `kubectl rollout undo` does
+    apps_client.patch_namespaced_deployment(
+        name=workload.name,
+        namespace=workload.namespace,
+        body=[{"op": "replace", "path": "/spec/template", "value": template}],
+    )
+    return revision
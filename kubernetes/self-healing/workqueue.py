@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Remediation work queue for the Self-Healing Controller
+
+A controller-runtime style queue of object keys: a key that is already
+queued is not added twice, a key that is being processed is only re-queued
+once it is done, failed keys are retried with per-key exponential backoff,
+and a global token bucket bounds how fast workers may pull work. Ready
+keys come out by priority tier, lowest first, with waiting time aging them
+towards the front so no tier starves. AsyncRateLimitingQueue keeps the same
+semantics for an asyncio event loop.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        """Initialize a token bucket refilling at rate tokens per second"""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long the caller must wait before using it"""
+        if self.rate <= 0:
+            return 0
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+
+class ExponentialBackoff:
+    def __init__(self, base_delay=1, max_delay=300):
+        """Initialize per-key exponential backoff"""
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def when(self, key):
+        """Record a failure for key and return the delay before its next retry"""
+        with self._lock:
+            failures = self.failures.get(key, 0)
+            self.failures[key] = failures + 1
+        return min(self.base_delay * (2**failures), self.max_delay)
+
+    def forget(self, key):
+        """Reset the failure count for key"""
+        with self._lock:
+            self.failures.pop(key, None)
+
+    def num_requeues(self, key):
+        """Get the number of failures recorded for key"""
+        with self._lock:
+            return self.failures.get(key, 0)
+
+
+class AgingPriorityQueue:
+    def __init__(self, aging_seconds=30, clock=time.monotonic):
+        """Initialize ready keys ordered by priority tier, where waiting aging_seconds is worth one tier"""
+        self.aging_seconds = aging_seconds
+        self.clock = clock
+        self.heap = []
+        self._sequence = itertools.count()
+
+    def append(self, key, priority=0):
+        """Add a key of a priority tier (0 is the most urgent)"""
+        # Every waiting key ages at the same rate, so the rank never needs updating
+        rank = priority * self.aging_seconds + self.clock()
+        heapq.heappush(self.heap, (rank, next(self._sequence), key))
+
+    def popleft(self):
+        """Remove and return the most urgent key"""
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class RateLimitingQueue:
+    def __init__(self, base_delay=1, max_delay=300, rate=10, burst=100, aging_seconds=30):
+        """Initialize the work queue"""
+        self.backoff = ExponentialBackoff(base_delay, max_delay)
+        self.bucket = TokenBucket(rate, burst)
+        self.queue = AgingPriorityQueue(aging_seconds)
+        self.priorities = {}
+        self.dirty = set()
+        self.processing = set()
+        self.waiting = []
+        self.shutting_down = False
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        """Get the number of keys waiting to be processed"""
+        with self._cond:
+            return len(self.queue)
+
+    def add(self, key, priority=None):
+        """Add a key unless it is already queued, optionally raising its priority"""
+        with self._cond:
+            self._set_priority(key, priority)
+            self._add(key)
+
+    def _set_priority(self, key, priority):
+        """Keep the most urgent priority a key was added with until it is forgotten"""
+        if priority is not None:
+            self.priorities[key] = min(priority, self.priorities.get(key, priority))
+
+    def _add(self, key):
+        """Add a key while holding the lock"""
+        if self.shutting_down or key in self.dirty:
+            return
+
+        self.dirty.add(key)
+        # Keys being processed are re-queued by done()
+        if key in self.processing:
+            return
+
+        self.queue.append(key, self.priorities.get(key, 0))
+        self._cond.notify()
+
+    def add_after(self, key, delay, priority=None):
+        """Add a key once delay seconds have passed"""
+        if delay <= 0:
+            self.add(key, priority)
+            return
+
+        with self._cond:
+            if self.shutting_down:
+                return
+            self._set_priority(key, priority)
+            heapq.heappush(self.waiting, (time.monotonic() + delay, key))
+            self._cond.notify()
+
+    def add_rate_limited(self, key):
+        """Re-add a failed key after its exponential backoff"""
+        self.add_after(key, self.backoff.when(key))
+
+    def forget(self, key):
+        """Stop tracking failures and priority for key after it was processed successfully"""
+        self.backoff.forget(key)
+        with self._cond:
+            if key not in self.dirty:
+                self.priorities.pop(key, None)
+
+    def num_requeues(self, key):
+        """Get how many times key has been retried"""
+        return self.backoff.num_requeues(key)
+
+    def get(self, timeout=None):
+        """Block until a key is ready and return it, or None on shutdown or timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                # Keys still queued at shutdown are dropped; the next scan finds their pods again
+                if self.shutting_down:
+                    return None
+
+                self._promote_waiting()
+
+                if self.queue:
+                    key = self.queue.popleft()
+                    self.dirty.discard(key)
+                    self.processing.add(key)
+                    break
+
+                wait = None
+                if self.waiting:
+                    wait = max(0, self.waiting[0][0] - time.monotonic())
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+        # Global rate limit across all workers, cut short by shutdown
+        delay = self.bucket.reserve()
+        if delay > 0:
+            with self._cond:
+                if self._cond.wait_for(lambda: self.shutting_down, delay):
+                    self.processing.discard(key)
+                    return None
+        return key
+
+    def _promote_waiting(self):
+        """Move delayed keys whose time has come onto the queue"""
+        now = time.monotonic()
+        while self.waiting and self.waiting[0][0] <= now:
+            _, key = heapq.heappop(self.waiting)
+            self._add(key)
+
+    def done(self, key):
+        """Mark key as processed, re-queueing it if it was added meanwhile"""
+        with self._cond:
+            self.processing.discard(key)
+            if key in self.dirty:
+                self.queue.append(key, self.priorities.get(key, 0))
+                self._cond.notify()
+
+    def shut_down(self):
+        """Stop handing out keys and wake up all waiting workers"""
+        with self._cond:
+            self.shutting_down = True
+            self._cond.notify_all()
+
+
+class AsyncRateLimitingQueue:
+    def __init__(self, loop, base_delay=1, max_delay=300, rate=10, burst=100, aging_seconds=30):
+        """Initialize a work queue owned by an event loop; keys may be added from any thread"""
+        self.loop = loop
+        self.backoff = ExponentialBackoff(base_delay, max_delay)
+        self.bucket = TokenBucket(rate, burst)
+        self.queue = AgingPriorityQueue(aging_seconds)
+        self.priorities = {}
+        self.dirty = set()
+        self.processing = set()
+        self.shutting_down = False
+        self._waiter = None
+
+    def __len__(self):
+        """Get the number of keys waiting to be processed"""
+        return len(self.queue)
+
+    def _call(self, func, *args):
+        """Run func on the loop's thread, which owns all queue state"""
+        try:
+            self.loop.call_soon_threadsafe(func, *args)
+        except RuntimeError:
+            pass  # the loop already closed during shutdown
+
+    def add(self, key, priority=None):
+        """Add a key unless it is already queued, optionally raising its priority"""
+        self._call(self._add, key, priority)
+
+    def _add(self, key, priority=None):
+        if priority is not None:
+            self.priorities[key] = min(priority, self.priorities.get(key, priority))
+        if self.shutting_down or key in self.dirty:
+            return
+
+        self.dirty.add(key)
+        # Keys being processed are re-queued by done()
+        if key in self.processing:
+            return
+
+        self.queue.append(key, self.priorities.get(key, 0))
+        self._wake()
+
+    def add_after(self, key, delay, priority=None):
+        """Add a key once delay seconds have passed"""
+        if delay <= 0:
+            self.add(key, priority)
+            return
+        self._call(self.loop.call_later, delay, self._add, key, priority)
+
+    def add_rate_limited(self, key):
+        """Re-add a failed key after its exponential backoff"""
+        self.add_after(key, self.backoff.when(key))
+
+    def forget(self, key):
+        """Stop tracking failures and priority for key after it was processed successfully"""
+        self.backoff.forget(key)
+        self._call(self._forget, key)
+
+    def _forget(self, key):
+        if key not in self.dirty:
+            self.priorities.pop(key, None)
+
+    def num_requeues(self, key):
+        """Get how many times key has been retried"""
+        return self.backoff.num_requeues(key)
+
+    async def get(self):
+        """Wait until a key is ready and return it, or None on shutdown"""
+        while not self.queue or self.shutting_down:
+            if self.shutting_down:
+                return None
+            self._waiter = self.loop.create_future()
+            await self._waiter
+
+        key = self.queue.popleft()
+        self.dirty.discard(key)
+        self.processing.add(key)
+
+        # Global rate limit across all tasks
+        delay = self.bucket.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return key
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def done(self, key):
+        """Mark key as processed, re-queueing it if it was added meanwhile"""
+        self._call(self._done, key)
+
+    def _done(self, key):
+        self.processing.discard(key)
+        if key in self.dirty:
+            self.queue.append(key, self.priorities.get(key, 0))
+            self._wake()
+
+    def shut_down(self):
+        """Stop handing out keys and wake up the waiting consumer"""
+        self._call(self._shut_down)
+
+    def _shut_down(self):
+        self.shutting_down = True
+        self._wake()